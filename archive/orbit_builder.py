@@ -1,11 +1,3 @@
 # Make a convenience class with some methods to make my life easier.
-
-
-class Orbit:
-    # calculate position vector given orbital elements
-    # calculate current velocity vector
-    # get flight path angle from current values
-    # https://space.stackexchange.com/questions/28426/how-to-calculate-the-flight-path-angle-%CE%B3-from-a-state-vector
-
-    # Add the above to test cases?
-    pass
+# This now lives in orbit.py at the top level, see Orbit and OrbitBatch:
+# position and velocity vectors, flight path angle, period and energy.
@@ -24,7 +24,7 @@ r_earth = 6378
 a_init = 5137
 e_init = 0.3
 b_init = a_init * np.sqrt(1 - e_init**2)
-theta_init = 180
+theta_init = np.deg2rad(180)
 
 # Initial polar coordinates:
 
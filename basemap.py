@@ -0,0 +1,254 @@
+"""
+Cached Moon basemaps for ground-track plots.
+
+Letting cartopy warp moon/moon.png on every render (imshow with
+transform=PlateCarree and regrid_shape=4000) is slow and memory hungry.
+Here the image is reprojected once per (projection, resolution), written
+under .cache/basemap as a .npy file and memory-mapped on later calls, so
+a batch of ground-track figures only pays for the warp the first time.
+
+cartopy is only imported when a projection or axes is needed.
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+MOON_IMAGE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "moon", "moon.png"
+)
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "basemap"
+)
+
+# Basemaps already opened in this process, keyed like the files on disk.
+_loaded = {}
+
+
+# Image digests by (path, mtime, size), so warm calls skip rehashing.
+_image_digests = {}
+
+
+def _image_digest(image_path: str) -> str:
+    stat = os.stat(image_path)
+    stamp = (os.path.abspath(image_path), stat.st_mtime_ns, stat.st_size)
+    if stamp not in _image_digests:
+        _image_digests[stamp] = _hash_file(image_path)
+    return _image_digests[stamp]
+
+
+def _hash_file(image_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(image_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _cache_key(projection, width: int, image_path: str) -> str:
+    digest = hashlib.sha256()
+    digest.update(projection.proj4_init.encode())
+    digest.update(repr((projection.x_limits, projection.y_limits, width)).encode())
+    digest.update(_image_digest(image_path).encode())
+    return digest.hexdigest()[:32]
+
+
+def _sample_equirectangular(image: np.ndarray, longitude, latitude) -> np.ndarray:
+    """
+    Bilinear lookup into a global image spanning [-180, 180] x [90, -90],
+    wrapping in longitude. Returns shape longitude.shape + (channels,).
+    """
+    height, width = image.shape[:2]
+    column = (np.asarray(longitude) + 180) / 360 * width - 0.5
+    row = (90 - np.asarray(latitude)) / 180 * height - 0.5
+    row = np.clip(row, 0, height - 1)
+
+    c0 = np.floor(column).astype(int)
+    r0 = np.minimum(np.floor(row).astype(int), height - 2)
+    fc = (column - c0)[..., None]
+    fr = (row - r0)[..., None]
+    c1 = np.mod(c0 + 1, width)
+    c0 = np.mod(c0, width)
+
+    top = image[r0, c0] * (1 - fc) + image[r0, c1] * fc
+    bottom = image[r0 + 1, c0] * (1 - fc) + image[r0 + 1, c1] * fc
+    return top * (1 - fr) + bottom * fr
+
+
+def reproject(projection, width: int, image: np.ndarray, out: np.ndarray = None):
+    """
+    reproject Warp an equirectangular Moon image into a cartopy projection.
+
+    Parameters
+    ----------
+    projection : cartopy.crs.Projection
+        Target projection.
+    width : int
+        Output width in pixels, the height follows the projection's aspect.
+    image : np.ndarray
+        Source image of shape (height, width, 3 or 4), values in [0, 1].
+    out : np.ndarray, optional
+        uint8 RGBA buffer of the output shape, e.g. a memmap.
+
+    Returns
+    -------
+    np.ndarray
+        uint8 RGBA image of shape (rows, width, 4), transparent outside the
+        projection's domain, first row at the top.
+    """
+    import cartopy.crs as ccrs
+
+    (x0, x1), (y0, y1) = projection.x_limits, projection.y_limits
+    rows = int(round(width * (y1 - y0) / (x1 - x0)))
+    if out is None:
+        out = np.empty((rows, width, 4), dtype=np.uint8)
+
+    x = np.linspace(x0, x1, width, endpoint=False) + (x1 - x0) / (2 * width)
+    y = np.linspace(y1, y0, rows, endpoint=False) - (y1 - y0) / (2 * rows)
+    # One row of the grid at a time keeps the temporary arrays small.
+    geodetic = ccrs.PlateCarree()
+    for index, y_row in enumerate(y):
+        points = geodetic.transform_points(projection, x, np.full(width, y_row))
+        longitude, latitude = points[:, 0], points[:, 1]
+        inside = np.isfinite(longitude) & np.isfinite(latitude)
+
+        pixels = np.zeros((width, 4))
+        sampled = _sample_equirectangular(image, longitude[inside], latitude[inside])
+        pixels[inside, : sampled.shape[-1]] = sampled
+        if sampled.shape[-1] == 3:
+            pixels[inside, 3] = 1
+        out[index] = np.round(np.clip(pixels, 0, 1) * 255)
+    return out
+
+
+def get_basemap(
+    projection=None,
+    width: int = 2048,
+    image_path: str = MOON_IMAGE,
+    cache_dir: str = CACHE_DIR,
+):
+    """
+    get_basemap Moon image in a projection, reprojected once and cached.
+
+    Parameters
+    ----------
+    projection : cartopy.crs.Projection, optional
+        Defaults to Robinson, as in moon/ground_track.ipynb.
+    width : int, optional
+        Width of the cached image in pixels.
+    image_path : str, optional
+        Equirectangular source image.
+    cache_dir : str, optional
+        Directory for the reprojected .npy files.
+
+    Returns
+    -------
+    tuple
+        Read-only RGBA memmap of shape (rows, width, 4) and its extent
+        (x0, x1, y0, y1) in projection coordinates, for imshow.
+    """
+    if projection is None:
+        import cartopy.crs as ccrs
+
+        projection = ccrs.Robinson()
+
+    key = _cache_key(projection, width, image_path)
+    (x0, x1), (y0, y1) = projection.x_limits, projection.y_limits
+    extent = (x0, x1, y0, y1)
+    if key in _loaded:
+        return _loaded[key], extent
+
+    path = os.path.join(cache_dir, f"{key}.npy")
+    if not os.path.exists(path):
+        import matplotlib.image
+
+        os.makedirs(cache_dir, exist_ok=True)
+        image = matplotlib.image.imread(image_path)
+        if image.dtype == np.uint8:
+            image = image / 255
+        rows = int(round(width * (y1 - y0) / (x1 - x0)))
+
+        # Write to a temporary name so a killed run never leaves half a map.
+        partial = f"{path}.{os.getpid()}.partial"
+        out = np.lib.format.open_memmap(
+            partial, mode="w+", dtype=np.uint8, shape=(rows, width, 4)
+        )
+        reproject(projection, width, image, out=out)
+        out.flush()
+        del out
+        os.replace(partial, path)
+
+    _loaded[key] = np.load(path, mmap_mode="r")
+    return _loaded[key], extent
+
+
+def draw_basemap(ax, width: int = 2048, image_path: str = MOON_IMAGE, **kwargs):
+    """
+    draw_basemap Show the cached Moon basemap on cartopy GeoAxes.
+
+    The image is already in ax.projection, so cartopy draws it without
+    regridding. Extra keyword arguments go to imshow.
+    """
+    basemap, extent = get_basemap(ax.projection, width=width, image_path=image_path)
+    kwargs.setdefault("interpolation", "bilinear")
+    return ax.imshow(
+        basemap, origin="upper", extent=extent, transform=ax.projection, **kwargs
+    )
+
+
+def plot_ground_tracks(
+    tracks,
+    projection=None,
+    width: int = 2048,
+    title: str = None,
+    savepath: str = None,
+    ax=None,
+    **kwargs,
+):
+    """
+    plot_ground_tracks Draw ground tracks over the cached Moon basemap.
+
+    Parameters
+    ----------
+    tracks : iterable of tuple
+        (longitude, latitude) pairs in degrees, e.g. from
+        ground_track.lunar_orbit_track, NaN separated at the wrap.
+    projection : cartopy.crs.Projection, optional
+        Map projection, Robinson by default. Ignored when ax is given.
+    width : int, optional
+        Basemap width in pixels.
+    title : str, optional
+        Plot title.
+    savepath : str, optional
+        Where to save the figure.
+    ax : cartopy.mpl.geoaxes.GeoAxes, optional
+        Axes to draw on, a new figure is made otherwise.
+    **kwargs
+        Passed to ax.plot for every track.
+
+    Returns
+    -------
+    cartopy.mpl.geoaxes.GeoAxes
+    """
+    import cartopy.crs as ccrs
+    import matplotlib.pyplot as plt
+
+    if ax is None:
+        if projection is None:
+            projection = ccrs.Robinson()
+        _, ax = plt.subplots(
+            subplot_kw=dict(projection=projection), constrained_layout=True
+        )
+
+    draw_basemap(ax, width=width)
+    for longitude, latitude in tracks:
+        ax.plot(longitude, latitude, transform=ccrs.PlateCarree(), **kwargs)
+    ax.set_global()
+
+    if title is not None:
+        ax.set_title(title)
+    if savepath is not None:
+        plt.savefig(savepath)
+
+    return ax
@@ -0,0 +1,274 @@
+"""
+Benchmarks for the orbital mechanics hot paths.
+
+Each case times one call at several problem sizes and reports the best of
+a few repeats as samples per second, then reruns it once under
+tracemalloc for the peak memory. Results are written to
+benchmarks/results/<commit>.json, and --compare checks them against an
+earlier file, exiting non-zero when a case got slower than the threshold.
+
+Runs offline with only the repo's own dependencies:
+
+    python benchmarks/run.py                 # sizes up to 1e6
+    python benchmarks/run.py --full          # also 1e7 samples
+    python benchmarks/run.py -k kepler       # only matching cases
+    python benchmarks/run.py --compare benchmarks/results/abc1234.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+SIZES = (1_000, 10_000, 100_000, 1_000_000)
+FULL_SIZES = SIZES + (10_000_000,)
+
+# name -> (setup(n) returning the call to time, sizes or None for SIZES)
+CASES = {}
+
+
+def case(name: str, sizes=None):
+    def register(setup):
+        CASES[name] = (setup, sizes)
+        return setup
+
+    return register
+
+
+@case("state_machine")
+def _state_machine(n):
+    from state_machine import state_machine
+
+    mean_anomalies = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    return lambda: state_machine(0.9, mean_anomalies)
+
+
+@case("state_machine_cached")
+def _state_machine_cached(n):
+    from state_machine import state_machine
+
+    mean_anomalies = np.linspace(0, 2 * np.pi, n, endpoint=False)
+    # Build the lookup table outside the timed call.
+    state_machine(0.9, mean_anomalies[:10], cached=True)
+    return lambda: state_machine(0.9, mean_anomalies, cached=True)
+
+
+@case("calc_mean_anomaly")
+def _calc_mean_anomaly(n):
+    from state_machine import calc_mean_anomaly
+
+    return lambda: calc_mean_anomaly(0, 1e6, 163285.5, 398600, num=n + 1)
+
+
+@case("calc_r")
+def _calc_r(n):
+    from geometry import calc_r
+
+    theta = np.linspace(0, 2 * np.pi, n)
+    return lambda: calc_r(8371.0, 0.3, theta)
+
+
+@case("orbit_curves")
+def _orbit_curves(n):
+    from geometry import orbit_curves
+
+    # n points as n / 360 orbits of 360 points, into a reused buffer.
+    orbits = max(n // 360, 1)
+    rng = np.random.default_rng(0)
+    a = rng.uniform(7000, 400000, orbits)
+    e = rng.uniform(0, 0.95, orbits)
+    out = np.empty((orbits, 360, 2))
+    return lambda: orbit_curves(a, e, out=out)
+
+
+def _random_elements(n):
+    rng = np.random.default_rng(0)
+    return np.column_stack(
+        [
+            rng.uniform(7000, 400000, n),
+            rng.uniform(0.01, 0.95, n),
+            rng.uniform(0.01, np.pi - 0.01, n),
+            rng.uniform(0, 2 * np.pi, n),
+            rng.uniform(0, 2 * np.pi, n),
+            rng.uniform(0, 2 * np.pi, n),
+        ]
+    )
+
+
+@case("elements_to_state")
+def _elements_to_state(n):
+    from state_vectors import elements_to_state
+
+    elements = _random_elements(n)
+    return lambda: elements_to_state(elements, 398600)
+
+
+@case("state_to_elements")
+def _state_to_elements(n):
+    from state_vectors import elements_to_state, state_to_elements
+
+    states = elements_to_state(_random_elements(n), 398600)
+    return lambda: state_to_elements(states, 398600)
+
+
+@case("pairs_within", sizes=(1_000, 10_000, 100_000))
+def _pairs_within(n):
+    from screening import pairs_within
+
+    # One time slice of n spacecraft spread over cislunar distances.
+    positions = np.random.default_rng(0).normal(0, 40000, (n, 3))
+    return lambda: pairs_within(positions, 10.0)
+
+
+@case("design_transfers", sizes=(1_000, 10_000))
+def _design_transfers(n):
+    from patched_conics import design_transfers
+
+    # A launch window scan, n departure phase angles over 30 days.
+    epochs = np.linspace(0, 30 * 86400, n)
+    phases = np.linspace(0, 2 * np.pi, n)
+    return lambda: design_transfers(epochs, phases)
+
+
+@case("plot_anomalies", sizes=(1_000, 100_000, 1_000_000))
+def _plot_anomalies(n):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib_rc
+    from state_machine import plot_anomalies
+
+    matplotlib_rc.set_style(usetex=False)
+    times = np.linspace(0, 5, n + 1)
+    mean = np.mod(np.linspace(0, 30, n), 2 * np.pi)
+    savepath = os.path.join(tempfile.mkdtemp(), "anomalies.pdf")
+
+    def run():
+        plot_anomalies(times, mean, mean, "Benchmark", savepath)
+        plt.close("all")
+
+    return run
+
+
+def measure(setup, n: int, repeat: int) -> dict:
+    call = setup(n)
+    call()  # warm up imports and caches
+
+    seconds = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        seconds = min(seconds, time.perf_counter() - start)
+
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "n": n,
+        "seconds": seconds,
+        "samples_per_second": n / seconds,
+        "peak_bytes": peak,
+    }
+
+
+def commit_id() -> str:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def compare(results: dict, reference: dict, threshold: float) -> list:
+    """compare Cases whose time grew by more than threshold, as messages."""
+    old = {(r["case"], r["n"]): r for r in reference["results"]}
+    regressions = []
+    for r in results["results"]:
+        before = old.get((r["case"], r["n"]))
+        if before is None:
+            continue
+        ratio = r["seconds"] / before["seconds"]
+        if ratio > threshold:
+            regressions.append(
+                f"{r['case']} n={r['n']}: {ratio:.2f}x slower "
+                f"({before['seconds']:.4g} s -> {r['seconds']:.4g} s)"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-k", dest="pattern", default="", help="run matching cases")
+    parser.add_argument("--full", action="store_true", help="include 1e7 samples")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="results file, default by commit")
+    parser.add_argument("--compare", help="earlier results file to check against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    options = parser.parse_args(argv)
+
+    results = {
+        "commit": commit_id(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": [],
+    }
+
+    print(f"{'case':<24}{'n':>10}{'time [s]':>12}{'samples/s':>14}{'peak [MB]':>11}")
+    for name, (setup, sizes) in CASES.items():
+        if options.pattern not in name:
+            continue
+        sizes = sizes or (FULL_SIZES if options.full else SIZES)
+        for n in sizes:
+            result = measure(setup, n, options.repeat)
+            results["results"].append({"case": name, **result})
+            print(
+                f"{name:<24}{n:>10}{result['seconds']:>12.4g}"
+                f"{result['samples_per_second']:>14.4g}"
+                f"{result['peak_bytes'] / 1e6:>11.1f}"
+            )
+
+    output = options.output or os.path.join(RESULTS_DIR, f"{results['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {output}")
+
+    if options.compare:
+        with open(options.compare) as f:
+            regressions = compare(results, json.load(f), options.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+# Physical constants shared across the mission scripts.
+# Units are km, s and km^3/s^2 unless noted otherwise.
+
+MU_EARTH = 398600
+MU_MOON = 4905
+
+R_EARTH = 6378
+R_MOON = 1737.4
+
+# Mean Earth-Moon distance and the Moon's sphere of influence radius.
+EARTH_MOON_DISTANCE = 384400
+MOON_SOI = 66200
+
+SECONDS_PER_DAY = 86400
+
+# Earth oblateness, second zonal harmonic.
+J2_EARTH = 1.08263e-3
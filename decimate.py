@@ -0,0 +1,164 @@
+"""
+Decimation of dense curves before they reach matplotlib.
+
+Propagations are sampled far more finely than a figure can show, and
+every sample ends up as a vertex in a vector PDF. Two reductions keep the
+point count bounded by the output size instead of the sampling:
+
+    - decimate_series, for y(x) time series: per pixel column keep the
+      first, last, minimum and maximum sample, so the drawn envelope is
+      identical at that width.
+    - simplify_curve, for orbit curves and other paths: Ramer-Douglas-
+      Peucker, every dropped point lies within a tolerance of the kept
+      polyline.
+"""
+
+import numpy as np
+
+
+def minmax_indices(x, y, bins: int) -> np.ndarray:
+    """
+    minmax_indices Samples to keep so each of bins columns of x keeps its
+    first, last, lowest and highest point.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sample positions, non-decreasing.
+    y : np.ndarray
+        Values, same length as x. NaN samples are always kept so gaps
+        in a line survive.
+    bins : int
+        Number of columns, usually the axes width in pixels.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted indices into x and y.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= 4 * bins:
+        return np.arange(n)
+
+    span = x[-1] - x[0]
+    if span > 0:
+        column = np.minimum(((x - x[0]) / span * bins).astype(int), bins - 1)
+    else:
+        column = np.zeros(n, dtype=int)
+
+    # x is sorted, so every column is a contiguous run of samples.
+    starts = np.flatnonzero(np.r_[True, column[1:] != column[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    # Ordering by (column, y) puts each column's minimum at its start and
+    # maximum at its end. NaNs sort last, only the finite extremes count.
+    finite = ~np.isnan(y)
+    order = np.lexsort((np.where(finite, y, np.inf), column))
+    nan_count = np.add.reduceat((~finite).astype(int), starts)
+    lowest = order[starts]
+    highest = order[np.maximum(ends - nan_count, starts)]
+
+    keep = np.concatenate([starts, ends, lowest, highest, np.flatnonzero(~finite)])
+    return np.unique(keep)
+
+
+def decimate_series(x, *ys, bins: int = 2000):
+    """
+    decimate_series Min/max-per-pixel decimation of series sharing one x.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sample positions, non-decreasing.
+    *ys : np.ndarray
+        One or more series of the same length as x.
+    bins : int, optional
+        Number of pixel columns the plot spans.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        x followed by each series, at the union of the samples every
+        series needs.
+    """
+    keep = np.unique(np.concatenate([minmax_indices(x, y, bins) for y in ys]))
+    return (np.asarray(x)[keep],) + tuple(np.asarray(y)[keep] for y in ys)
+
+
+def rdp_indices(points, tolerance: float) -> np.ndarray:
+    """
+    rdp_indices Ramer-Douglas-Peucker simplification of a polyline.
+
+    Parameters
+    ----------
+    points : np.ndarray
+        Vertices, shape (N, D).
+    tolerance : float
+        Largest distance allowed between a dropped vertex and the
+        simplified line, in the units of points.
+
+    Returns
+    -------
+    np.ndarray
+        Sorted indices of the vertices to keep, always including both ends.
+    """
+    points = np.asarray(points, dtype=float)
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        inner = points[start + 1 : end]
+        chord = points[end] - points[start]
+        offset = inner - points[start]
+        length2 = chord @ chord
+        if length2 > 0:
+            # Distance to the segment, clamping past either end.
+            t = np.clip(offset @ chord / length2, 0, 1)
+            offset = offset - t[:, None] * chord
+        distance = np.sqrt(np.sum(offset * offset, axis=1))
+
+        worst = np.argmax(distance)
+        if distance[worst] > tolerance:
+            split = start + 1 + worst
+            keep[split] = True
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return np.flatnonzero(keep)
+
+
+def simplify_curve(x, y, tolerance: float = None, relative: float = 1e-3):
+    """
+    simplify_curve Drop vertices of a 2D curve that do not change its shape.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Vertices of the curve.
+    tolerance : float, optional
+        Absolute error bound, in data units.
+    relative : float, optional
+        Used when tolerance is None, as a fraction of the curve's bounding
+        box diagonal. 1e-3 is below a pixel for any normal figure size.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Simplified x and y.
+    """
+    points = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+    if tolerance is None:
+        extent = np.ptp(points, axis=0) if len(points) else np.zeros(2)
+        tolerance = relative * np.hypot(*extent)
+    keep = rdp_indices(points, tolerance)
+    return points[keep, 0], points[keep, 1]
@@ -0,0 +1,460 @@
+"""
+Offline ephemeris service for the kernels in moon/.
+
+Binary SPICE kernels (SPK .bsp and PCK .bpc, both DAF files) are memory
+mapped, and their Chebyshev (type 2) segments are evaluated straight
+from the mapped coefficients for whole arrays of epochs at once. Text
+kernels (.tf, .tpc) are parsed once and cached on disk as JSON, so
+later runs start without re-parsing them.
+
+This replaces the skyfield calls in moon/ground_track.ipynb: nothing is
+downloaded, de421.bsp has to be placed in moon/ (or passed in) for body
+positions, while the lunar frame rotations only need the files already
+in the repo.
+
+Epochs are TDB seconds past J2000 (SPICE "ET"), positions are in km in
+the ICRF/J2000 frame.
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+import numpy as np
+
+MOON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "moon")
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "ephemeris"
+)
+
+J2000_JD = 2451545.0
+SECONDS_PER_DAY = 86400.0
+# TT - UTC since 2017, used as an approximation for TDB - UTC.
+TT_MINUS_UTC = 69.184
+
+NAIF_IDS = {
+    "ssb": 0,
+    "solar system barycenter": 0,
+    "earth moon barycenter": 3,
+    "emb": 3,
+    "sun": 10,
+    "moon": 301,
+    "earth": 399,
+}
+
+_RECORD_BYTES = 1024
+
+
+def datetime_to_et(moment: datetime) -> float:
+    """
+    datetime_to_et Approximate TDB seconds past J2000 for a UTC datetime.
+
+    Leap seconds before 2017 and the periodic TDB - TT terms (< 2 ms) are
+    ignored, which is plenty for plotting and mission design.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    j2000 = datetime(2000, 1, 1, 12, tzinfo=timezone.utc)
+    return (moment - j2000).total_seconds() + TT_MINUS_UTC
+
+
+def julian_date_to_et(jd):
+    return (np.asarray(jd, dtype=float) - J2000_JD) * SECONDS_PER_DAY
+
+
+def _chebyshev(coefficients: np.ndarray, s: np.ndarray) -> np.ndarray:
+    """
+    Clenshaw evaluation of Chebyshev series.
+
+    coefficients has shape (M, components, degree + 1) and s shape (M,),
+    the result has shape (M, components).
+    """
+    s = s[:, None]
+    b1 = np.zeros(coefficients.shape[:2])
+    b2 = np.zeros(coefficients.shape[:2])
+    for k in range(coefficients.shape[2] - 1, 0, -1):
+        b1, b2 = 2 * s * b1 - b2 + coefficients[:, :, k], b1
+    return s * b1 - b2 + coefficients[:, :, 0]
+
+
+class ChebyshevSegment:
+    """
+    ChebyshevSegment A type 2 SPK/PCK segment, a view into the mapped file.
+
+    Parameters
+    ----------
+    data : np.ndarray
+        The whole kernel mapped as float64 words.
+    start, end : int
+        1-based first and last word of the segment.
+    target, center, frame : int
+        NAIF ids. For PCK segments target is the body frame class id and
+        center is unused.
+    start_et, end_et : float
+        Time span covered [s].
+    """
+
+    def __init__(self, data, start, end, target, center, frame, start_et, end_et):
+        self.target = target
+        self.center = center
+        self.frame = frame
+        self.start_et = start_et
+        self.end_et = end_et
+
+        init, interval, record_size, n_records = data[end - 4 : end]
+        self.init = float(init)
+        self.interval = float(interval)
+        record_size = int(record_size)
+        n_records = int(n_records)
+
+        # Each record is MID, RADIUS, then the coefficients per component.
+        records = data[start - 1 : start - 1 + record_size * n_records]
+        records = records.reshape(n_records, record_size)
+        self.mid = records[:, 0]
+        self.radius = records[:, 1]
+        self.coefficients = records[:, 2:].reshape(n_records, 3, -1)
+
+    def __repr__(self):
+        return (
+            f"ChebyshevSegment(target={self.target}, center={self.center}, "
+            f"frame={self.frame})"
+        )
+
+    def covers(self, et) -> np.ndarray:
+        return (et >= self.start_et) & (et <= self.end_et)
+
+    def compute(self, et) -> np.ndarray:
+        """Evaluate the three components at epochs et, shape (..., 3)."""
+        et = np.asarray(et, dtype=float)
+        flat = et.ravel()
+        if not np.all(self.covers(flat)):
+            raise ValueError(
+                f"Epochs outside of segment coverage [{self.start_et}, {self.end_et}]."
+            )
+
+        index = np.floor((flat - self.init) / self.interval).astype(np.intp)
+        index = np.clip(index, 0, len(self.mid) - 1)
+        s = (flat - self.mid[index]) / self.radius[index]
+        values = _chebyshev(self.coefficients[index], s)
+        return values.reshape(et.shape + (3,))
+
+
+class BinaryKernel:
+    """
+    BinaryKernel Memory-mapped DAF file (SPK or PCK) and its segments.
+
+    Only type 2 (Chebyshev) segments are supported, which covers de421.bsp
+    and the lunar orientation kernel in moon/.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            file_record = f.read(_RECORD_BYTES)
+
+        self.kind = file_record[:8].decode("ascii").strip()
+        if not self.kind.startswith("DAF/"):
+            raise ValueError(f"{path} is not a DAF file.")
+
+        endian = {b"LTL-IEEE": "<", b"BIG-IEEE": ">"}[file_record[88:96]]
+        nd, ni = np.frombuffer(file_record[8:16], dtype=f"{endian}i4")
+        forward = int(np.frombuffer(file_record[76:80], dtype=f"{endian}i4")[0])
+
+        self.data = np.memmap(path, dtype=f"{endian}f8", mode="r")
+        self.segments = []
+
+        summary_words = nd + (ni + 1) // 2
+        record = forward
+        while record:
+            words = self.data[(record - 1) * 128 : record * 128]
+            next_record, _, n_summaries = (int(x) for x in words[:3])
+            for index in range(n_summaries):
+                summary = words[
+                    3 + index * summary_words : 3 + (index + 1) * summary_words
+                ]
+                doubles = summary[:nd]
+                ints = np.frombuffer(summary[nd:].tobytes(), dtype=f"{endian}i4")[:ni]
+                self.segments.append(self._segment(doubles, ints))
+            record = next_record
+
+    def _segment(self, doubles, ints):
+        start_et, end_et = float(doubles[0]), float(doubles[1])
+        if self.kind == "DAF/SPK":
+            target, center, frame, data_type, start, end = (int(x) for x in ints)
+        else:
+            target, frame, data_type, start, end = (int(x) for x in ints)
+            center = None
+        if data_type != 2:
+            raise ValueError(
+                f"{self.path}: segment for body {target} has data type "
+                f"{data_type}, only Chebyshev position segments (type 2) are "
+                "supported."
+            )
+        return ChebyshevSegment(
+            self.data, start, end, target, center, frame, start_et, end_et
+        )
+
+    def segments_for(self, target: int):
+        return [segment for segment in self.segments if segment.target == target]
+
+
+def _kernel_value(token: str):
+    if token.startswith("'"):
+        return token[1:-1].replace("''", "'")
+    return float(token.replace("D", "E").replace("d", "e"))
+
+
+def parse_text_kernel(text: str) -> dict:
+    """
+    parse_text_kernel Read the variables in the \\begindata blocks of a
+    SPICE text kernel, each one a list of floats and/or strings.
+    """
+    variables = {}
+    in_data = False
+    body = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped == "\\begindata":
+            in_data = True
+        elif stripped == "\\begintext":
+            in_data = False
+        elif in_data:
+            body.append(line)
+
+    assignment = re.compile(r"([A-Za-z0-9_]+)\s*(\+?=)\s*")
+    token = re.compile(r"'(?:[^']|'')*'|[^\s,()]+")
+    data = "\n".join(body)
+    matches = list(assignment.finditer(data))
+    for match, following in zip(matches, matches[1:] + [None]):
+        name, operator = match.groups()
+        value_text = data[match.end() : following.start() if following else None]
+        values = [_kernel_value(t) for t in token.findall(value_text)]
+        if operator == "+=":
+            variables.setdefault(name, []).extend(values)
+        else:
+            variables[name] = values
+    return variables
+
+
+def load_text_kernel(path: str, cache_dir: str = CACHE_DIR) -> dict:
+    """
+    load_text_kernel Parse a text kernel, going through the on-disk cache.
+
+    The cache entry is keyed by the file's name, size and modification
+    time, so editing a kernel invalidates it.
+    """
+    stat = os.stat(path)
+    key = hashlib.sha256(
+        f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+    ).hexdigest()[:16]
+    cache_path = os.path.join(cache_dir, f"{os.path.basename(path)}.{key}.json")
+
+    if os.path.exists(cache_path):
+        with open(cache_path) as f:
+            return json.load(f)
+
+    with open(path, encoding="latin-1") as f:
+        variables = parse_text_kernel(f.read())
+
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump(variables, f)
+    return variables
+
+
+def _axis_rotation(axis: int, angle):
+    """Active rotations about x (1), y (2) or z (3), shape (..., 3, 3)."""
+    angle = np.asarray(angle, dtype=float)
+    c, s = np.cos(angle), np.sin(angle)
+    one, zero = np.ones_like(angle), np.zeros_like(angle)
+    rows = {
+        1: [[one, zero, zero], [zero, c, -s], [zero, s, c]],
+        2: [[c, zero, s], [zero, one, zero], [-s, zero, c]],
+        3: [[c, -s, zero], [s, c, zero], [zero, zero, one]],
+    }[axis]
+    return np.moveaxis(np.array(rows), (0, 1), (-2, -1))
+
+
+_ANGLE_UNITS = {
+    "RADIANS": 1.0,
+    "DEGREES": np.pi / 180,
+    "ARCSECONDS": np.pi / (180 * 3600),
+}
+
+
+class Ephemeris:
+    """
+    Ephemeris Body positions and body-fixed frame rotations from local kernels.
+
+    Parameters
+    ----------
+    spk_paths : list of str, optional
+        SPK files for positions, loaded on first use.
+    pck_paths : list of str, optional
+        Binary PCK files for orientation.
+    text_kernel_paths : list of str, optional
+        Frame and constants kernels.
+    cache_dir : str, optional
+        Where parsed text kernels are cached.
+    """
+
+    def __init__(
+        self,
+        spk_paths=(os.path.join(MOON_DIR, "de421.bsp"),),
+        pck_paths=(os.path.join(MOON_DIR, "moon_pa_de421_1900-2050.bpc"),),
+        text_kernel_paths=(
+            os.path.join(MOON_DIR, "moon_080317.tf"),
+            os.path.join(MOON_DIR, "pck00008.tpc"),
+        ),
+        cache_dir: str = CACHE_DIR,
+    ):
+        self.spk_paths = list(spk_paths)
+        self._spk_kernels = None
+        self.pck_kernels = [BinaryKernel(path) for path in pck_paths]
+
+        self.variables = {}
+        for path in text_kernel_paths:
+            self.variables.update(load_text_kernel(path, cache_dir))
+
+    @property
+    def spk_kernels(self):
+        if self._spk_kernels is None:
+            missing = [path for path in self.spk_paths if not os.path.exists(path)]
+            if missing:
+                raise FileNotFoundError(
+                    f"SPK kernel(s) {missing} not found. Download them once (e.g. "
+                    "de421.bsp from NAIF) into moon/ to use body positions offline."
+                )
+            self._spk_kernels = [BinaryKernel(path) for path in self.spk_paths]
+        return self._spk_kernels
+
+    def _evaluate(self, segments, et) -> np.ndarray:
+        et = np.asarray(et, dtype=float)
+        result = np.full(et.shape + (3,), np.nan)
+        for segment in segments:
+            covered = segment.covers(et)
+            if np.any(covered):
+                result[covered] = segment.compute(et[covered])
+        if np.any(np.isnan(result)):
+            raise ValueError("Some epochs are not covered by the loaded kernels.")
+        return result
+
+    def _chain(self, body: int):
+        """Segments linking body to the solar system barycentre."""
+        chain = []
+        while body != 0:
+            segments = [
+                s for kernel in self.spk_kernels for s in kernel.segments_for(body)
+            ]
+            if not segments:
+                raise KeyError(f"No SPK segment for body {body}.")
+            chain.append(segments)
+            body = segments[0].center
+        return chain
+
+    def position(self, target, center, et) -> np.ndarray:
+        """
+        position Position of target relative to center, shape (..., 3) [km].
+
+        Bodies are NAIF ids or names from NAIF_IDS, e.g. "moon", "earth".
+        """
+        target = NAIF_IDS.get(str(target).lower(), target)
+        center = NAIF_IDS.get(str(center).lower(), center)
+        target_chain = self._chain(int(target))
+        center_chain = self._chain(int(center))
+
+        # Drop the links both bodies share, e.g. EMB -> SSB for Earth and Moon.
+        while (
+            target_chain and center_chain and target_chain[-1][0] is center_chain[-1][0]
+        ):
+            target_chain.pop()
+            center_chain.pop()
+
+        et = np.asarray(et, dtype=float)
+        result = np.zeros(et.shape + (3,))
+        for segments in target_chain:
+            result += self._evaluate(segments, et)
+        for segments in center_chain:
+            result -= self._evaluate(segments, et)
+        return result
+
+    def _frame_id(self, frame) -> int:
+        if isinstance(frame, str):
+            return int(self.variables[f"FRAME_{frame}"][0])
+        return int(frame)
+
+    def _tk_matrix(self, frame_id: int) -> np.ndarray:
+        """Fixed rotation from the RELATIVE frame into a TK frame."""
+        spec = self.variables[f"TKFRAME_{frame_id}_SPEC"][0]
+        if spec == "MATRIX":
+            # Stored column major as the TK -> RELATIVE matrix, so reading
+            # it row major gives the transpose, RELATIVE -> TK.
+            matrix = np.array(self.variables[f"TKFRAME_{frame_id}_MATRIX"])
+            return matrix.reshape(3, 3)
+        if spec != "ANGLES":
+            raise ValueError(
+                f"TK frame {frame_id} has TKFRAME_SPEC {spec!r}, only MATRIX and "
+                "ANGLES are supported."
+            )
+
+        angles = self.variables[f"TKFRAME_{frame_id}_ANGLES"]
+        axes = self.variables[f"TKFRAME_{frame_id}_AXES"]
+        units = self.variables.get(f"TKFRAME_{frame_id}_UNITS", ["RADIANS"])[0]
+        matrix = np.eye(3)
+        for angle, axis in zip(angles, axes):
+            matrix = _axis_rotation(int(axis), angle * _ANGLE_UNITS[units]) @ matrix
+        return matrix
+
+    def rotation(self, frame, et) -> np.ndarray:
+        """
+        rotation Matrices taking ICRF vectors into a body-fixed frame.
+
+        Parameters
+        ----------
+        frame : str or int
+            Frame name or id, e.g. "MOON_ME_DE421" or "MOON_PA_DE421".
+        et : np.ndarray
+            Epochs, TDB seconds past J2000.
+
+        Returns
+        -------
+        np.ndarray
+            Rotation matrices of shape (..., 3, 3), v_body = R @ v_icrf.
+        """
+        frame_id = self._frame_id(frame)
+        fixed = np.eye(3)
+
+        # Follow TK frames down to the PCK frame they are defined against.
+        while int(self.variables[f"FRAME_{frame_id}_CLASS"][0]) == 4:
+            fixed = fixed @ self._tk_matrix(frame_id)
+            relative = self.variables[f"TKFRAME_{frame_id}_RELATIVE"][0]
+            frame_id = self._frame_id(relative)
+
+        class_id = int(self.variables[f"FRAME_{frame_id}_CLASS_ID"][0])
+        segments = [
+            s for kernel in self.pck_kernels for s in kernel.segments_for(class_id)
+        ]
+        if not segments:
+            raise KeyError(f"No PCK segment for frame {frame}.")
+
+        # Euler angles (phi, delta, psi), the rotation is [psi]_3 [delta]_1 [phi]_3.
+        phi, delta, psi = np.moveaxis(self._evaluate(segments, et), -1, 0)
+        body = (
+            _axis_rotation(3, -psi)
+            @ _axis_rotation(1, -delta)
+            @ _axis_rotation(3, -phi)
+        )
+        return fixed @ body
+
+
+_default_ephemeris = None
+
+
+def get_ephemeris() -> Ephemeris:
+    """Shared Ephemeris for the kernels in moon/, built on first use."""
+    global _default_ephemeris
+    if _default_ephemeris is None:
+        _default_ephemeris = Ephemeris()
+    return _default_ephemeris
@@ -0,0 +1,402 @@
+"""
+Event detection along trajectories.
+
+An event is a sign change of a scalar event function g(t) along a
+trajectory, e.g. r·v for apsis passages or z for node crossings. The
+trajectory is sampled on a coarse grid in one vectorised call, every
+sign change brackets one event, and all brackets are then refined
+together with the Illinois variant of regula falsi. The coarse step only
+has to be shorter than the time between two events of the same kind, so
+a multi-day timeline needs a few samples per orbit rather than one every
+few seconds.
+
+Trajectories are callables trajectory(t) -> (K, 6) states for an array
+of K epochs, from kepler_trajectory for analytic orbits or
+hermite_trajectory for the output of propagator.propagate.
+
+Units are km, s and km^3/s^2.
+"""
+
+import numpy as np
+
+from constants import MOON_SOI, MU_EARTH, R_EARTH
+from instrumentation import count
+from kepler_solver import solve_kepler
+from orbit import calc_position, calc_velocity
+
+EVENT_DTYPE = np.dtype(
+    [
+        ("time", float),  # [s]
+        ("kind", "U16"),  # e.g. "periapsis", "soi_entry"
+    ]
+)
+
+
+def kepler_trajectory(
+    a: float,
+    e: float,
+    i: float = 0.0,
+    raan: float = 0.0,
+    argp: float = 0.0,
+    t_p: float = 0.0,
+    mu: float = MU_EARTH,
+):
+    """
+    kepler_trajectory Analytic elliptical orbit as a trajectory callable.
+
+    Parameters
+    ----------
+    a, e : float
+        Semi-major axis [km] and eccentricity, 0 <= e < 1.
+    i, raan, argp : float, optional
+        Orientation [rad].
+    t_p : float, optional
+        Epoch of periapsis passage [s].
+    mu : float, optional
+        Gravitational parameter of the central body [km^3/s^2].
+    """
+    n = np.sqrt(mu / a**3)
+
+    def trajectory(t):
+        mean_anomalies = np.mod(n * (np.asarray(t, dtype=float) - t_p), 2 * np.pi)
+        _, nu, _ = solve_kepler(mean_anomalies, e)
+        state = np.empty(nu.shape + (6,))
+        state[..., :3] = calc_position(a, e, i, raan, argp, nu)
+        state[..., 3:] = calc_velocity(a, e, i, raan, argp, nu, mu)
+        return state
+
+    return trajectory
+
+
+def hermite_trajectory(times: np.ndarray, states: np.ndarray):
+    """
+    hermite_trajectory Interpolate sampled states as a trajectory callable.
+
+    Positions are cubic Hermite splines through the sampled positions and
+    velocities, velocities are their derivative, so propagator output can
+    be refined between its samples without propagating again.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Increasing sample epochs, shape (M,) [s].
+    states : np.ndarray
+        States at those epochs, shape (M, 6) [km, km/s].
+    """
+    times = np.asarray(times, dtype=float)
+    states = np.asarray(states, dtype=float)
+    if states.shape != (len(times), 6):
+        raise ValueError(f"states must have shape ({len(times)}, 6).")
+
+    def trajectory(t):
+        t = np.asarray(t, dtype=float)
+        k = np.clip(np.searchsorted(times, t, side="right") - 1, 0, len(times) - 2)
+        h = (times[k + 1] - times[k])[..., None]
+        s = (t - times[k])[..., None]
+        s = s / h
+        p0, v0 = states[k, :3], states[k, 3:] * h
+        p1, v1 = states[k + 1, :3], states[k + 1, 3:] * h
+
+        s2, s3 = s * s, s * s * s
+        state = np.empty(t.shape + (6,))
+        state[..., :3] = (
+            (2 * s3 - 3 * s2 + 1) * p0
+            + (s3 - 2 * s2 + s) * v0
+            + (3 * s2 - 2 * s3) * p1
+            + (s3 - s2) * v1
+        )
+        state[..., 3:] = (
+            (6 * s2 - 6 * s) * p0
+            + (3 * s2 - 4 * s + 1) * v0
+            + (6 * s - 6 * s2) * p1
+            + (3 * s2 - 2 * s) * v1
+        ) / h
+        return state
+
+    return trajectory
+
+
+def _position_callable(position):
+    if callable(position):
+        return position
+    fixed = np.asarray(position, dtype=float)
+    return lambda t: np.broadcast_to(fixed, np.shape(t) + (3,))
+
+
+def apsis_function(trajectory):
+    """
+    apsis_function r·v / (|r||v|), the sine of the flight path angle,
+    rising through zero at periapsis and falling at apoapsis.
+
+    It stays below about e in size, so on a circular orbit it is only
+    rounding noise, see the atol of find_roots.
+    """
+
+    def g(t):
+        state = trajectory(t)
+        r, v = state[..., :3], state[..., 3:]
+        return np.sum(r * v, axis=-1) / (
+            np.linalg.norm(r, axis=-1) * np.linalg.norm(v, axis=-1)
+        )
+
+    return g
+
+
+def node_function(trajectory):
+    """
+    node_function z / |r|, the sine of the latitude, rising through zero
+    at the ascending node. Only rounding noise on an equatorial orbit.
+    """
+
+    def g(t):
+        r = trajectory(t)[..., :3]
+        return r[..., 2] / np.linalg.norm(r, axis=-1)
+
+    return g
+
+
+def soi_function(trajectory, body_position, radius: float = MOON_SOI):
+    """
+    soi_function Distance from a body minus its sphere of influence radius,
+    falling through zero on entry.
+
+    body_position is body_position(t) -> (K, 3) relative to the central
+    body [km], or a fixed (3,) vector. Ephemeris.position takes the
+    bodies as well, wrap it as
+    lambda t: ephemeris.position("moon", "earth", t).
+    """
+    body_position = _position_callable(body_position)
+
+    def g(t):
+        relative = trajectory(t)[..., :3] - body_position(t)
+        return np.linalg.norm(relative, axis=-1) - radius
+
+    return g
+
+
+def shadow_function(trajectory, sun_direction, radius: float = R_EARTH):
+    """
+    shadow_function Cylindrical shadow of the central body, falling through
+    zero on entry.
+
+    Behind the body (r·ŝ < 0) this is the distance from the shadow axis
+    minus the radius, on the day side |r| minus the radius. Both agree at
+    r·ŝ = 0, so the function is continuous and only crosses zero at the
+    shadow boundary. sun_direction is a callable t -> (K, 3) or a fixed
+    (3,) vector towards the Sun.
+    """
+    sun_direction = _position_callable(sun_direction)
+
+    def g(t):
+        r = trajectory(t)[..., :3]
+        s = sun_direction(t)
+        s = s / np.linalg.norm(s, axis=-1, keepdims=True)
+        along = np.sum(r * s, axis=-1)
+        r2 = np.sum(r * r, axis=-1)
+        axis_distance = np.sqrt(np.maximum(r2 - along**2, 0))
+        return np.where(along < 0, axis_distance, np.sqrt(r2)) - radius
+
+    return g
+
+
+def _refine(g, t_lo, t_hi, g_lo, g_hi, tol: float, max_iter: int) -> np.ndarray:
+    """Illinois iterations on every bracket at once."""
+    # A sample can land exactly on the root, regula falsi would stall on it.
+    # NaN elsewhere, so the first step never counts as converged.
+    t = np.where(g_lo == 0, t_lo, np.where(g_hi == 0, t_hi, np.nan))
+    side = np.zeros(len(t_lo), dtype=int)  # endpoint kept last step, -1 lo, 1 hi
+    active = (g_lo != 0) & (g_hi != 0)
+    for _ in range(max_iter):
+        index = np.flatnonzero(active)
+        if index.size == 0:
+            break
+        lo, hi, f_lo, f_hi = t_lo[index], t_hi[index], g_lo[index], g_hi[index]
+        t_new = hi - f_hi * (hi - lo) / (f_hi - f_lo)
+        # Guard against rounding pushing the point out of the bracket.
+        t_new = np.where((t_new > lo) & (t_new < hi), t_new, 0.5 * (lo + hi))
+        f_new = g(t_new)
+        count("events.refine_evaluations", index.size)
+
+        converged = (np.abs(t_new - t[index]) <= tol) | (f_new == 0)
+        t[index] = t_new
+
+        # Replace the endpoint with the same sign, halve the other one's
+        # value when it is kept twice in a row so it cannot stall.
+        low_side = np.sign(f_new) == np.sign(f_lo)
+        t_lo[index] = np.where(low_side, t_new, lo)
+        g_lo[index] = np.where(
+            low_side, f_new, np.where(side[index] == -1, f_lo / 2, f_lo)
+        )
+        t_hi[index] = np.where(low_side, hi, t_new)
+        g_hi[index] = np.where(
+            low_side, np.where(side[index] == 1, f_hi / 2, f_hi), f_new
+        )
+        side[index] = np.where(low_side, 1, -1)
+
+        converged |= t_hi[index] - t_lo[index] <= tol
+        active[index[converged]] = False
+    return t
+
+
+def find_roots(
+    g,
+    t_start: float,
+    t_end: float,
+    step: float,
+    direction: int = 0,
+    tol: float = 1e-6,
+    max_iter: int = 100,
+    atol: float = 0.0,
+) -> tuple:
+    """
+    find_roots Zero crossings of an event function.
+
+    Parameters
+    ----------
+    g : callable
+        g(t) -> (K,) for an array of K epochs.
+    t_start, t_end : float
+        Interval to search [s].
+    step : float
+        Coarse sampling step [s], shorter than the time between two
+        crossings or both are missed.
+    direction : int, optional
+        1 for rising crossings only, -1 for falling only, 0 for both.
+    tol : float, optional
+        Time tolerance of the refined crossings [s].
+    max_iter : int, optional
+        Refinement iterations per crossing.
+    atol : float, optional
+        Sign changes where g stays within atol of zero at both samples
+        are taken as rounding noise and skipped.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Crossing epochs [s] in order and their directions, 1 or -1.
+    """
+    if step <= 0:
+        raise ValueError("step must be positive.")
+    if t_end <= t_start:
+        raise ValueError(f"t_end {t_end} is not after t_start {t_start}.")
+    num = max(int(np.ceil((t_end - t_start) / step)), 1) + 1
+    times = np.linspace(t_start, t_end, num)
+    values = np.asarray(g(times), dtype=float)
+    count("events.scan_evaluations", num)
+
+    positive = values >= 0
+    rising = ~positive[:-1] & positive[1:]
+    falling = positive[:-1] & ~positive[1:]
+    if direction > 0:
+        falling[:] = False
+    elif direction < 0:
+        rising[:] = False
+    if atol > 0:
+        noise = np.maximum(np.abs(values[:-1]), np.abs(values[1:])) <= atol
+        rising &= ~noise
+        falling &= ~noise
+
+    index = np.flatnonzero(rising | falling)
+    if index.size == 0:
+        return np.empty(0), np.empty(0, dtype=int)
+    signs = np.where(rising[index], 1, -1)
+
+    roots = _refine(
+        g,
+        times[index].copy(),
+        times[index + 1].copy(),
+        values[index].copy(),
+        values[index + 1].copy(),
+        tol,
+        max_iter,
+    )
+    return roots, signs
+
+
+def detect_events(
+    trajectory,
+    t_start: float,
+    t_end: float,
+    step: float,
+    body_position=None,
+    soi_radius: float = MOON_SOI,
+    sun_direction=None,
+    shadow_radius: float = R_EARTH,
+    tol: float = 1e-6,
+    degenerate_tol: float = 1e-8,
+) -> np.ndarray:
+    """
+    detect_events Apsis passages, node crossings and, when asked for, SOI
+    and shadow crossings along a trajectory.
+
+    Parameters
+    ----------
+    trajectory : callable
+        trajectory(t) -> (K, 6), see kepler_trajectory and
+        hermite_trajectory.
+    t_start, t_end : float
+        Interval to search [s].
+    step : float
+        Coarse sampling step [s], e.g. a tenth of the orbital period.
+    body_position : callable or np.ndarray, optional
+        Position of the body whose sphere of influence is checked, see
+        soi_function.
+    soi_radius : float, optional
+        Sphere of influence radius [km].
+    sun_direction : callable or np.ndarray, optional
+        Direction of the Sun for shadow crossings, see shadow_function.
+    shadow_radius : float, optional
+        Radius of the shadowing central body [km].
+    tol : float, optional
+        Time tolerance [s].
+    degenerate_tol : float, optional
+        Apsis and node functions within this of zero are noise, so
+        orbits with e or sin(i) below about this have no apsis or node
+        events rather than spurious ones at every sample.
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with EVENT_DTYPE fields, ordered by time. Kinds
+        are periapsis, apoapsis, ascending_node, descending_node,
+        soi_entry, soi_exit, shadow_entry and shadow_exit.
+    """
+    # (event function, kind when rising, kind when falling, noise level)
+    functions = [
+        (apsis_function(trajectory), "periapsis", "apoapsis", degenerate_tol),
+        (
+            node_function(trajectory),
+            "ascending_node",
+            "descending_node",
+            degenerate_tol,
+        ),
+    ]
+    if body_position is not None:
+        functions.append(
+            (
+                soi_function(trajectory, body_position, soi_radius),
+                "soi_exit",
+                "soi_entry",
+                0.0,
+            )
+        )
+    if sun_direction is not None:
+        functions.append(
+            (
+                shadow_function(trajectory, sun_direction, shadow_radius),
+                "shadow_exit",
+                "shadow_entry",
+                0.0,
+            )
+        )
+
+    events = []
+    for g, rising, falling, atol in functions:
+        roots, signs = find_roots(g, t_start, t_end, step, tol=tol, atol=atol)
+        found = np.empty(len(roots), dtype=EVENT_DTYPE)
+        found["time"] = roots
+        found["kind"] = np.where(signs > 0, rising, falling)
+        events.append(found)
+
+    events = np.concatenate(events)
+    return events[np.argsort(events["time"], kind="stable")]
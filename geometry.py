@@ -0,0 +1,179 @@
+"""
+Conic geometry kernels.
+
+Broadcasting versions of the orbit shape helpers that used to be copied
+between task1_orbits.py and the archive scripts. Every function takes
+arrays of (a, e, θ) that broadcast together, e.g. a and e of shape (N, 1)
+against θ of shape (360,) for N orbit curves at once, and can write into
+a caller supplied out= buffer. Temporaries are at most the size of an
+input, never of the full (N, 360) result, so a preallocated buffer is
+filled without further allocation.
+
+dtype picks the precision of new outputs, float32 halves the memory of
+large batches of plotting curves. Angles are in radians.
+"""
+
+import numpy as np
+
+
+def _output(shape, out, dtype):
+    if out is None:
+        return np.empty(shape, dtype=np.float64 if dtype is None else dtype)
+    if out.shape != tuple(shape):
+        raise ValueError(f"out has shape {out.shape}, expected {tuple(shape)}.")
+    return out
+
+
+def calc_p(a, e, out: np.ndarray = None, dtype=None) -> np.ndarray:
+    """calc_p Semi-latus rectum of a conic, p = a(1 - e²) [km]."""
+    a = np.asarray(a)
+    e = np.asarray(e)
+    out = _output(np.broadcast_shapes(a.shape, e.shape), out, dtype)
+    np.multiply(e, e, out=out)
+    np.subtract(1, out, out=out)
+    return np.multiply(a, out, out=out)
+
+
+def calc_r(a, e, theta, out: np.ndarray = None, dtype=None) -> np.ndarray:
+    """
+    calc_r Radius on a conic, r = a(1 - e²) / (1 + e cos θ).
+
+    Parameters
+    ----------
+    a : np.ndarray
+        Semi-major axis [km].
+    e : np.ndarray
+        Eccentricity.
+    theta : np.ndarray
+        True anomaly, θ [rad].
+    out : np.ndarray, optional
+        Buffer of the broadcast shape to write into.
+    dtype : np.dtype, optional
+        Precision of a new output, float64 by default.
+
+    Returns
+    -------
+    np.ndarray
+        Radii [km], this is out when given.
+    """
+    a = np.asarray(a)
+    e = np.asarray(e)
+    theta = np.asarray(theta)
+    out = _output(np.broadcast_shapes(a.shape, e.shape, theta.shape), out, dtype)
+
+    np.cos(theta, out=out)
+    np.multiply(out, e, out=out)
+    np.add(out, 1, out=out)
+    return np.divide(calc_p(a, e), out, out=out)
+
+
+def calc_a(ra, rb, out: np.ndarray = None, dtype=None) -> np.ndarray:
+    """calc_a Semi-major axis of an orbit through two apsides ra and rb [km]."""
+    ra = np.asarray(ra)
+    rb = np.asarray(rb)
+    out = _output(np.broadcast_shapes(ra.shape, rb.shape), out, dtype)
+    np.add(ra, rb, out=out)
+    return np.multiply(out, 0.5, out=out)
+
+
+def calc_transfer_e(ra, rb, theta_a, theta_b, out: np.ndarray = None, dtype=None):
+    """
+    calc_transfer_e Eccentricity of the coaxial conic through (ra, θa) and
+    (rb, θb), e = (rb - ra) / (ra cos θa - rb cos θb).
+
+    Parameters
+    ----------
+    ra, rb : np.ndarray
+        Radii of the two points [km].
+    theta_a, theta_b : np.ndarray
+        True anomalies of the two points [rad].
+    out : np.ndarray, optional
+        Buffer of the broadcast shape to write into.
+    dtype : np.dtype, optional
+        Precision of a new output, float64 by default.
+
+    Returns
+    -------
+    np.ndarray
+        Eccentricities, this is out when given.
+    """
+    ra = np.asarray(ra)
+    rb = np.asarray(rb)
+    shape = np.broadcast_shapes(
+        ra.shape, rb.shape, np.shape(theta_a), np.shape(theta_b)
+    )
+    out = _output(shape, out, dtype)
+
+    np.cos(theta_a, out=out)
+    np.multiply(out, ra, out=out)
+    np.subtract(out, rb * np.cos(theta_b), out=out)
+    return np.divide(rb - ra, out, out=out)
+
+
+def calc_ellipse_focus(a, e, out: np.ndarray = None, dtype=None) -> np.ndarray:
+    """
+    calc_ellipse_focus x of the ellipse centre when the focus is at the
+    origin and periapsis on +x, -ae [km].
+    """
+    a = np.asarray(a)
+    e = np.asarray(e)
+    out = _output(np.broadcast_shapes(a.shape, e.shape), out, dtype)
+    np.multiply(a, e, out=out)
+    return np.negative(out, out=out)
+
+
+def calc_xy_parametric(a, e, theta, out: np.ndarray = None, dtype=None):
+    """
+    calc_xy_parametric Perifocal x, y of points on a conic, focus at the
+    origin and periapsis on +x.
+
+    Parameters
+    ----------
+    a, e, theta : np.ndarray
+        Semi-major axis [km], eccentricity and true anomaly [rad],
+        broadcast together.
+    out : np.ndarray, optional
+        Buffer of shape broadcast shape + (2,) to write into.
+    dtype : np.dtype, optional
+        Precision of a new output, float64 by default.
+
+    Returns
+    -------
+    np.ndarray
+        Points with a trailing (x, y) axis [km], this is out when given.
+    """
+    theta = np.asarray(theta)
+    shape = np.broadcast_shapes(np.shape(a), np.shape(e), theta.shape)
+    out = _output(shape + (2,), out, dtype)
+
+    x, y = out[..., 0], out[..., 1]
+    calc_r(a, e, theta, out=x)
+    np.multiply(x, np.sin(theta), out=y)
+    np.multiply(x, np.cos(theta), out=x)
+    return out
+
+
+def orbit_curves(a, e, num: int = 360, out: np.ndarray = None, dtype=None):
+    """
+    orbit_curves Closed perifocal curves for a batch of orbits.
+
+    Parameters
+    ----------
+    a, e : np.ndarray
+        Semi-major axes [km] and eccentricities (< 1), shape (N,).
+    num : int, optional
+        Points per curve, the first and last coincide.
+    out : np.ndarray, optional
+        Buffer of shape (N, num, 2), reused across calls.
+    dtype : np.dtype, optional
+        Precision of a new output, float64 by default.
+
+    Returns
+    -------
+    np.ndarray
+        Curves of shape (N, num, 2) [km].
+    """
+    a = np.asarray(a)[:, None]
+    e = np.asarray(e)[:, None]
+    theta = np.linspace(0, 2 * np.pi, num, dtype=dtype)
+    return calc_xy_parametric(a, e, theta, out=out, dtype=dtype)
@@ -0,0 +1,194 @@
+"""
+Lunar ground tracks.
+
+Sub-satellite latitude and longitude of Moon-centred spacecraft in the
+MOON_ME_DE421 (mean Earth / polar axis) frame, the frame moon/moon.png is
+referenced to. Whole time arrays are rotated at once with the lunar
+orientation from the binary PCK in moon/, so the Moon's rotation under the
+orbit is included and no SPK or network access is needed.
+
+Positions are Moon-centred with ICRF axes, epochs are TDB seconds past
+J2000 (see ephemeris.datetime_to_et). Units are km and s, latitude and
+longitude are returned in degrees for plotting on a map.
+"""
+
+import numpy as np
+
+from constants import MU_MOON, R_MOON
+from ephemeris import get_ephemeris
+from kepler_solver import solve_kepler
+from orbit import calc_position
+
+FRAME = "MOON_ME_DE421"
+
+
+def orbit_positions(times, a, e, i=0.0, raan=0.0, argp=0.0, t_p=0.0, mu=MU_MOON):
+    """
+    orbit_positions Positions along a Keplerian orbit for an array of times.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Epochs [s].
+    a : float
+        Semi-major axis [km].
+    e : float
+        Eccentricity.
+    i, raan, argp : float, optional
+        Inclination, right ascension of the ascending node and argument of
+        periapsis relative to the ICRF equator [rad].
+    t_p : float, optional
+        Epoch of periapsis passage [s].
+    mu : float, optional
+        Gravitational parameter of the central body [km^3/s^2].
+
+    Returns
+    -------
+    np.ndarray
+        Positions of shape times.shape + (3,) [km].
+    """
+    times = np.asarray(times, dtype=float)
+    n = np.sqrt(mu / a**3)
+    mean_anomalies = np.mod(n * (times - t_p), 2 * np.pi)
+    _, nu, converged = solve_kepler(mean_anomalies, e)
+    if not np.all(converged):
+        raise RuntimeError("Kepler solver did not converge for the ground track.")
+    return calc_position(a, e, i, raan, argp, nu)
+
+
+def body_fixed(positions, et, frame: str = FRAME, ephemeris=None) -> np.ndarray:
+    """
+    body_fixed Rotate Moon-centred ICRF positions into the body-fixed frame.
+
+    Parameters
+    ----------
+    positions : np.ndarray
+        Positions, or full states, with a trailing axis of 3 (or 6) [km].
+    et : np.ndarray
+        Epoch of each position, broadcast against positions[..., 0].
+    frame : str, optional
+        Body-fixed frame name known to the ephemeris.
+    ephemeris : ephemeris.Ephemeris, optional
+        Defaults to the shared one for the kernels in moon/.
+
+    Returns
+    -------
+    np.ndarray
+        Body-fixed positions of shape (..., 3) [km].
+    """
+    if ephemeris is None:
+        ephemeris = get_ephemeris()
+    positions = np.asarray(positions, dtype=float)[..., :3]
+    rotation = ephemeris.rotation(frame, et)
+    return np.einsum("...ij,...j->...i", rotation, positions)
+
+
+def ground_track(
+    positions, et, frame: str = FRAME, ephemeris=None, radius: float = R_MOON
+):
+    """
+    ground_track Sub-satellite latitude, longitude and altitude.
+
+    Parameters
+    ----------
+    positions : np.ndarray
+        Moon-centred ICRF positions or states, shape (..., 3) or (..., 6)
+        [km], e.g. from orbit_positions or propagator.propagate.
+    et : np.ndarray
+        Epoch of each position, TDB seconds past J2000.
+    frame : str, optional
+        Body-fixed frame, MOON_ME_DE421 to match moon/moon.png.
+    ephemeris : ephemeris.Ephemeris, optional
+        Defaults to the shared one for the kernels in moon/.
+    radius : float, optional
+        Mean radius used for the altitude [km].
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Planetocentric latitude [deg], east longitude in [-180, 180) [deg]
+        and altitude above the mean sphere [km].
+    """
+    fixed = body_fixed(positions, et, frame=frame, ephemeris=ephemeris)
+    x, y, z = np.moveaxis(fixed, -1, 0)
+    r = np.sqrt(x * x + y * y + z * z)
+
+    latitude = np.degrees(np.arcsin(z / r))
+    longitude = np.mod(np.degrees(np.arctan2(y, x)) + 180, 360) - 180
+    return latitude, longitude, r - radius
+
+
+def split_wrapped(longitude, latitude, jump: float = 180.0):
+    """
+    split_wrapped Break a track where it crosses the ±180° meridian.
+
+    A NaN is inserted between samples whose longitudes differ by more than
+    jump, so matplotlib lifts the pen instead of drawing a line straight
+    across the map.
+
+    Parameters
+    ----------
+    longitude, latitude : np.ndarray
+        1D track in time order [deg].
+    jump : float, optional
+        Longitude step treated as a wrap [deg].
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Longitude and latitude with NaN separators, as floats.
+    """
+    longitude = np.asarray(longitude, dtype=float)
+    latitude = np.asarray(latitude, dtype=float)
+    breaks = np.flatnonzero(np.abs(np.diff(longitude)) > jump) + 1
+    return np.insert(longitude, breaks, np.nan), np.insert(latitude, breaks, np.nan)
+
+
+def lunar_orbit_track(
+    epoch: float = 0.0,
+    a: float = None,
+    e: float = None,
+    i: float = 0.0,
+    raan: float = 0.0,
+    argp: float = 0.0,
+    periods: float = None,
+    num: int = None,
+    mu: float = MU_MOON,
+):
+    """
+    lunar_orbit_track Ground track of the mission's final lunar orbit.
+
+    Parameters
+    ----------
+    epoch : float
+        Start of the track and periapsis epoch, TDB seconds past J2000.
+    a, e, i, raan, argp : float, optional
+        Elements of the lunar orbit, angles relative to the ICRF [rad].
+        a and e default to the "lunar_orbit" phase of
+        mission.default_phases.
+    periods : float, optional
+        Number of orbital periods to cover, as in that phase by default.
+    num : int, optional
+        Number of samples, as in that phase by default.
+    mu : float, optional
+        Gravitational parameter of the Moon [km^3/s^2].
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Longitude and latitude [deg], split at the wrap.
+    """
+    from mission import default_phase
+
+    lunar_orbit = default_phase("lunar_orbit")
+    a = lunar_orbit.a if a is None else a
+    e = lunar_orbit.e if e is None else e
+    periods = lunar_orbit.periods if periods is None else periods
+    num = lunar_orbit.num if num is None else num
+
+    period = 2 * np.pi * np.sqrt(a**3 / mu)
+    et = np.linspace(epoch, epoch + periods * period, num)
+    positions = orbit_positions(et, a, e, i, raan, argp, t_p=epoch, mu=mu)
+    latitude, longitude, _ = ground_track(positions, et)
+    longitude, latitude = split_wrapped(longitude, latitude)
+    return longitude, latitude
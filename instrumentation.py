@@ -0,0 +1,188 @@
+"""
+Opt-in timing, memory and counter instrumentation.
+
+Phases are named blocks of work, either a `with phase("name"):` block or a
+function wrapped in @timed. Nested phases are reported under their parent,
+e.g. "lunar_orbit/state_machine.state_machine". Counters accumulate
+numbers such as Kepler solver iterations and sample counts.
+
+Everything is off by default, and while disabled a timed function costs
+one global check and count() returns straight away. Enable it in code
+with enable(), or for a whole run with ORBIT_MECH_PROFILE=1. Set
+ORBIT_MECH_PROFILE to a path ending in .json to also choose where
+state_machine.main writes the report.
+"""
+
+import functools
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_enabled = False
+_memory = False
+# Whether enable started tracemalloc, a caller's own tracing is left running.
+_started_tracing = False
+# Open phases: [name, path, start time, peak traced bytes, bytes at entry]
+_stack = []
+_phases = {}  # path -> {"calls", "seconds", "peak_bytes"}
+_counters = {}
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(memory: bool = False):
+    """
+    enable Start recording phases and counters.
+
+    Parameters
+    ----------
+    memory : bool, optional
+        Also track the peak traced memory of each phase with tracemalloc,
+        which slows allocation heavy code down noticeably. Tracing that is
+        already on is reused and left on by disable, but every phase
+        boundary resets its peak.
+    """
+    global _enabled, _memory, _started_tracing
+    _enabled = True
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracing = True
+
+
+def disable():
+    global _enabled, _memory, _started_tracing
+    if _started_tracing and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _enabled = False
+    _memory = False
+    _started_tracing = False
+
+
+def reset():
+    """reset Forget everything recorded so far."""
+    _stack.clear()
+    _phases.clear()
+    _counters.clear()
+
+
+def count(name: str, value=1):
+    """count Add value to a counter, when enabled."""
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def _enter(name: str):
+    path = "/".join([frame[0] for frame in _stack] + [name])
+    # Create the record now so the report lists phases in entry order.
+    _phases.setdefault(path, {"calls": 0, "seconds": 0.0, "peak_bytes": None})
+
+    current = 0
+    if _memory:
+        current, peak = tracemalloc.get_traced_memory()
+        if _stack:
+            _stack[-1][3] = max(_stack[-1][3], peak)
+        tracemalloc.reset_peak()
+    _stack.append([name, path, time.perf_counter(), current, current])
+
+
+def _exit():
+    _, path, start, peak, current = _stack.pop()
+    seconds = time.perf_counter() - start
+
+    record = _phases[path]
+    record["calls"] += 1
+    record["seconds"] += seconds
+    if _memory:
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        if _stack:
+            _stack[-1][3] = max(_stack[-1][3], peak)
+        # Report what the phase allocated on top of what it started with.
+        record["peak_bytes"] = max(record["peak_bytes"] or 0, peak - current)
+
+
+@contextmanager
+def phase(name: str):
+    """phase Time the enclosed block as a named phase, when enabled."""
+    if not _enabled:
+        yield
+        return
+
+    _enter(name)
+    try:
+        yield
+    finally:
+        _exit()
+
+
+def timed(function=None, name: str = None):
+    """
+    timed Record every call of a function as a phase, when enabled.
+
+    Use as @timed or @timed(name="..."), the default name is
+    module.qualname.
+    """
+    if function is None:
+        return functools.partial(timed, name=name)
+
+    module = function.__module__
+    if module == "__main__":
+        # Name functions of a script run directly after its file.
+        module = os.path.splitext(os.path.basename(function.__code__.co_filename))[0]
+    label = name or f"{module}.{function.__qualname__}"
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return function(*args, **kwargs)
+        _enter(label)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _exit()
+
+    return wrapper
+
+
+def report() -> dict:
+    """
+    report Everything recorded so far.
+
+    Returns
+    -------
+    dict
+        "phases": path -> calls, total seconds and peak_bytes, the most
+        memory allocated above the level at entry (None without memory
+        tracking). Phases are in the order they were first entered.
+        "counters": name -> total.
+    """
+    return {
+        "memory_tracked": _memory,
+        "phases": {path: dict(record) for path, record in _phases.items()},
+        "counters": dict(_counters),
+    }
+
+
+def write_report(path: str) -> dict:
+    """write_report Save report() as JSON and return it."""
+    data = report()
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+    return data
+
+
+def report_path_from_env() -> str:
+    """
+    report_path_from_env Report file requested with ORBIT_MECH_PROFILE,
+    or None when profiling was not asked for.
+    """
+    setting = os.environ.get("ORBIT_MECH_PROFILE", "").strip()
+    if setting.lower() in ("", "0", "false", "no"):
+        return None
+    if setting.lower().endswith(".json"):
+        return setting
+    return "profile_report.json"
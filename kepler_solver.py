@@ -0,0 +1,261 @@
+"""
+Vectorised solvers for Kepler's equation, M = E - e sin(E).
+
+Everything here works on whole arrays of mean anomalies at once,
+so we never loop over samples in Python. Angles are in radians.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+from instrumentation import count
+
+TWO_PI = 2 * np.pi
+
+# Precomputed M -> E tables, most recently used last.
+_table_cache = OrderedDict()
+_table_cache_max_bytes = 64 * 1024**2
+
+
+def eccentric_to_true_anomaly(eccentric_anomalies, e):
+    """
+    eccentric_to_true_anomaly Convert eccentric anomalies to true anomalies.
+
+    Parameters
+    ----------
+    eccentric_anomalies : np.ndarray
+        Eccentric anomalies, E [rad].
+    e : float or np.ndarray
+        Eccentricity, broadcast against E.
+
+    Returns
+    -------
+    np.ndarray
+        True anomalies in [0, 2π) [rad].
+    """
+    E = np.asarray(eccentric_anomalies, dtype=float)
+    e = np.asarray(e, dtype=float)
+    nu = 2 * np.arctan2(np.sqrt(1 + e) * np.sin(E / 2), np.sqrt(1 - e) * np.cos(E / 2))
+    return np.mod(nu, TWO_PI)
+
+
+def solve_kepler(mean_anomalies, e, tol: float = 1e-12, max_iter: int = 50):
+    """
+    solve_kepler Solve Kepler's equation for arrays of mean anomalies.
+
+    Uses Newton iterations from Danby's starting guess. Only the
+    elements that have not converged yet are updated each iteration,
+    so the cost is linear in the number of samples.
+
+    Parameters
+    ----------
+    mean_anomalies : np.ndarray
+        Mean anomalies, M [rad]. Any range, wrapped to [0, 2π).
+    e : float or np.ndarray
+        Eccentricities in [0, 1), broadcast against mean_anomalies.
+    tol : float, optional
+        Convergence tolerance on the Newton step [rad].
+    max_iter : int, optional
+        Maximum number of Newton iterations.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (eccentric anomalies, true anomalies, converged flags), all with
+        the broadcast shape of the inputs. Anomalies are in [0, 2π).
+    """
+    M, e = np.broadcast_arrays(
+        np.asarray(mean_anomalies, dtype=float), np.asarray(e, dtype=float)
+    )
+    if np.any((e < 0) | (e >= 1)):
+        raise ValueError(
+            "Eccentricity must satisfy 0 <= e < 1 for an elliptical orbit."
+        )
+
+    shape = M.shape
+    M = M.ravel()
+    e = e.ravel()
+
+    # Work in [-π, π) so the starting guess sits on the right side of the root.
+    M_wrapped = np.mod(M + np.pi, TWO_PI) - np.pi
+    E = M_wrapped + 0.85 * e * np.sign(np.sin(M_wrapped))
+
+    converged = e == 0
+    E[converged] = M_wrapped[converged]
+    active = np.flatnonzero(~converged)
+
+    iterations = 0
+    updates = 0
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        iterations += 1
+        updates += active.size
+
+        E_a = E[active]
+        e_a = e[active]
+        step = (E_a - e_a * np.sin(E_a) - M_wrapped[active]) / (1 - e_a * np.cos(E_a))
+        E[active] = E_a - step
+
+        done = np.abs(step) < tol
+        converged[active[done]] = True
+        active = active[~done]
+
+    count("kepler.solves")
+    count("kepler.samples", M.size)
+    count("kepler.newton_iterations", iterations)
+    count("kepler.newton_updates", updates)
+
+    E = np.mod(E, TWO_PI)
+    nu = eccentric_to_true_anomaly(E, e)
+
+    return E.reshape(shape), nu.reshape(shape), converged.reshape(shape)
+
+
+class KeplerTable:
+    """
+    KeplerTable Dense M -> E lookup table for a single eccentricity.
+
+    The table holds E and dE/dM on a uniform grid in M, so a lookup is
+    an index computation and a cubic Hermite interpolation. The worst
+    interpolation error is measured at build time, and lookups take
+    just enough Newton steps to bring it under tol.
+
+    Parameters
+    ----------
+    e : float
+        Eccentricity in [0, 1).
+    size : int, optional
+        Number of table intervals over one revolution.
+    tol : float, optional
+        Target accuracy of the returned eccentric anomalies [rad].
+    """
+
+    def __init__(self, e: float, size: int = 8192, tol: float = 1e-12):
+        if not 0 <= e < 1:
+            raise ValueError(
+                "Eccentricity must satisfy 0 <= e < 1 for an elliptical orbit."
+            )
+
+        self.e = float(e)
+        self.tol = tol
+        self.size = size
+        self.h = TWO_PI / size
+
+        M = np.linspace(0, TWO_PI, size + 1)
+        self.E, _, _ = solve_kepler(M, self.e, tol=tol)
+        self.E[-1] = TWO_PI
+        # Hermite slopes, scaled by the grid spacing.
+        self.dE = self.h / (1 - self.e * np.cos(self.E))
+
+        # Worst interpolation error, checked at the midpoints between nodes.
+        M_mid = M[:-1] + self.h / 2
+        E_mid, _, _ = solve_kepler(M_mid, self.e, tol=tol)
+        self.max_table_error = float(np.max(np.abs(self._interpolate(M_mid) - E_mid)))
+
+        # Newton converges quadratically: err_k+1 <= K err_k^2 with
+        # K = max|f''| / (2 min|f'|) = e / (2 (1 - e)).
+        # The bound only guarantees convergence while K * err < 1, past
+        # that (e very close to 1) the table falls back to solve_kepler.
+        self._K = self.e / (2 * (1 - self.e))
+        error = self.max_table_error
+        self.newton_steps = 0
+        while error > tol and self.newton_steps is not None:
+            if self._K * error >= 1 or self.newton_steps == 10:
+                self.newton_steps = None
+            else:
+                error = self._K * error**2
+                self.newton_steps += 1
+
+    @property
+    def nbytes(self) -> int:
+        return self.E.nbytes + self.dE.nbytes
+
+    def _interpolate(self, M: np.ndarray) -> np.ndarray:
+        x = M / self.h
+        k = np.minimum(x.astype(np.intp), self.size - 1)
+        t = x - k
+        t2 = t * t
+        t3 = t2 * t
+
+        return (
+            (2 * t3 - 3 * t2 + 1) * self.E[k]
+            + (t3 - 2 * t2 + t) * self.dE[k]
+            + (3 * t2 - 2 * t3) * self.E[k + 1]
+            + (t3 - t2) * self.dE[k + 1]
+        )
+
+    def solve(self, mean_anomalies):
+        """
+        solve Look up the eccentric and true anomalies.
+
+        Parameters
+        ----------
+        mean_anomalies : np.ndarray
+            Mean anomalies [rad], any range.
+
+        Returns
+        -------
+        tuple of np.ndarray
+            (eccentric anomalies, true anomalies, converged flags), as
+            for solve_kepler.
+        """
+        if self.newton_steps is None:
+            return solve_kepler(mean_anomalies, self.e, tol=self.tol)
+
+        M = np.mod(np.asarray(mean_anomalies, dtype=float), TWO_PI)
+        E = self._interpolate(M)
+
+        converged = np.full(E.shape, self.max_table_error < self.tol)
+        for _ in range(self.newton_steps):
+            step = (E - self.e * np.sin(E) - M) / (1 - self.e * np.cos(E))
+            E -= step
+            converged = self._K * step**2 < self.tol
+
+        E = np.mod(E, TWO_PI)
+        return E, eccentric_to_true_anomaly(E, self.e), converged
+
+
+def get_kepler_table(e: float, size: int = 8192, tol: float = 1e-12) -> KeplerTable:
+    """
+    get_kepler_table Fetch a KeplerTable from the LRU cache, building it
+    if needed. The least recently used tables are dropped once the cache
+    holds more than the memory cap.
+    """
+    key = (float(e), size, tol)
+    table = _table_cache.get(key)
+
+    if table is None:
+        table = KeplerTable(e, size=size, tol=tol)
+        _table_cache[key] = table
+    _table_cache.move_to_end(key)
+
+    while (
+        len(_table_cache) > 1 and kepler_table_cache_nbytes() > _table_cache_max_bytes
+    ):
+        _table_cache.popitem(last=False)
+
+    return table
+
+
+def kepler_table_cache_nbytes() -> int:
+    return sum(table.nbytes for table in _table_cache.values())
+
+
+def set_kepler_table_cache_limit(max_bytes: int) -> None:
+    global _table_cache_max_bytes
+    _table_cache_max_bytes = max_bytes
+
+
+def clear_kepler_table_cache() -> None:
+    _table_cache.clear()
+
+
+def solve_kepler_cached(mean_anomalies, e: float, tol: float = 1e-12, size: int = 8192):
+    """
+    solve_kepler_cached Same as solve_kepler for a single eccentricity, but
+    served from a cached KeplerTable instead of iterating from scratch.
+    """
+    count("kepler.table_samples", np.size(mean_anomalies))
+    return get_kepler_table(e, size=size, tol=tol).solve(mean_anomalies)
@@ -0,0 +1,193 @@
+"""
+Vectorised Lambert solver.
+
+Given two position vectors and a time of flight, find the transfer arc
+between them. Uses the universal variable formulation (Curtis, ch. 5.3),
+solved by bisection on z over whole arrays of problems at once, so a
+porkchop grid is a single call instead of a loop of scalar solves.
+
+Units are km, s and km^3/s^2.
+"""
+
+import numpy as np
+
+
+def stumpff_c(z):
+    z = np.asarray(z, dtype=float)
+    result = np.full(z.shape, 0.5)
+    pos = z > 1e-8
+    neg = z < -1e-8
+    small = ~(pos | neg)
+
+    sqrt_z = np.sqrt(z[pos])
+    result[pos] = (1 - np.cos(sqrt_z)) / z[pos]
+    sqrt_mz = np.sqrt(-z[neg])
+    result[neg] = (np.cosh(sqrt_mz) - 1) / -z[neg]
+    result[small] = 0.5 - z[small] / 24 + z[small] ** 2 / 720
+    return result
+
+
+def stumpff_s(z):
+    z = np.asarray(z, dtype=float)
+    result = np.full(z.shape, 1 / 6)
+    pos = z > 1e-8
+    neg = z < -1e-8
+    small = ~(pos | neg)
+
+    sqrt_z = np.sqrt(z[pos])
+    result[pos] = (sqrt_z - np.sin(sqrt_z)) / sqrt_z**3
+    sqrt_mz = np.sqrt(-z[neg])
+    result[neg] = (np.sinh(sqrt_mz) - sqrt_mz) / sqrt_mz**3
+    result[small] = 1 / 6 - z[small] / 120 + z[small] ** 2 / 5040
+    return result
+
+
+def _time_of_flight(z, r1, r2, A, mu):
+    """
+    Time of flight as a function of z, plus y(z). Where y <= 0 there is
+    no valid transfer and the time is returned as NaN.
+    """
+    C = stumpff_c(z)
+    S = stumpff_s(z)
+    y = r1 + r2 + A * (z * S - 1) / np.sqrt(C)
+    valid = y > 0
+    y_safe = np.where(valid, y, 1.0)
+    chi = np.sqrt(y_safe / C)
+    t = (chi**3 * S + A * np.sqrt(y_safe)) / np.sqrt(mu)
+    return np.where(valid, t, np.nan), y
+
+
+def _bisect(lo, hi, target, t_of_z, increasing, max_iter, rtol):
+    """
+    Bisect t_of_z(z) = target on [lo, hi] elementwise. NaN times count as
+    being on the low-z side when increasing, and the high-z side otherwise.
+    """
+    for _ in range(max_iter):
+        mid = 0.5 * (lo + hi)
+        t = t_of_z(mid)
+        if increasing:
+            go_up = np.isnan(t) | (t < target)
+        else:
+            go_up = ~np.isnan(t) & (t > target)
+        lo = np.where(go_up, mid, lo)
+        hi = np.where(go_up, hi, mid)
+
+        if np.all(np.abs(t - target) <= rtol * target):
+            break
+
+    z = 0.5 * (lo + hi)
+    t = t_of_z(z)
+    return z, np.abs(t - target) <= np.sqrt(rtol) * target
+
+
+def _golden_minimum(lo, hi, t_of_z, iterations=80):
+    """Elementwise golden-section search for the minimum of t_of_z."""
+    ratio = (np.sqrt(5) - 1) / 2
+    a, b = lo.copy(), hi.copy()
+    for _ in range(iterations):
+        c = b - ratio * (b - a)
+        d = a + ratio * (b - a)
+        tc = np.nan_to_num(t_of_z(c), nan=np.inf)
+        td = np.nan_to_num(t_of_z(d), nan=np.inf)
+        left = tc < td
+        b = np.where(left, d, b)
+        a = np.where(left, a, c)
+    return 0.5 * (a + b)
+
+
+def lambert(
+    r1,
+    r2,
+    tof,
+    gravitational_parameter,
+    revolutions: int = 0,
+    prograde: bool = True,
+    branch: str = "left",
+    max_iter: int = 200,
+    rtol: float = 1e-12,
+):
+    """
+    lambert Solve batches of Lambert problems.
+
+    Parameters
+    ----------
+    r1, r2 : np.ndarray
+        Initial and final position vectors, shape (..., 3) [km].
+    tof : np.ndarray
+        Times of flight, shape (...) [s]. All inputs broadcast together.
+    gravitational_parameter : float
+        Gravitational parameter of the central body [km^3/s^2].
+    revolutions : int, optional
+        Number of complete revolutions before arrival.
+    prograde : bool, optional
+        Transfer in the direction of positive angular momentum about z.
+    branch : str, optional
+        For revolutions > 0 there are two solutions, "left" is the one
+        with the smaller z (higher energy), "right" the larger z.
+    max_iter : int, optional
+        Bisection iteration cap.
+    rtol : float, optional
+        Relative tolerance on the time of flight.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (v1, v2, converged), velocities of shape (..., 3) [km/s] and flags
+        of shape (...). Problems without a solution (time of flight below
+        the multi-revolution minimum, or a 180° transfer) are NaN with
+        converged False.
+    """
+    if branch not in ("left", "right"):
+        raise ValueError('branch must be "left" or "right".')
+
+    r1, r2 = np.broadcast_arrays(
+        np.asarray(r1, dtype=float), np.asarray(r2, dtype=float)
+    )
+    shape = np.broadcast_shapes(r1.shape[:-1], np.shape(tof))
+    r1 = np.broadcast_to(r1, shape + (3,)).reshape(-1, 3)
+    r2 = np.broadcast_to(r2, shape + (3,)).reshape(-1, 3)
+    tof = np.broadcast_to(np.asarray(tof, dtype=float), shape).ravel()
+    mu = gravitational_parameter
+
+    r1_norm = np.linalg.norm(r1, axis=-1)
+    r2_norm = np.linalg.norm(r2, axis=-1)
+    cos_dtheta = np.clip(np.sum(r1 * r2, axis=-1) / (r1_norm * r2_norm), -1, 1)
+    dtheta = np.arccos(cos_dtheta)
+    cross_z = np.cross(r1, r2)[:, 2]
+    long_way = (cross_z < 0) if prograde else (cross_z >= 0)
+    dtheta = np.where(long_way, 2 * np.pi - dtheta, dtheta)
+
+    A = np.sin(dtheta) * np.sqrt(r1_norm * r2_norm / (1 - cos_dtheta))
+
+    def t_of_z(z):
+        return _time_of_flight(z, r1_norm, r2_norm, A, mu)[0]
+
+    n = len(tof)
+    if revolutions == 0:
+        lo = np.full(n, -4 * np.pi**2)
+        hi = np.full(n, (2 * np.pi) ** 2 * (1 - 1e-9))
+        z, converged = _bisect(lo, hi, tof, t_of_z, True, max_iter, rtol)
+    else:
+        lo = np.full(n, (2 * np.pi * revolutions) ** 2 * (1 + 1e-9))
+        hi = np.full(n, (2 * np.pi * (revolutions + 1)) ** 2 * (1 - 1e-9))
+        z_min = _golden_minimum(lo, hi, t_of_z)
+        if branch == "left":
+            z, converged = _bisect(lo, z_min, tof, t_of_z, False, max_iter, rtol)
+        else:
+            z, converged = _bisect(z_min, hi, tof, t_of_z, True, max_iter, rtol)
+
+    converged &= np.abs(A) > 1e-12 * (r1_norm + r2_norm)
+
+    _, y = _time_of_flight(z, r1_norm, r2_norm, A, mu)
+    # Lagrange coefficients.
+    f = 1 - y / r1_norm
+    g = A * np.sqrt(np.abs(y) / mu)
+    g_dot = 1 - y / r2_norm
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        v1 = (r2 - f[:, None] * r1) / g[:, None]
+        v2 = (g_dot[:, None] * r2 - r1) / g[:, None]
+    v1[~converged] = np.nan
+    v2[~converged] = np.nan
+
+    return v1.reshape(shape + (3,)), v2.reshape(shape + (3,)), converged.reshape(shape)
@@ -0,0 +1,176 @@
+"""
+Impulsive manoeuvre Δv calculations.
+
+Every function broadcasts over its array arguments, so a whole set of
+candidate orbit pairs is evaluated in one call. Units are km, s, km/s,
+km^3/s^2 and radians.
+"""
+
+import numpy as np
+
+
+def vis_viva(r, a, gravitational_parameter):
+    """
+    vis_viva Orbital speed at radius r on an orbit with semi-major axis a.
+    """
+    return np.sqrt(gravitational_parameter * (2 / r - 1 / a))
+
+
+def circular_speed(r, gravitational_parameter):
+    return np.sqrt(gravitational_parameter / r)
+
+
+def apsis_burn(r, a_initial, a_final, gravitational_parameter):
+    """
+    apsis_burn Tangential burn at an apsis that moves the opposite apsis.
+
+    Parameters
+    ----------
+    r : np.ndarray
+        Radius of the apsis where the burn happens [km].
+    a_initial, a_final : np.ndarray
+        Semi-major axis before and after the burn [km].
+    gravitational_parameter : float
+        Gravitational parameter of the central body [km^3/s^2].
+
+    Returns
+    -------
+    np.ndarray
+        Δv magnitude [km/s].
+    """
+    return np.abs(
+        vis_viva(r, a_final, gravitational_parameter)
+        - vis_viva(r, a_initial, gravitational_parameter)
+    )
+
+
+def plane_change(v, delta_i):
+    """
+    plane_change Pure plane change, speed stays the same.
+    """
+    return 2 * v * np.abs(np.sin(delta_i / 2))
+
+
+def combined_plane_change(v_initial, v_final, delta_i):
+    """
+    combined_plane_change Change speed and plane in a single burn.
+
+    The law of cosines between the velocity before and after the burn.
+    """
+    return np.sqrt(
+        v_initial**2 + v_final**2 - 2 * v_initial * v_final * np.cos(delta_i)
+    )
+
+
+def hohmann(r1, r2, gravitational_parameter):
+    """
+    hohmann Hohmann transfer between two coplanar circular orbits.
+
+    Parameters
+    ----------
+    r1, r2 : np.ndarray
+        Radii of the initial and final circular orbits [km].
+    gravitational_parameter : float
+        Gravitational parameter of the central body [km^3/s^2].
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (Δv at r1, Δv at r2, time of flight [s]).
+    """
+    a_transfer = 0.5 * (r1 + r2)
+    dv1 = np.abs(
+        vis_viva(r1, a_transfer, gravitational_parameter)
+        - circular_speed(r1, gravitational_parameter)
+    )
+    dv2 = np.abs(
+        circular_speed(r2, gravitational_parameter)
+        - vis_viva(r2, a_transfer, gravitational_parameter)
+    )
+    tof = np.pi * np.sqrt(a_transfer**3 / gravitational_parameter)
+    return dv1, dv2, tof
+
+
+def hohmann_plane_change(r1, r2, delta_i, gravitational_parameter):
+    """
+    hohmann_plane_change Hohmann transfer with the plane change folded into
+    the circularisation burn at r2, the cheaper end when r2 > r1.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (Δv at r1, Δv at r2, time of flight [s]).
+    """
+    a_transfer = 0.5 * (r1 + r2)
+    dv1, _, tof = hohmann(r1, r2, gravitational_parameter)
+    dv2 = combined_plane_change(
+        vis_viva(r2, a_transfer, gravitational_parameter),
+        circular_speed(r2, gravitational_parameter),
+        delta_i,
+    )
+    return dv1, dv2, tof
+
+
+def bi_elliptic(r1, r2, r_b, gravitational_parameter):
+    """
+    bi_elliptic Bi-elliptic transfer through an intermediate apoapsis r_b.
+
+    Parameters
+    ----------
+    r1, r2 : np.ndarray
+        Radii of the initial and final circular orbits [km].
+    r_b : np.ndarray
+        Apoapsis of both transfer ellipses [km].
+    gravitational_parameter : float
+        Gravitational parameter of the central body [km^3/s^2].
+
+    Returns
+    -------
+    tuple of np.ndarray
+        (Δv at r1, Δv at r_b, Δv at r2, time of flight [s]).
+    """
+    mu = gravitational_parameter
+    a1 = 0.5 * (r1 + r_b)
+    a2 = 0.5 * (r2 + r_b)
+
+    dv1 = np.abs(vis_viva(r1, a1, mu) - circular_speed(r1, mu))
+    dv2 = np.abs(vis_viva(r_b, a2, mu) - vis_viva(r_b, a1, mu))
+    dv3 = np.abs(vis_viva(r2, a2, mu) - circular_speed(r2, mu))
+    tof = np.pi * (np.sqrt(a1**3 / mu) + np.sqrt(a2**3 / mu))
+    return dv1, dv2, dv3, tof
+
+
+def circularise(r_apsis, a, gravitational_parameter, delta_i=0.0):
+    """
+    circularise Circularise at an apsis, optionally changing plane too.
+
+    Parameters
+    ----------
+    r_apsis : np.ndarray
+        Radius of the apsis where the burn happens [km].
+    a : np.ndarray
+        Semi-major axis of the orbit before the burn [km].
+    gravitational_parameter : float
+        Gravitational parameter of the central body [km^3/s^2].
+    delta_i : np.ndarray, optional
+        Plane change made in the same burn [rad].
+
+    Returns
+    -------
+    np.ndarray
+        Δv magnitude [km/s].
+    """
+    return combined_plane_change(
+        vis_viva(r_apsis, a, gravitational_parameter),
+        circular_speed(r_apsis, gravitational_parameter),
+        delta_i,
+    )
+
+
+def total_dv(*burns):
+    """
+    total_dv Sum the Δv of a manoeuvre sequence, burn by burn.
+
+    Each burn may be an array over candidates, the result broadcasts.
+    """
+    return np.sum(np.broadcast_arrays(*burns), axis=0)
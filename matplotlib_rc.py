@@ -1,19 +1,56 @@
 # Convenient settings to make saved images look nice.
+#
+# Text is rendered by LaTeX (publication mode) or by matplotlib's own
+# mathtext (fast mode, no TeX install needed). Importing this module picks
+# LaTeX when ORBIT_MECH_USETEX=1, mathtext when it is 0, and otherwise
+# LaTeX only if a latex binary is on the PATH. Call set_style to switch.
+
+import os
+import shutil
 
 import matplotlib.pyplot as plt
 import matplotlib as mpl
 
-plt.rcParams["figure.dpi"] = 250
-mpl.rc("axes", labelsize=10, titlesize=16, linewidth=0.2)
-mpl.rc("legend", fontsize=10)
-mpl.rc("xtick", labelsize=12)
-mpl.rc("xtick.major", size=2, width=0.5)
-mpl.rc("xtick.minor", size=1, width=0.25, visible=True)
-mpl.rc("ytick", labelsize=12)
-mpl.rc("ytick.major", size=2, width=0.5)
-mpl.rc("ytick.minor", size=1, width=0.25, visible=True)
-
-# Font
-plt.rc("font", family="serif")
-plt.rc("text", usetex=True)
-plt.rc("font", **{"serif": ["Times New Roman"]})
+
+def latex_default() -> bool:
+    setting = os.environ.get("ORBIT_MECH_USETEX")
+    if setting is not None:
+        return setting.strip().lower() in ("1", "true", "yes")
+    return shutil.which("latex") is not None
+
+
+def set_style(usetex: bool = None):
+    """
+    set_style Apply the plot style, with LaTeX or mathtext for text.
+
+    Parameters
+    ----------
+    usetex : bool, optional
+        True for publication LaTeX, False for fast mathtext. Defaults to
+        latex_default().
+    """
+    if usetex is None:
+        usetex = latex_default()
+
+    plt.rcParams["figure.dpi"] = 250
+    mpl.rc("axes", labelsize=10, titlesize=16, linewidth=0.2)
+    mpl.rc("legend", fontsize=10)
+    mpl.rc("xtick", labelsize=12)
+    mpl.rc("xtick.major", size=2, width=0.5)
+    mpl.rc("xtick.minor", size=1, width=0.25, visible=True)
+    mpl.rc("ytick", labelsize=12)
+    mpl.rc("ytick.major", size=2, width=0.5)
+    mpl.rc("ytick.minor", size=1, width=0.25, visible=True)
+
+    # Font
+    plt.rc("font", family="serif")
+    plt.rc("text", usetex=usetex)
+    if usetex:
+        plt.rc("font", **{"serif": ["Times New Roman"]})
+    else:
+        # STIX is the closest Times lookalike matplotlib ships with.
+        plt.rc("font", **{"serif": ["Times New Roman", "STIXGeneral"]})
+        plt.rc("mathtext", fontset="stix")
+
+
+set_style()
@@ -0,0 +1,229 @@
+"""
+Mission timeline made of Keplerian phases.
+
+A Mission is an ordered list of Phase declarations: central body, μ,
+orbit, how long to fly it and the sampling. Each phase starts at the
+hand-off epoch where the one before it ends, unless it sets its own start.
+
+Phases are evaluated lazily and cached by a key built from the phase's
+own inputs and its start epoch. Editing one phase with Mission.replace
+therefore only recomputes that phase and the phases whose hand-off epoch
+moves as a result, iterating on the lunar orbit never redoes the Earth
+transfer. Given a result_cache.ResultCache, results also persist between
+runs.
+
+Times are seconds since mission start, units are km, s and km^3/s^2.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from constants import MU_EARTH, MU_MOON
+from result_cache import hash_inputs, source_version
+from state_machine import calc_e, calc_mean_anomaly, calc_orbital_period, state_machine
+
+
+class Phase(NamedTuple):
+    name: str
+    body: str  # central body
+    gravitational_parameter: float  # [km^3/s^2]
+    a: float  # semi-major axis [km]
+    e: float  # eccentricity
+    periods: float  # duration in orbital periods, 0.5 for a Hohmann arc
+    step: float = 11  # sample spacing [s]
+    num: int = None  # number of samples, overrides step
+    start: float = None  # start epoch [s], None hands off from the last phase
+    title: str = None  # plot title, defaults to the name
+    filename: str = None  # plot file in plots/, defaults to "<name>.pdf"
+
+    @property
+    def tof(self) -> float:
+        return self.periods * calc_orbital_period(self.a, self.gravitational_parameter)
+
+    def inputs(self) -> "Phase":
+        """inputs The phase without its plot labels, what its results depend on."""
+        return self._replace(title=None, filename=None)
+
+
+class PhaseResult(NamedTuple):
+    phase: Phase
+    key: str
+    start: float  # [s]
+    end: float  # [s]
+    times: np.ndarray  # sample epochs [s]
+    mean_anomalies: np.ndarray  # [rad], one fewer than times
+    eccentric_anomalies: np.ndarray  # [rad]
+
+
+def default_phases() -> list:
+    """The Earth to lunar orbit sequence state_machine.main flies."""
+    return [
+        # Maneuvers from launch to parking orbit are instantaneous
+        Phase(
+            "earth_moon_transfer",
+            "earth",
+            MU_EARTH,
+            a=163285.5,
+            e=calc_e(ra=318200, rp=8371),
+            periods=0.5,
+            title="Earth to Moon transfer",
+        ),
+        # Inclination change set to instantaneous
+        Phase(
+            "moon_lowering_transfer",
+            "moon",
+            MU_MOON,
+            a=61424,
+            e=calc_e(ra=66200, rp=4905),
+            periods=0.5,
+            title="Moon SOI to final orbit transfer",
+        ),
+        # Spacecraft now around moon.
+        Phase(
+            "lunar_orbit",
+            "moon",
+            MU_MOON,
+            a=56648,
+            e=0,
+            periods=5,
+            num=10000,
+            title="Lunar orbit for 5 periods.",
+            filename="moon_orbit.pdf",
+        ),
+    ]
+
+
+def default_phase(name: str) -> Phase:
+    """default_phase One phase of default_phases by name."""
+    for phase in default_phases():
+        if phase.name == name:
+            return phase
+    raise KeyError(f"No default phase named {name!r}.")
+
+
+def _phase_key(phase: Phase, start: float) -> str:
+    return hash_inputs(phase=phase.inputs(), start=float(start))
+
+
+def evaluate_phase(phase: Phase, start: float) -> tuple:
+    """
+    evaluate_phase Sample one phase, starting at periapsis at start.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Sample epochs [s], mean anomalies and eccentric anomalies [rad].
+    """
+    mean_anomalies, times = calc_mean_anomaly(
+        start,
+        phase.tof,
+        phase.a,
+        phase.gravitational_parameter,
+        step=phase.step,
+        num=phase.num,
+    )
+    eccentric_anomalies = state_machine(e=phase.e, mean_anomalies=mean_anomalies)
+    return times * 86400, mean_anomalies, eccentric_anomalies
+
+
+class Mission:
+    """
+    Mission Lazily evaluated, cached sequence of phases.
+
+    Parameters
+    ----------
+    phases : iterable of Phase
+        Phases in flight order, names must be unique.
+    t_0 : float, optional
+        Start epoch of the first phase [s].
+    cache : result_cache.ResultCache, optional
+        On-disk cache shared between runs, phases are only kept in memory
+        otherwise.
+    """
+
+    def __init__(self, phases, t_0: float = 0.0, cache=None):
+        self.phases = list(phases)
+        self.t_0 = float(t_0)
+        self.cache = cache
+        self._results = {}
+        self.evaluations = 0
+
+        names = [phase.name for phase in self.phases]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Phase names must be unique, got {names}.")
+
+    def __repr__(self):
+        return f"Mission({[phase.name for phase in self.phases]}, t_0={self.t_0})"
+
+    def _index(self, name: str) -> int:
+        for index, phase in enumerate(self.phases):
+            if phase.name == name:
+                return index
+        raise KeyError(f"No phase named {name!r}.")
+
+    def phase(self, name: str) -> Phase:
+        return self.phases[self._index(name)]
+
+    def replace(self, name: str, **changes) -> Phase:
+        """replace Change some inputs of a phase, e.g. replace("lunar_orbit", a=6000)."""
+        index = self._index(name)
+        self.phases[index] = self.phases[index]._replace(**changes)
+        return self.phases[index]
+
+    def epochs(self) -> list:
+        """epochs (start, end) of every phase [s], without evaluating any."""
+        epochs = []
+        end = self.t_0
+        for phase in self.phases:
+            start = end if phase.start is None else phase.start
+            end = start + phase.tof
+            epochs.append((start, end))
+        return epochs
+
+    def result(self, name: str) -> PhaseResult:
+        """result Evaluate a phase, or return it from the cache."""
+        index = self._index(name)
+        phase = self.phases[index]
+        start, end = self.epochs()[index]
+        key = _phase_key(phase, start)
+
+        if key not in self._results:
+            arrays = self._load(phase, start)
+            self._results[key] = PhaseResult(phase, key, start, end, *arrays)
+        return self._results[key]
+
+    def _load(self, phase: Phase, start: float) -> tuple:
+        if self.cache is None:
+            self.evaluations += 1
+            return evaluate_phase(phase, start)
+
+        version = "".join(
+            source_version(name)
+            for name in ("mission", "state_machine", "kepler_solver")
+        )
+        key = self.cache.key(
+            "mission.evaluate_phase",
+            version=version,
+            phase=phase.inputs(),
+            start=float(start),
+        )
+        stored = self.cache.get(key)
+        if stored is not None:
+            return stored["times"], stored["mean"], stored["eccentric"]
+
+        self.evaluations += 1
+        times, mean, eccentric = evaluate_phase(phase, start)
+        self.cache.put(key, {"times": times, "mean": mean, "eccentric": eccentric})
+        return times, mean, eccentric
+
+    def __getitem__(self, name: str) -> PhaseResult:
+        return self.result(name)
+
+    def run(self) -> list:
+        """run Results of every phase in order, evaluating only stale ones."""
+        results = [self.result(phase.name) for phase in self.phases]
+        # Results for edited phases can never be asked for again.
+        live = {result.key for result in results}
+        self._results = {key: self._results[key] for key in live}
+        return results
@@ -0,0 +1,246 @@
+"""
+Compact containers for Keplerian orbits.
+
+Orbit holds a single set of elements in __slots__, OrbitBatch holds many
+of them as one contiguous array with a row per element, so large
+candidate sets can be evaluated without per-object Python overhead.
+
+Units follow the rest of the repo: km, s, km^3/s^2 and radians.
+"""
+
+import numpy as np
+
+from geometry import calc_p, calc_r
+
+# Row order of OrbitBatch.data
+ELEMENTS = ("a", "e", "i", "raan", "argp", "nu", "mu")
+
+
+def perifocal_basis(i, raan, argp):
+    """
+    perifocal_basis Unit vectors of the perifocal frame expressed in ECI.
+
+    Parameters
+    ----------
+    i : np.ndarray
+        Inclination [rad].
+    raan : np.ndarray
+        Right ascension of the ascending node, Ω [rad].
+    argp : np.ndarray
+        Argument of periapsis, ω [rad].
+
+    Returns
+    -------
+    tuple of np.ndarray
+        P (towards periapsis) and Q (90° ahead in the orbit plane), each
+        with a trailing axis of length 3.
+    """
+    cos_O, sin_O = np.cos(raan), np.sin(raan)
+    cos_w, sin_w = np.cos(argp), np.sin(argp)
+    cos_i, sin_i = np.cos(i), np.sin(i)
+
+    P = np.stack(
+        [
+            cos_O * cos_w - sin_O * sin_w * cos_i,
+            sin_O * cos_w + cos_O * sin_w * cos_i,
+            sin_w * sin_i,
+        ],
+        axis=-1,
+    )
+    Q = np.stack(
+        [
+            -cos_O * sin_w - sin_O * cos_w * cos_i,
+            -sin_O * sin_w + cos_O * cos_w * cos_i,
+            cos_w * sin_i,
+        ],
+        axis=-1,
+    )
+    return P, Q
+
+
+def calc_position(a, e, i, raan, argp, nu):
+    r = calc_r(a, e, nu)
+    P, Q = perifocal_basis(i, raan, argp)
+    r = np.expand_dims(r, -1)
+    nu = np.expand_dims(nu, -1)
+    return r * (np.cos(nu) * P + np.sin(nu) * Q)
+
+
+def calc_velocity(a, e, i, raan, argp, nu, mu):
+    p = calc_p(a, e)
+    P, Q = perifocal_basis(i, raan, argp)
+    scale = np.expand_dims(np.sqrt(mu / p), -1)
+    e = np.expand_dims(e, -1)
+    nu = np.expand_dims(nu, -1)
+    return scale * (-np.sin(nu) * P + (e + np.cos(nu)) * Q)
+
+
+def calc_flight_path_angle(e, nu):
+    # Angle between the velocity and the local horizontal.
+    return np.arctan2(e * np.sin(nu), 1 + e * np.cos(nu))
+
+
+def calc_specific_energy(a, mu):
+    return -mu / (2 * a)
+
+
+class Orbit:
+    """
+    Orbit A single set of Keplerian elements.
+
+    Parameters
+    ----------
+    a : float
+        Semi-major axis [km].
+    e : float
+        Eccentricity.
+    i : float
+        Inclination [rad].
+    raan : float
+        Right ascension of the ascending node, Ω [rad].
+    argp : float
+        Argument of periapsis, ω [rad].
+    nu : float
+        True anomaly, θ [rad].
+    mu : float
+        Gravitational parameter of the central body [km^3/s^2].
+    """
+
+    __slots__ = ELEMENTS
+
+    def __init__(self, a, e, i=0.0, raan=0.0, argp=0.0, nu=0.0, mu=398600):
+        self.a = float(a)
+        self.e = float(e)
+        self.i = float(i)
+        self.raan = float(raan)
+        self.argp = float(argp)
+        self.nu = float(nu)
+        self.mu = float(mu)
+
+    def __repr__(self):
+        elements = ", ".join(f"{name}={getattr(self, name)!r}" for name in ELEMENTS)
+        return f"Orbit({elements})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Orbit):
+            return NotImplemented
+        return self.elements() == other.elements()
+
+    def __hash__(self):
+        # Hashes change if the elements are reassigned, don't mutate an
+        # Orbit while it is a set member or a dict key.
+        return hash(self.elements())
+
+    def elements(self) -> tuple:
+        return tuple(getattr(self, name) for name in ELEMENTS)
+
+    def position(self) -> np.ndarray:
+        return calc_position(self.a, self.e, self.i, self.raan, self.argp, self.nu)
+
+    def velocity(self) -> np.ndarray:
+        return calc_velocity(
+            self.a, self.e, self.i, self.raan, self.argp, self.nu, self.mu
+        )
+
+    def radius(self) -> float:
+        return float(calc_r(self.a, self.e, self.nu))
+
+    def flight_path_angle(self) -> float:
+        return float(calc_flight_path_angle(self.e, self.nu))
+
+    def period(self) -> float:
+        return 2 * np.pi * np.sqrt(self.a**3 / self.mu)
+
+    def specific_energy(self) -> float:
+        return calc_specific_energy(self.a, self.mu)
+
+
+class OrbitBatch:
+    """
+    OrbitBatch Structure-of-arrays container for many orbits.
+
+    The elements live in one (7, N) float64 array, see ELEMENTS for the
+    row order, so each element is a contiguous view.
+
+    Parameters
+    ----------
+    a, e, i, raan, argp, nu, mu : np.ndarray
+        Same meaning and units as for Orbit, broadcast to a common
+        one dimensional shape.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, a, e, i=0.0, raan=0.0, argp=0.0, nu=0.0, mu=398600):
+        columns = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (a, e, i, raan, argp, nu, mu))
+        )
+        if columns[0].ndim > 1:
+            raise ValueError("OrbitBatch elements must be scalars or 1D arrays.")
+
+        self.data = np.empty((len(ELEMENTS), columns[0].size))
+        for row, column in zip(self.data, columns):
+            row[:] = column.ravel()
+
+    @classmethod
+    def from_array(cls, data: np.ndarray) -> "OrbitBatch":
+        """
+        from_array Wrap a (7, N) array. C-contiguous float64 input is used
+        as is, anything else is converted to a copy.
+        """
+        data = np.asarray(data, dtype=float)
+        if data.ndim != 2 or data.shape[0] != len(ELEMENTS):
+            raise ValueError(f"Expected an array of shape ({len(ELEMENTS)}, N).")
+
+        batch = cls.__new__(cls)
+        batch.data = np.ascontiguousarray(data)
+        return batch
+
+    @classmethod
+    def from_orbits(cls, orbits) -> "OrbitBatch":
+        return cls.from_array(np.array([orbit.elements() for orbit in orbits]).T)
+
+    def __len__(self):
+        return self.data.shape[1]
+
+    def __getitem__(self, index):
+        if np.isscalar(index):
+            return Orbit(*self.data[:, index])
+        return OrbitBatch.from_array(self.data[:, index])
+
+    def __iter__(self):
+        for column in self.data.T:
+            yield Orbit(*column)
+
+    def __repr__(self):
+        return f"OrbitBatch(n={len(self)})"
+
+    a = property(lambda self: self.data[0])
+    e = property(lambda self: self.data[1])
+    i = property(lambda self: self.data[2])
+    raan = property(lambda self: self.data[3])
+    argp = property(lambda self: self.data[4])
+    nu = property(lambda self: self.data[5])
+    mu = property(lambda self: self.data[6])
+
+    def positions(self) -> np.ndarray:
+        """ECI position vectors, shape (N, 3) [km]."""
+        return calc_position(self.a, self.e, self.i, self.raan, self.argp, self.nu)
+
+    def velocities(self) -> np.ndarray:
+        """ECI velocity vectors, shape (N, 3) [km/s]."""
+        return calc_velocity(
+            self.a, self.e, self.i, self.raan, self.argp, self.nu, self.mu
+        )
+
+    def radii(self) -> np.ndarray:
+        return calc_r(self.a, self.e, self.nu)
+
+    def flight_path_angles(self) -> np.ndarray:
+        return calc_flight_path_angle(self.e, self.nu)
+
+    def periods(self) -> np.ndarray:
+        return 2 * np.pi * np.sqrt(self.a**3 / self.mu)
+
+    def specific_energies(self) -> np.ndarray:
+        return calc_specific_energy(self.a, self.mu)
@@ -0,0 +1,313 @@
+"""
+Patched-conics Earth to Moon transfers.
+
+The transfer leaves a circular Earth parking orbit with a tangential burn
+onto an ellipse in the Moon's orbital plane. The Earth-centred arc is
+followed until it enters the Moon's sphere of influence (SOI), where the
+state is moved into the Moon-centred frame by subtracting the Moon's state
+at that epoch. From there the approach is a Moon-centred hyperbola, and
+capture is a burn at its periapsis onto an ellipse (or circle) with that
+periapsis.
+
+Everything is vectorised over arrival epochs and departure phase angles,
+so a launch window is scanned in one call:
+
+    result = design_transfers(arrival_epochs[:, None], phase_angles[None, :])
+    best = np.nanargmin(result["dv_total"])
+
+Transfers that miss the SOI or hit the Moon have no capture, their
+dv_capture and dv_total are NaN.
+
+The Moon's state comes from a callable moon_state(et) -> (..., 6), Earth
+centred with the axes of the ephemeris. circular_moon_state is a simple
+analytic model, ephemeris_moon_state reads the DE421 kernels in moon/.
+
+Units are km, s, km/s and km^3/s^2, epochs are TDB seconds past J2000.
+"""
+
+import numpy as np
+
+from constants import (
+    EARTH_MOON_DISTANCE,
+    MOON_SOI,
+    MU_EARTH,
+    MU_MOON,
+    R_MOON,
+)
+from geometry import calc_p, calc_r
+from manoeuvres import circular_speed, vis_viva
+from screening import apsides
+
+TRANSFER_DTYPE = np.dtype(
+    [
+        ("arrival_epoch", float),  # nominal apogee epoch [s]
+        ("phase_angle", float),  # Moon ahead of the departure point [rad]
+        ("departure_epoch", float),  # [s]
+        ("reached", bool),  # entered the SOI before apogee
+        ("soi_epoch", float),  # [s]
+        ("tof", float),  # departure to SOI entry [s]
+        ("soi_state", float, (6,)),  # Moon-centred at SOI entry [km, km/s]
+        ("v_infinity", float),  # [km/s]
+        ("periapsis", float),  # Moon-centred hyperbola [km]
+        ("impact", bool),  # periapsis below the lunar surface
+        ("dv_departure", float),  # [km/s]
+        ("dv_capture", float),  # NaN on a miss or impact [km/s]
+        ("dv_total", float),  # NaN on a miss or impact [km/s]
+    ]
+)
+
+
+def circular_moon_state(
+    distance: float = EARTH_MOON_DISTANCE,
+    gravitational_parameter: float = MU_EARTH + MU_MOON,
+    longitude: float = 0.0,
+):
+    """
+    circular_moon_state Moon on a circular orbit in the x-y plane.
+
+    Parameters
+    ----------
+    distance : float, optional
+        Earth to Moon distance [km].
+    gravitational_parameter : float, optional
+        μ of the Earth-Moon system [km^3/s^2].
+    longitude : float, optional
+        Moon's longitude at et = 0 [rad].
+    """
+    n = np.sqrt(gravitational_parameter / distance**3)
+    speed = n * distance
+
+    def moon_state(et):
+        angle = longitude + n * np.asarray(et, dtype=float)
+        cos, sin = np.cos(angle), np.sin(angle)
+        zero = np.zeros_like(angle)
+        return np.stack(
+            [distance * cos, distance * sin, zero, -speed * sin, speed * cos, zero],
+            axis=-1,
+        )
+
+    return moon_state
+
+
+def ephemeris_moon_state(ephemeris=None, dt: float = 60.0):
+    """
+    ephemeris_moon_state Moon relative to the Earth from the SPK kernels.
+
+    Velocities are central differences of the positions over ±dt [s].
+    Needs moon/de421.bsp, see ephemeris.Ephemeris.
+    """
+    if ephemeris is None:
+        from ephemeris import get_ephemeris
+
+        ephemeris = get_ephemeris()
+
+    def moon_state(et):
+        et = np.asarray(et, dtype=float)
+        state = np.empty(et.shape + (6,))
+        state[..., :3] = ephemeris.position("moon", "earth", et)
+        state[..., 3:] = (
+            ephemeris.position("moon", "earth", et + dt)
+            - ephemeris.position("moon", "earth", et - dt)
+        ) / (2 * dt)
+        return state
+
+    return moon_state
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _time_since_periapsis(theta, e, n):
+    """Time from periapsis to true anomaly θ in [0, π] on an ellipse [s]."""
+    E = 2 * np.arctan2(
+        np.sqrt(1 - e) * np.sin(theta / 2), np.sqrt(1 + e) * np.cos(theta / 2)
+    )
+    return (E - e * np.sin(E)) / n
+
+
+def _arc_state(theta, p_hat, q_hat, a, e, gravitational_parameter):
+    """Earth-centred states on the transfer arc, θ of shape (N,) or (N, S)."""
+    extra = (1,) * (np.ndim(theta) - 1)
+    p_hat = p_hat.reshape(len(p_hat), *extra, 3)
+    q_hat = q_hat.reshape(len(q_hat), *extra, 3)
+    r = calc_r(a, e, theta)[..., None]
+    cos, sin = np.cos(theta)[..., None], np.sin(theta)[..., None]
+    speed = np.sqrt(gravitational_parameter / calc_p(a, e))
+
+    state = np.empty(np.shape(theta) + (6,))
+    state[..., :3] = r * (cos * p_hat + sin * q_hat)
+    state[..., 3:] = speed * (-sin * p_hat + (e + cos) * q_hat)
+    return state
+
+
+def _design_chunk(
+    arrival_epochs,
+    phase_angles,
+    moon_state,
+    r_parking,
+    r_apogee,
+    soi_radius,
+    capture_apoapsis,
+    samples,
+    iterations,
+):
+    a = 0.5 * (r_parking + r_apogee)
+    e = (r_apogee - r_parking) / (r_apogee + r_parking)
+    n = np.sqrt(MU_EARTH / a**3)
+
+    result = np.zeros(len(arrival_epochs), dtype=TRANSFER_DTYPE)
+    for name in TRANSFER_DTYPE.names:
+        if TRANSFER_DTYPE[name].base.kind == "f":
+            result[name] = np.nan
+    result["arrival_epoch"] = arrival_epochs
+    result["phase_angle"] = phase_angles
+    departure_epochs = arrival_epochs - np.pi / n
+    result["departure_epoch"] = departure_epochs
+    result["dv_departure"] = vis_viva(r_parking, a, MU_EARTH) - circular_speed(
+        r_parking, MU_EARTH
+    )
+
+    # Departure point lags the Moon by the phase angle, in the Moon's plane.
+    moon = moon_state(departure_epochs)
+    x_hat = _unit(moon[:, :3])
+    z_hat = _unit(np.cross(moon[:, :3], moon[:, 3:]))
+    y_hat = np.cross(z_hat, x_hat)
+    cos, sin = np.cos(phase_angles)[:, None], np.sin(phase_angles)[:, None]
+    p_hat = cos * x_hat - sin * y_hat
+    q_hat = np.cross(z_hat, p_hat)
+
+    def soi_distance(theta, rows):
+        """Distance outside the SOI at θ, one row of θ per transfer."""
+        arc = _arc_state(theta, p_hat[rows], q_hat[rows], a, e, MU_EARTH)
+        t_0 = departure_epochs[rows].reshape(-1, *(1,) * (np.ndim(theta) - 1))
+        moon = moon_state(t_0 + _time_since_periapsis(theta, e, n))
+        return np.linalg.norm(arc[..., :3] - moon[..., :3], axis=-1) - soi_radius
+
+    # Coarse scan from departure to apogee, then bisect the first entry.
+    rows = np.arange(len(arrival_epochs))
+    theta = np.broadcast_to(np.linspace(0, np.pi, samples), (len(rows), samples))
+    inside = soi_distance(theta, rows) < 0
+    entry = inside.argmax(axis=1)
+    reached = inside.any(axis=1) & (entry > 0)
+    result["reached"] = reached
+
+    rows = rows[reached]
+    if rows.size == 0:
+        return result
+    lo = theta[rows, entry[rows] - 1]
+    hi = theta[rows, entry[rows]]
+    for _ in range(iterations):
+        mid = 0.5 * (lo + hi)
+        outside = soi_distance(mid, rows) >= 0
+        lo = np.where(outside, mid, lo)
+        hi = np.where(outside, hi, mid)
+
+    # Hand-off: the same state, seen from the Moon.
+    tof = _time_since_periapsis(hi, e, n)
+    soi_epochs = departure_epochs[rows] + tof
+    arc = _arc_state(hi, p_hat[rows], q_hat[rows], a, e, MU_EARTH)
+    state = arc - moon_state(soi_epochs)
+
+    r = np.linalg.norm(state[:, :3], axis=-1)
+    energy = 0.5 * np.sum(state[:, 3:] ** 2, axis=-1) - MU_MOON / r
+    periapsis, _ = apsides(state, MU_MOON)
+    v_periapsis = np.sqrt(2 * energy + 2 * MU_MOON / periapsis)
+    if capture_apoapsis is None:
+        a_capture = periapsis
+    else:
+        a_capture = 0.5 * (periapsis + capture_apoapsis)
+    dv_capture = v_periapsis - vis_viva(periapsis, a_capture, MU_MOON)
+    impact = periapsis < R_MOON
+    # Nothing to capture into when the hyperbola runs into the surface.
+    dv_capture = np.where(impact, np.nan, dv_capture)
+
+    result["soi_epoch"][rows] = soi_epochs
+    result["tof"][rows] = tof
+    result["soi_state"][rows] = state
+    # Bound approaches have no excess speed, only hyperbolic ones do.
+    result["v_infinity"][rows] = np.sqrt(np.maximum(2 * energy, 0))
+    result["periapsis"][rows] = periapsis
+    result["impact"][rows] = impact
+    result["dv_capture"][rows] = dv_capture
+    result["dv_total"][rows] = result["dv_departure"][rows] + dv_capture
+    return result
+
+
+def design_transfers(
+    arrival_epochs,
+    phase_angles,
+    moon_state=None,
+    r_parking: float = 8371.0,
+    r_apogee: float = EARTH_MOON_DISTANCE,
+    soi_radius: float = MOON_SOI,
+    capture_apoapsis: float = None,
+    samples: int = 128,
+    iterations: int = 40,
+    chunk_size: int = 4096,
+) -> np.ndarray:
+    """
+    design_transfers Patched-conic Earth to Moon transfers for a grid of
+    arrival epochs and departure phase angles.
+
+    Parameters
+    ----------
+    arrival_epochs : np.ndarray
+        Epochs the transfer ellipse reaches apogee [s], the departure is
+        half a transfer period earlier.
+    phase_angles : np.ndarray
+        Angle the Moon leads the departure point by at departure [rad],
+        broadcast against arrival_epochs.
+    moon_state : callable, optional
+        moon_state(et) -> (..., 6) Earth-centred, circular_moon_state()
+        by default.
+    r_parking : float, optional
+        Radius of the circular Earth parking orbit [km].
+    r_apogee : float, optional
+        Apogee of the transfer ellipse [km].
+    soi_radius : float, optional
+        Radius of the Moon's sphere of influence [km].
+    capture_apoapsis : float, optional
+        Apoapsis of the lunar capture orbit [km], circular at the
+        hyperbola's periapsis when not given.
+    samples : int, optional
+        Coarse samples from departure to apogee. Encounters that only
+        graze the SOI between two samples are missed.
+    iterations : int, optional
+        Bisection steps on the SOI entry point.
+    chunk_size : int, optional
+        Transfers scanned at once, bounds memory to about
+        chunk_size * samples * 100 bytes.
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with TRANSFER_DTYPE fields and the broadcast shape
+        of the inputs. Transfers that miss the SOI have reached False and
+        NaN arrival quantities, those that hit the Moon have impact True
+        and NaN dv_capture and dv_total.
+    """
+    if moon_state is None:
+        moon_state = circular_moon_state()
+    arrival_epochs, phase_angles = np.broadcast_arrays(
+        np.asarray(arrival_epochs, dtype=float), np.asarray(phase_angles, dtype=float)
+    )
+    shape = arrival_epochs.shape
+    arrival_epochs = arrival_epochs.ravel()
+    phase_angles = phase_angles.ravel()
+
+    result = np.empty(len(arrival_epochs), dtype=TRANSFER_DTYPE)
+    for start in range(0, len(arrival_epochs), chunk_size):
+        stop = start + chunk_size
+        result[start:stop] = _design_chunk(
+            arrival_epochs[start:stop],
+            phase_angles[start:stop],
+            moon_state,
+            r_parking,
+            r_apogee,
+            soi_radius,
+            capture_apoapsis,
+            samples,
+            iterations,
+        )
+    return result.reshape(shape)
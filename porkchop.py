@@ -0,0 +1,206 @@
+"""
+Porkchop grids for Earth to Moon transfers.
+
+compute_porkchop solves a Lambert problem for every (departure time,
+time of flight) pair and stores the grid in a result_cache.ResultCache
+keyed by its inputs and the solver code. plot_porkchop only reads a grid,
+so changing the styling or zooming in never redoes the physics.
+
+The Moon is on a circular, coplanar orbit starting on the x axis at
+t = 0. The spacecraft departs from a fixed point of a circular parking
+orbit; the parking period is a couple of hours, so it can be at that
+point at any departure epoch without a meaningful wait.
+Units are km, s and km^3/s^2.
+"""
+
+import os
+
+import numpy as np
+
+from constants import EARTH_MOON_DISTANCE, MU_EARTH, SECONDS_PER_DAY
+from lambert import lambert
+from result_cache import ResultCache, source_version
+
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "porkchop"
+)
+
+QUANTITY_LABELS = {
+    "dv_departure": r"Departure $\Delta v$ [km/s]",
+    "c3": r"$C_3$ [km$^2$/s$^2$]",
+    "v_inf_arrival": r"Arrival $v_\infty$ [km/s]",
+    "dv_total": r"Total $\Delta v$ [km/s]",
+}
+
+
+def circular_orbit_state(t, radius, gravitational_parameter, phase=0.0):
+    """
+    circular_orbit_state Position and velocity on a circular orbit in the
+    xy plane, shape (..., 3) each.
+    """
+    n = np.sqrt(gravitational_parameter / radius**3)
+    angle = phase + n * np.asarray(t, dtype=float)
+    zeros = np.zeros_like(angle)
+    position = radius * np.stack([np.cos(angle), np.sin(angle), zeros], axis=-1)
+    velocity = radius * n * np.stack([-np.sin(angle), np.cos(angle), zeros], axis=-1)
+    return position, velocity
+
+
+def compute_porkchop(
+    departure_times,
+    tofs,
+    r_parking: float = 8371,
+    r_moon: float = EARTH_MOON_DISTANCE,
+    gravitational_parameter: float = MU_EARTH,
+    moon_phase: float = 0.0,
+    departure_angle: float = np.pi,
+    cache_dir: str = CACHE_DIR,
+    use_cache: bool = True,
+) -> dict:
+    """
+    compute_porkchop Transfer costs over a departure time x TOF grid.
+
+    Parameters
+    ----------
+    departure_times : np.ndarray
+        Departure epochs [s].
+    tofs : np.ndarray
+        Times of flight [s].
+    r_parking : float, optional
+        Radius of the circular parking orbit [km].
+    r_moon : float, optional
+        Radius of the Moon's circular orbit [km].
+    gravitational_parameter : float, optional
+        Gravitational parameter of the Earth [km^3/s^2].
+    moon_phase : float, optional
+        Angle of the Moon from the x axis at t = 0 [rad].
+    departure_angle : float, optional
+        Angle of the departure point on the parking orbit from the x
+        axis [rad].
+    cache_dir : str, optional
+        Directory for cached grids.
+    use_cache : bool, optional
+        Read and write the on-disk cache.
+
+    Returns
+    -------
+    dict
+        Arrays departure_times and tofs, and (n_departure, n_tof) grids of
+        dv_departure, c3, v_inf_arrival and dv_total. Grid points without
+        a Lambert solution are NaN.
+    """
+    departure_times = np.asarray(departure_times, dtype=float)
+    tofs = np.asarray(tofs, dtype=float)
+
+    cache = ResultCache(cache_dir)
+    key = cache.key(
+        "porkchop.compute_porkchop",
+        version=source_version("porkchop") + source_version("lambert"),
+        departure_times=departure_times,
+        tofs=tofs,
+        params=[
+            float(r_parking),
+            float(r_moon),
+            float(gravitational_parameter),
+            float(moon_phase),
+            float(departure_angle),
+        ],
+    )
+    if use_cache:
+        grid = cache.get(key)
+        if grid is not None:
+            return grid
+
+    t_departure = departure_times[:, None]
+    t_arrival = t_departure + tofs[None, :]
+    r1, v_parking = circular_orbit_state(
+        0.0, r_parking, gravitational_parameter, phase=departure_angle
+    )
+    r2, v_moon = circular_orbit_state(
+        t_arrival, r_moon, gravitational_parameter, phase=moon_phase
+    )
+    r1 = np.broadcast_to(r1, r2.shape)
+    v_parking = np.broadcast_to(v_parking, r2.shape)
+
+    v1, v2, _ = lambert(r1, r2, t_arrival - t_departure, gravitational_parameter)
+
+    grid = {
+        "departure_times": departure_times,
+        "tofs": tofs,
+        "dv_departure": np.linalg.norm(v1 - v_parking, axis=-1),
+        "c3": np.sum(v1 * v1, axis=-1) - 2 * gravitational_parameter / r_parking,
+        "v_inf_arrival": np.linalg.norm(v2 - v_moon, axis=-1),
+    }
+    grid["dv_total"] = grid["dv_departure"] + grid["v_inf_arrival"]
+
+    if use_cache:
+        cache.put(key, grid)
+
+    return grid
+
+
+def load_porkchop(path: str) -> dict:
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+
+def plot_porkchop(
+    grid: dict,
+    quantity: str = "dv_total",
+    levels=20,
+    departure_lim=None,
+    tof_lim=None,
+    title: str = "Earth to Moon porkchop",
+    savepath: str = None,
+    ax=None,
+):
+    """
+    plot_porkchop Contour plot of a computed porkchop grid.
+
+    Parameters
+    ----------
+    grid : dict
+        Output of compute_porkchop or load_porkchop.
+    quantity : str, optional
+        Which grid to contour, one of QUANTITY_LABELS.
+    levels : int or np.ndarray, optional
+        Contour levels, passed to matplotlib.
+    departure_lim, tof_lim : tuple of float, optional
+        Axis limits [days], to zoom in without recomputing.
+    title : str, optional
+        Plot title.
+    savepath : str, optional
+        Where to save the figure.
+    ax : matplotlib.axes.Axes, optional
+        Axes to draw on, a new figure is made otherwise.
+
+    Returns
+    -------
+    matplotlib.axes.Axes
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib_rc  # applies the plot style on first import
+
+    if ax is None:
+        _, ax = plt.subplots()
+
+    departure_days = grid["departure_times"] / SECONDS_PER_DAY
+    tof_days = grid["tofs"] / SECONDS_PER_DAY
+    contours = ax.contourf(
+        departure_days, tof_days, grid[quantity].T, levels=levels, cmap="viridis"
+    )
+    ax.figure.colorbar(contours, ax=ax, label=QUANTITY_LABELS[quantity])
+
+    if departure_lim is not None:
+        ax.set_xlim(departure_lim)
+    if tof_lim is not None:
+        ax.set_ylim(tof_lim)
+
+    ax.set_xlabel("Departure [days]")
+    ax.set_ylabel("Time of flight [days]")
+    ax.set_title(title)
+
+    if savepath is not None:
+        plt.savefig(savepath)
+
+    return ax
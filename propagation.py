@@ -0,0 +1,100 @@
+"""
+Streaming two-body propagation.
+
+propagate_chunks yields the trajectory in fixed-size pieces so long
+missions can be processed in constant memory, instead of building the
+whole time grid up front like calc_mean_anomaly does.
+"""
+
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+from kepler_solver import solve_kepler
+from state_machine import calc_mean_motion, mean_anomaly_at
+
+
+class PropagationChunk(NamedTuple):
+    time: np.ndarray  # [s]
+    mean_anomaly: np.ndarray  # [rad]
+    eccentric_anomaly: np.ndarray  # [rad]
+    true_anomaly: np.ndarray  # [rad]
+    r: np.ndarray  # [km]
+
+
+def propagate_chunks(
+    a: float,
+    e: float,
+    gravitational_parameter: float,
+    t_0: float = 0.0,
+    tof: float = None,
+    step: float = 11,
+    chunk_size: int = 100_000,
+    t_p: float = 0.0,
+    reuse_buffers: bool = False,
+) -> Iterator[PropagationChunk]:
+    """
+    propagate_chunks Propagate a Keplerian orbit chunk by chunk.
+
+    Parameters
+    ----------
+    a : float
+        Semi-major axis [km].
+    e : float
+        Eccentricity.
+    gravitational_parameter : float
+        Gravitational parameter of the central body [km^3/s^2].
+    t_0 : float, optional
+        Time of the first sample [s].
+    tof : float, optional
+        Duration to cover [s], the end point is excluded. None keeps
+        yielding chunks forever.
+    step : float, optional
+        Spacing between samples [s].
+    chunk_size : int, optional
+        Number of samples per chunk, the last chunk may be shorter.
+    t_p : float, optional
+        Time of periapsis passage [s].
+    reuse_buffers : bool, optional
+        Write every chunk's time and mean anomaly into the same two
+        arrays. The eccentric and true anomalies and the radius come
+        from solve_kepler and are new arrays every chunk. Only use this
+        if each chunk is consumed before the next is requested.
+
+    Yields
+    ------
+    PropagationChunk
+        Time, mean, eccentric and true anomalies and radius per sample.
+    """
+    if step <= 0:
+        raise ValueError("step must be positive.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive.")
+
+    n = calc_mean_motion(a, gravitational_parameter)
+    n_samples = None if tof is None else int(np.ceil(tof / step))
+
+    offsets = np.arange(chunk_size, dtype=float)
+
+    start = 0
+    while n_samples is None or start < n_samples:
+        size = chunk_size if n_samples is None else min(chunk_size, n_samples - start)
+
+        if start == 0 or not reuse_buffers:
+            time = np.empty(chunk_size)
+            mean_anomaly = np.empty(chunk_size)
+
+        # Times come from integer sample indices so long runs do not drift.
+        t = np.add(offsets[:size], start, out=time[:size])
+        t *= step
+        t += t_0
+        M = mean_anomaly_at(t, t_p, n, out=mean_anomaly[:size])
+        E, nu, converged = solve_kepler(M, e)
+        if not np.all(converged):
+            raise RuntimeError(
+                f"Kepler solver did not converge for {np.count_nonzero(~converged)} samples."
+            )
+
+        yield PropagationChunk(t, M, E, nu, a * (1 - e * np.cos(E)))
+
+        start += size
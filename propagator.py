@@ -0,0 +1,242 @@
+"""
+Numerical propagation of batches of spacecraft states.
+
+States are (N, 6) arrays of (x, y, z, vx, vy, vz) around a central body,
+all N spacecraft advance together with one vectorised force evaluation
+per stage. Force models are plain functions acceleration(t, r) -> (N, 3)
+and can be added together with combine_forces.
+
+Integrators:
+    - "rk4": classic fixed-step Runge-Kutta.
+    - "rk45": adaptive Dormand-Prince 5(4), one step size for the batch.
+    - "verlet": velocity Verlet, fixed-step and symplectic, so energy does
+      not drift over long runs. Force models must not depend on velocity.
+
+Units are km, s and km^3/s^2.
+"""
+
+import numpy as np
+
+from constants import J2_EARTH, MU_EARTH, R_EARTH
+
+
+def point_mass(gravitational_parameter: float):
+    """Two-body gravity of the central body."""
+
+    def acceleration(t, r):
+        r_norm = np.linalg.norm(r, axis=-1, keepdims=True)
+        return -gravitational_parameter * r / r_norm**3
+
+    return acceleration
+
+
+def j2(
+    gravitational_parameter: float = MU_EARTH,
+    j2_coefficient: float = J2_EARTH,
+    radius: float = R_EARTH,
+):
+    """Perturbation from the central body's oblateness, z is the pole."""
+
+    def acceleration(t, r):
+        r2 = np.sum(r * r, axis=-1, keepdims=True)
+        z2_r2 = r[..., 2:3] ** 2 / r2
+        factor = -1.5 * j2_coefficient * gravitational_parameter * radius**2 / r2**2.5
+        return factor * r * (np.array([1.0, 1.0, 3.0]) - 5 * z2_r2)
+
+    return acceleration
+
+
+def third_body(gravitational_parameter: float, body_position):
+    """
+    third_body Perturbation from a third body, e.g. the Moon about the Earth.
+
+    Parameters
+    ----------
+    gravitational_parameter : float
+        Gravitational parameter of the perturbing body [km^3/s^2].
+    body_position : callable
+        body_position(t) -> (3,) position of the perturbing body relative
+        to the central body [km], e.g. from a local ephemeris.
+    """
+
+    def acceleration(t, r):
+        r_body = np.asarray(body_position(t), dtype=float)
+        d = r_body - r
+        d_norm = np.linalg.norm(d, axis=-1, keepdims=True)
+        r_body_norm = np.linalg.norm(r_body)
+        # Direct pull on the spacecraft minus the pull on the central body.
+        return gravitational_parameter * (d / d_norm**3 - r_body / r_body_norm**3)
+
+    return acceleration
+
+
+def combine_forces(*models):
+    """Sum several force models into one."""
+
+    def acceleration(t, r):
+        return sum(model(t, r) for model in models)
+
+    return acceleration
+
+
+def _derivative(acceleration):
+    def f(t, y):
+        dy = np.empty_like(y)
+        dy[..., :3] = y[..., 3:]
+        dy[..., 3:] = acceleration(t, y[..., :3])
+        return dy
+
+    return f
+
+
+def _rk4_segment(f, t, y, t_end, dt):
+    n_steps = max(int(np.ceil((t_end - t) / dt)), 1)
+    h = (t_end - t) / n_steps
+    for _ in range(n_steps):
+        k1 = f(t, y)
+        k2 = f(t + h / 2, y + h / 2 * k1)
+        k3 = f(t + h / 2, y + h / 2 * k2)
+        k4 = f(t + h, y + h * k3)
+        y = y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        t += h
+    return y
+
+
+def _verlet_segment(acceleration, t, y, t_end, dt):
+    n_steps = max(int(np.ceil((t_end - t) / dt)), 1)
+    h = (t_end - t) / n_steps
+    r = y[..., :3].copy()
+    v = y[..., 3:].copy()
+    a = acceleration(t, r)
+    for _ in range(n_steps):
+        v += h / 2 * a
+        r += h * v
+        t += h
+        a = acceleration(t, r)
+        v += h / 2 * a
+    return np.concatenate([r, v], axis=-1)
+
+
+# Dormand-Prince 5(4) tableau.
+_DP_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1, 1])
+_DP_A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+    [35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84],
+]
+_DP_B = np.array(_DP_A[6] + [0])
+_DP_E = _DP_B - np.array(
+    [5179 / 57600, 0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40]
+)
+
+
+def _rk45_segment(f, t, y, t_end, h, rtol, atol, max_steps):
+    """Advance to t_end, returns the state and the step size to try next."""
+    k = [f(t, y)] + [None] * 6
+    steps = 0
+    while t < t_end:
+        if steps == max_steps:
+            raise RuntimeError(f"rk45 took more than {max_steps} steps.")
+        steps += 1
+
+        h_step = min(h, t_end - t)
+        for stage in range(1, 7):
+            increment = sum(a * k_i for a, k_i in zip(_DP_A[stage], k) if a != 0)
+            k[stage] = f(t + _DP_C[stage] * h_step, y + h_step * increment)
+        # The last stage is evaluated at the 5th order solution (FSAL).
+        y_new = y + h_step * sum(b * k_i for b, k_i in zip(_DP_B, k) if b != 0)
+        error = h_step * sum(e * k_i for e, k_i in zip(_DP_E, k) if e != 0)
+
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        # Worst spacecraft in the batch sets the step for everyone.
+        error_norm = np.max(np.sqrt(np.mean((error / scale) ** 2, axis=-1)))
+
+        if error_norm <= 1:
+            t += h_step
+            y = y_new
+            k[0] = k[6]
+            if h_step < h:
+                # Shortened to land on t_end, keep the unclipped step.
+                continue
+
+        factor = 0.9 * error_norm ** (-1 / 5) if error_norm > 0 else 5
+        h = h_step * min(5, max(0.2, factor))
+
+    return y, h
+
+
+def propagate(
+    state,
+    t_span,
+    acceleration,
+    method: str = "rk45",
+    dt: float = 60.0,
+    t_eval=None,
+    rtol: float = 1e-10,
+    atol: float = 1e-9,
+    max_steps: int = 1_000_000,
+):
+    """
+    propagate Integrate a batch of states through a force model.
+
+    Parameters
+    ----------
+    state : np.ndarray
+        Initial states, shape (N, 6) or (6,) [km, km/s].
+    t_span : tuple of float
+        (start, end) times [s].
+    acceleration : callable
+        acceleration(t, r) -> (N, 3) [km/s^2], e.g. point_mass(MU_EARTH).
+    method : str, optional
+        "rk4", "rk45" or "verlet".
+    dt : float, optional
+        Step for the fixed-step methods, initial step for rk45 [s].
+    t_eval : np.ndarray, optional
+        Times to output, within t_span and increasing. Defaults to the
+        start and end of t_span.
+    rtol, atol : float, optional
+        Tolerances for rk45.
+    max_steps : int, optional
+        rk45 step cap per output interval.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Output times (M,) and states (M, N, 6), or (M, 6) for a single
+        input state.
+    """
+    if method not in ("rk4", "rk45", "verlet"):
+        raise ValueError(f"Unknown method {method!r}.")
+
+    y = np.array(state, dtype=float)
+    single = y.ndim == 1
+    y = np.atleast_2d(y)
+
+    t_start, t_end = t_span
+    times = np.array([t_start, t_end] if t_eval is None else t_eval, dtype=float)
+    if np.any(np.diff(times) < 0) or times[0] < t_start or times[-1] > t_end:
+        raise ValueError("t_eval must be increasing and within t_span.")
+
+    f = _derivative(acceleration)
+    states = np.empty((len(times),) + y.shape)
+
+    t = t_start
+    h = dt
+    for index, t_out in enumerate(times):
+        if t_out > t:
+            if method == "rk4":
+                y = _rk4_segment(f, t, y, t_out, dt)
+            elif method == "verlet":
+                y = _verlet_segment(acceleration, t, y, t_out, dt)
+            else:
+                y, h = _rk45_segment(f, t, y, t_out, h, rtol, atol, max_steps)
+            t = t_out
+        states[index] = y
+
+    if single:
+        states = states[:, 0]
+    return times, states
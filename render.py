@@ -0,0 +1,199 @@
+"""
+Headless batch rendering of the mission plots.
+
+Every figure is drawn in a worker process on the Agg backend, so nothing
+needs a display. Text is drawn with mathtext by default, which needs no
+TeX install, pass usetex=True (or --latex) for publication output.
+
+A figure is skipped when its inputs are unchanged since it was last
+rendered. The inputs are the function's arguments, the text mode, the
+matplotlib version and the source of the modules that produce it. Their
+hashes are kept in plots/.render_manifest.json.
+
+Run as a script to render everything:
+
+    python render.py [--latex] [--force] [-j WORKERS] [names ...]
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+from mission import default_phases
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PLOT_DIR = os.path.join(ROOT, "plots")
+MANIFEST = ".render_manifest.json"
+
+
+class Figure(NamedTuple):
+    function: str  # "module:function", called as function(*args, savepath=...)
+    args: tuple
+    filename: str
+    sources: tuple  # modules whose source the figure depends on
+
+
+_ANOMALY_SOURCES = (
+    "mission.py",
+    "state_machine.py",
+    "kepler_solver.py",
+    "decimate.py",
+    "matplotlib_rc.py",
+)
+
+# One anomaly plot per mission phase, labelled by the Phase itself.
+FIGURES = {
+    phase.name: Figure(
+        "state_machine:plot_phase",
+        (phase.name,),
+        phase.filename or f"{phase.name}.pdf",
+        _ANOMALY_SOURCES,
+    )
+    for phase in default_phases()
+}
+FIGURES["initial_parking"] = Figure(
+    "task1_orbits:plot_initial_parking",
+    (),
+    "initial_parking.pdf",
+    ("task1_orbits.py", "geometry.py", "matplotlib_rc.py"),
+)
+
+
+def input_hash(figure: Figure, usetex: bool) -> str:
+    """input_hash Digest of everything that changes how a figure looks."""
+    import matplotlib
+
+    digest = hashlib.sha256()
+    digest.update(
+        repr((figure.function, figure.args, usetex, matplotlib.__version__)).encode()
+    )
+    for source in figure.sources:
+        with open(os.path.join(ROOT, source), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _init_worker(usetex: bool):
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+    import matplotlib_rc
+
+    matplotlib_rc.set_style(usetex)
+
+
+def _render(figure: Figure, savepath: str):
+    import matplotlib.pyplot as plt
+
+    module_name, function_name = figure.function.split(":")
+    function = getattr(importlib.import_module(module_name), function_name)
+    try:
+        function(*figure.args, savepath=savepath)
+    finally:
+        plt.close("all")
+    return savepath
+
+
+def _load_manifest(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def render_all(
+    names=None,
+    output_dir: str = PLOT_DIR,
+    usetex: bool = False,
+    max_workers: int = None,
+    force: bool = False,
+) -> dict:
+    """
+    render_all Render mission figures in parallel, skipping unchanged ones.
+
+    Parameters
+    ----------
+    names : iterable of str, optional
+        Keys of FIGURES to render, all of them by default.
+    output_dir : str, optional
+        Where the PDFs and the manifest are written.
+    usetex : bool, optional
+        Publication LaTeX text instead of mathtext.
+    max_workers : int, optional
+        Worker processes, defaults to os.cpu_count().
+    force : bool, optional
+        Render even when the inputs are unchanged.
+
+    Returns
+    -------
+    dict
+        Figure name -> "rendered" or "skipped".
+    """
+    names = list(FIGURES if names is None else names)
+    unknown = set(names) - set(FIGURES)
+    if unknown:
+        raise KeyError(f"Unknown figures: {sorted(unknown)}.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    manifest = _load_manifest(manifest_path)
+
+    status = {}
+    pending = {}
+    for name in names:
+        figure = FIGURES[name]
+        savepath = os.path.join(output_dir, figure.filename)
+        digest = input_hash(figure, usetex)
+        if not force and manifest.get(name) == digest and os.path.exists(savepath):
+            status[name] = "skipped"
+        else:
+            pending[name] = (figure, savepath, digest)
+
+    if pending:
+        with ProcessPoolExecutor(
+            max_workers=max_workers, initializer=_init_worker, initargs=(usetex,)
+        ) as executor:
+            futures = {
+                executor.submit(_render, figure, savepath): name
+                for name, (figure, savepath, _) in pending.items()
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                future.result()
+                status[name] = "rendered"
+                # Record each figure as it lands so a failure later in the
+                # batch does not force the finished ones to be redrawn.
+                manifest[name] = pending[name][2]
+                with open(manifest_path, "w") as f:
+                    json.dump(manifest, f, indent=2)
+
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("names", nargs="*", help="figures to render, default all")
+    parser.add_argument("--latex", action="store_true", help="render text with LaTeX")
+    parser.add_argument("--force", action="store_true", help="ignore the manifest")
+    parser.add_argument("-j", "--workers", type=int, default=None)
+    parser.add_argument("-o", "--output-dir", default=PLOT_DIR)
+    options = parser.parse_args()
+
+    status = render_all(
+        options.names or None,
+        output_dir=options.output_dir,
+        usetex=options.latex,
+        max_workers=options.workers,
+        force=options.force,
+    )
+    for name, outcome in status.items():
+        print(f"{name}: {outcome}")
+
+
+if __name__ == "__main__":
+    main()
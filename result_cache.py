@@ -0,0 +1,247 @@
+"""
+Content-addressed on-disk cache for computed arrays.
+
+Results are stored as .npz files named after a hash of everything that
+determines them: the function, its inputs (arrays by value), and a code
+version, by default a hash of the source of the module that computed
+them, so editing a solver retires its old results automatically.
+
+The directory is bounded in size: a hit refreshes the file's mtime and
+the least recently used files are deleted once max_bytes is exceeded.
+Set ORBIT_MECH_CACHE=0 to bypass the default cache.
+"""
+
+import glob
+import hashlib
+import importlib
+import inspect
+import os
+import re
+
+import numpy as np
+
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "results"
+)
+
+# Bump to retire every existing entry, e.g. after a change in a dependency.
+CACHE_VERSION = 1
+
+_source_hashes = {}
+
+
+def source_version(module_name: str) -> str:
+    """
+    source_version Hash of a module's source file, the default code version.
+
+    The module is imported if it has not been yet. Raises ValueError when
+    it has no source file, as its version could never change.
+    """
+    if module_name not in _source_hashes:
+        module = importlib.import_module(module_name)
+        try:
+            path = inspect.getsourcefile(module)
+        except TypeError:  # built in modules
+            path = None
+        if path is None:
+            raise ValueError(
+                f"Module {module_name!r} has no source file, pass a version."
+            )
+        digest = hashlib.sha256(str(CACHE_VERSION).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+        _source_hashes[module_name] = digest.hexdigest()[:16]
+    return _source_hashes[module_name]
+
+
+def _update(digest, value):
+    """Feed a value into the hash, tagged with its type so 1 and "1" differ."""
+    if isinstance(value, np.ndarray) or isinstance(value, np.generic):
+        value = np.ascontiguousarray(value)
+        digest.update(f"array{value.dtype.str}{value.shape}".encode())
+        digest.update(value.tobytes())
+    elif value is None or isinstance(value, (bool, int, float, complex, str)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (tuple, list)):
+        digest.update(f"{type(value).__name__}[{len(value)}](".encode())
+        for item in value:
+            _update(digest, item)
+        digest.update(b")")
+    elif isinstance(value, dict):
+        digest.update(f"dict[{len(value)}](".encode())
+        for name in sorted(value):
+            _update(digest, str(name))
+            _update(digest, value[name])
+        digest.update(b")")
+    else:
+        raise TypeError(f"Cannot hash a {type(value).__name__} for the result cache.")
+
+
+def hash_inputs(**inputs) -> str:
+    """hash_inputs Hex digest of named inputs, arrays are hashed by value."""
+    digest = hashlib.sha256()
+    _update(digest, inputs)
+    return digest.hexdigest()[:32]
+
+
+def _file_prefix(name: str) -> str:
+    # Qualified names can hold characters like "<locals>".
+    return re.sub(r"[^\w.-]", "_", name)
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("ORBIT_MECH_CACHE", "1").strip().lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+
+
+class ResultCache:
+    """
+    ResultCache Size-bounded directory of cached results.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Where the .npz files live.
+    max_bytes : int, optional
+        Size above which the least recently used entries are evicted.
+    compress : bool, optional
+        Store with np.savez_compressed rather than np.savez.
+    """
+
+    def __init__(
+        self,
+        directory: str = CACHE_DIR,
+        max_bytes: int = 1 << 30,
+        compress: bool = True,
+    ):
+        self.directory = str(directory)
+        self.max_bytes = int(max_bytes)
+        self.compress = compress
+
+    def __repr__(self):
+        return f"ResultCache({self.directory!r}, max_bytes={self.max_bytes})"
+
+    def key(self, name: str, version: str = None, **inputs) -> str:
+        """
+        key Cache key for a named computation.
+
+        Parameters
+        ----------
+        name : str
+            What is computed, e.g. "porkchop.compute_porkchop".
+        version : str, optional
+            Code version, defaults to source_version of name's module.
+        **inputs
+            Everything the result depends on.
+        """
+        if version is None:
+            version = source_version(name.rsplit(".", 1)[0])
+        digest = hash_inputs(name=name, version=version, inputs=inputs)
+        return f"{_file_prefix(name)}-{digest}"
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key: str):
+        """get The stored arrays as a dict, or None on a miss."""
+        path = self.path(key)
+        try:
+            with np.load(path) as data:
+                arrays = {name: data[name] for name in data.files}
+            # The mtime doubles as the last access time for eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            # Never stored, or evicted by another process meanwhile.
+            return None
+        return arrays
+
+    def put(self, key: str, arrays: dict) -> str:
+        """put Store a dict of arrays under key, then evict down to max_bytes."""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        # Write under a temporary name so readers never see half a file.
+        partial = f"{path}.{os.getpid()}.partial"
+        save = np.savez_compressed if self.compress else np.savez
+        with open(partial, "wb") as f:
+            save(f, **arrays)
+        os.replace(partial, path)
+        self.evict()
+        return path
+
+    def entries(self) -> list:
+        """entries (mtime, size, path) of every stored result, oldest first."""
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, "*.npz")):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def nbytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes: int = None):
+        """evict Delete least recently used entries until under max_bytes."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def invalidate(self, key: str = None, name: str = None) -> int:
+        """
+        invalidate Delete cached results.
+
+        Parameters
+        ----------
+        key : str, optional
+            A single entry to drop.
+        name : str, optional
+            Drop every entry computed by this function, e.g. after fixing
+            a bug the code version does not see.
+
+        Returns
+        -------
+        int
+            Number of entries deleted. With neither argument the whole
+            cache is cleared.
+        """
+        if key is not None:
+            paths = [self.path(key)]
+        elif name is not None:
+            paths = glob.glob(
+                os.path.join(self.directory, f"{_file_prefix(name)}-*.npz")
+            )
+        else:
+            paths = [path for _, _, path in self.entries()]
+
+        removed = 0
+        for path in paths:
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+_default_cache = None
+
+
+def get_result_cache() -> ResultCache:
+    """Shared ResultCache in .cache/results."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache()
+    return _default_cache
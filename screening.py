@@ -0,0 +1,339 @@
+"""
+Batch screening of propagated trajectories.
+
+Two checks over states shaped like propagator.propagate output, (M, N, 6)
+or (M, N, 3) for M time slices of N spacecraft around one central body:
+
+    - screen_impacts: which spacecraft come within a body's radius plus
+      an altitude margin. Spacecraft whose osculating radius range
+      [periapsis, apoapsis], widened over every slice, cannot reach the
+      body are cleared without looking at their positions. Perturbations
+      such as J2 or a third body move the apsides, so the range is taken
+      from all slices rather than the first.
+    - close_approaches: pairs of spacecraft closer than a threshold. Each
+      time slice is binned on a grid of threshold sized cells and only
+      spacecraft in the same or neighbouring cells are compared, so the
+      cost grows with N rather than N².
+
+Units are km, s and km^3/s^2.
+"""
+
+import numpy as np
+
+from constants import MU_EARTH, R_EARTH, R_MOON
+from instrumentation import count
+
+IMPACT_DTYPE = np.dtype(
+    [
+        ("periapsis", float),  # lowest osculating over the slices [km]
+        ("apoapsis", float),  # highest osculating, inf when unbound [km]
+        ("min_distance", float),  # closest approach to the body centre [km]
+        ("impact", bool),  # came within radius + margin
+        ("time", float),  # first slice within radius + margin, nan if none [s]
+    ]
+)
+
+APPROACH_DTYPE = np.dtype(
+    [
+        ("time", float),  # [s]
+        ("first", np.int64),  # spacecraft indices, first < second
+        ("second", np.int64),
+        ("distance", float),  # [km]
+    ]
+)
+
+# Neighbouring cell offsets, half of the 3x3x3 block so each pair of
+# cells is visited once. (0, 0, 0) comes first.
+_HALF_NEIGHBOURS = np.array(
+    [
+        (dx, dy, dz)
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+        for dz in (-1, 0, 1)
+        if (dx, dy, dz) >= (0, 0, 0)
+    ]
+)
+
+# Cells per axis is capped so cell keys fit in an int64.
+_MAX_CELLS = 1 << 20
+
+
+def apsides(states: np.ndarray, gravitational_parameter) -> tuple:
+    """
+    apsides Osculating periapsis and apoapsis radii of state vectors.
+
+    Parameters
+    ----------
+    states : np.ndarray
+        Array of shape (..., 6) holding (x, y, z, vx, vy, vz).
+    gravitational_parameter : float
+        Gravitational parameter of the central body [km^3/s^2].
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Periapsis and apoapsis radii [km], apoapsis is inf for parabolic
+        and hyperbolic orbits.
+    """
+    states = np.asarray(states, dtype=float)
+    r_vec = states[..., :3]
+    v_vec = states[..., 3:6]
+    r = np.linalg.norm(r_vec, axis=-1)
+    h2 = np.sum(np.cross(r_vec, v_vec) ** 2, axis=-1)
+    energy = 0.5 * np.sum(v_vec * v_vec, axis=-1) - gravitational_parameter / r
+
+    # e² = 1 + 2εh²/μ², clipped for rounding on circular orbits.
+    e = np.sqrt(np.maximum(1 + 2 * energy * h2 / gravitational_parameter**2, 0))
+    p = h2 / gravitational_parameter
+    periapsis = p / (1 + e)
+    with np.errstate(divide="ignore"):
+        apoapsis = np.where(e < 1, p / (1 - e), np.inf)
+    return periapsis, apoapsis
+
+
+def screen_impacts(
+    times: np.ndarray,
+    states: np.ndarray,
+    radius: float,
+    margin: float = 0.0,
+    gravitational_parameter: float = None,
+    body_positions: np.ndarray = None,
+) -> np.ndarray:
+    """
+    screen_impacts Find spacecraft that reach a body's surface plus a margin.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Slice epochs, shape (M,) [s].
+    states : np.ndarray
+        States of shape (M, N, 6) relative to the central body. Positions
+        only, (M, N, 3), skip the apsis prefilter.
+    radius : float
+        Body radius [km].
+    margin : float, optional
+        Altitude that still counts as an impact, e.g. the top of the
+        atmosphere [km].
+    gravitational_parameter : float, optional
+        Of the central body [km^3/s^2], needed for the apsis prefilter.
+    body_positions : np.ndarray, optional
+        Positions of the screened body relative to the central body,
+        shape (M, 3) [km], e.g. the Moon for Earth-centred states. The
+        central body itself is screened when not given.
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with IMPACT_DTYPE fields, one row per spacecraft.
+        Cleared spacecraft have a min_distance of nan.
+    """
+    times = np.asarray(times, dtype=float)
+    states = np.asarray(states, dtype=float)
+    if states.ndim != 3 or states.shape[-1] not in (3, 6):
+        raise ValueError("states must have shape (M, N, 6) or (M, N, 3).")
+    if len(times) != len(states):
+        raise ValueError(f"Got {len(times)} times for {len(states)} slices.")
+    reach = radius + margin
+
+    result = np.zeros(states.shape[1], dtype=IMPACT_DTYPE)
+    result["min_distance"] = np.nan
+    result["time"] = np.nan
+    candidates = np.ones(states.shape[1], dtype=bool)
+
+    prefilter = states.shape[-1] == 6 and gravitational_parameter is not None
+    if prefilter:
+        # Osculating apsides drift under perturbations, use their extremes.
+        slice_periapsis, slice_apoapsis = apsides(states, gravitational_parameter)
+        periapsis = slice_periapsis.min(axis=0)
+        apoapsis = slice_apoapsis.max(axis=0)
+        result["periapsis"] = periapsis
+        result["apoapsis"] = apoapsis
+        if body_positions is None:
+            candidates = periapsis <= reach
+        else:
+            # The spacecraft stays in the shell [periapsis, apoapsis], the
+            # body within reach of the shell its own distance sweeps out.
+            distance = np.linalg.norm(body_positions, axis=-1)
+            candidates = (periapsis <= distance.max() + reach) & (
+                apoapsis >= distance.min() - reach
+            )
+    else:
+        result["periapsis"] = np.nan
+        result["apoapsis"] = np.nan
+    count("screening.impact_candidates", int(candidates.sum()))
+
+    index = np.flatnonzero(candidates)
+    if index.size == 0:
+        return result
+
+    positions = states[:, index, :3]
+    if body_positions is not None:
+        positions = positions - np.asarray(body_positions, dtype=float)[:, None, :]
+    distance = np.linalg.norm(positions, axis=-1)
+    min_distance = distance.min(axis=0)
+
+    inside = distance <= reach
+    if prefilter and body_positions is None and len(times) > 1:
+        # Periapsis passages between slices, r·v turns from - to +, dip
+        # to the osculating periapsis the samples can step over.
+        radial = np.sum(positions * states[:, index, 3:], axis=-1)
+        passage = (radial[:-1] < 0) & (radial[1:] >= 0)
+        dip = np.where(passage, slice_periapsis[:-1, index], np.inf)
+        min_distance = np.minimum(min_distance, dip.min(axis=0))
+        inside[:-1] |= dip <= reach
+
+    impact = inside.any(axis=0)
+    result["min_distance"][index] = min_distance
+    result["impact"][index] = impact
+    result["time"][index[impact]] = times[inside[:, impact].argmax(axis=0)]
+    return result
+
+
+def screen_earth_moon(
+    times: np.ndarray,
+    states: np.ndarray,
+    moon_positions: np.ndarray,
+    earth_margin: float = 100.0,
+    moon_margin: float = 10.0,
+) -> dict:
+    """
+    screen_earth_moon Screen Earth-centred states against both bodies.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Slice epochs, shape (M,) [s].
+    states : np.ndarray
+        Earth-centred states, shape (M, N, 6).
+    moon_positions : np.ndarray
+        Earth to Moon vectors at each slice, shape (M, 3) [km].
+    earth_margin, moon_margin : float, optional
+        Altitudes that count as an impact [km], by default the Kármán
+        line for the Earth and terrain clearance for the Moon.
+
+    Returns
+    -------
+    dict
+        "earth" and "moon" -> IMPACT_DTYPE arrays from screen_impacts.
+    """
+    return {
+        "earth": screen_impacts(
+            times, states, R_EARTH, earth_margin, gravitational_parameter=MU_EARTH
+        ),
+        "moon": screen_impacts(
+            times,
+            states,
+            R_MOON,
+            moon_margin,
+            gravitational_parameter=MU_EARTH,
+            body_positions=moon_positions,
+        ),
+    }
+
+
+def _expand_ranges(starts: np.ndarray, counts: np.ndarray) -> tuple:
+    """Owner and value of every element of the ranges [start, start + count)."""
+    owner = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, np.repeat(starts, counts) + offsets
+
+
+def pairs_within(positions: np.ndarray, threshold: float) -> tuple:
+    """
+    pairs_within Every pair of points closer than threshold.
+
+    Parameters
+    ----------
+    positions : np.ndarray
+        Points of shape (N, 3) [km].
+    threshold : float
+        Separation below which a pair is reported [km].
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Indices i < j of each pair and their distances, ordered by i then j.
+    """
+    positions = np.asarray(positions, dtype=float)
+    if threshold <= 0:
+        raise ValueError("threshold must be positive.")
+    empty = (np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0))
+    if len(positions) < 2:
+        return empty
+
+    # Cells at least threshold wide, so close pairs share or neighbour a
+    # cell. Very spread out batches get wider cells to keep keys in range.
+    low = positions.min(axis=0)
+    extent = positions.max(axis=0) - low
+    size = max(threshold, extent.max() / _MAX_CELLS)
+    cells = np.floor((positions - low) / size).astype(np.int64) + 1
+    shape = cells.max(axis=0) + 2
+    strides = np.array([shape[1] * shape[2], shape[2], 1])
+    keys = cells @ strides
+
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+
+    first, second = [], []
+    for offset in _HALF_NEIGHBOURS @ strides:
+        neighbour = keys + offset
+        lo = np.searchsorted(sorted_keys, neighbour, side="left")
+        hi = np.searchsorted(sorted_keys, neighbour, side="right")
+        if offset == 0:
+            # Within a cell, only pair with points sorted after this one.
+            lo = rank + 1
+        owner, slot = _expand_ranges(lo, np.maximum(hi - lo, 0))
+        first.append(owner)
+        second.append(order[slot])
+
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+    count("screening.pair_candidates", len(first))
+
+    distance = np.linalg.norm(positions[first] - positions[second], axis=-1)
+    close = distance < threshold
+    i = np.minimum(first[close], second[close])
+    j = np.maximum(first[close], second[close])
+    distance = distance[close]
+    sort = np.lexsort((j, i))
+    return i[sort], j[sort], distance[sort]
+
+
+def close_approaches(
+    times: np.ndarray, states: np.ndarray, threshold: float
+) -> np.ndarray:
+    """
+    close_approaches Pairs of spacecraft closer than threshold at each slice.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Slice epochs, shape (M,) [s].
+    states : np.ndarray
+        States or positions of shape (M, N, 6) or (M, N, 3) [km].
+    threshold : float
+        Separation below which a pair is reported [km].
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with APPROACH_DTYPE fields, one row per pair and
+        slice, ordered by time.
+    """
+    times = np.asarray(times, dtype=float)
+    states = np.asarray(states, dtype=float)
+    if states.ndim != 3 or states.shape[-1] not in (3, 6):
+        raise ValueError("states must have shape (M, N, 6) or (M, N, 3).")
+
+    slices = []
+    for t, positions in zip(times, states[..., :3]):
+        i, j, distance = pairs_within(positions, threshold)
+        approach = np.empty(len(i), dtype=APPROACH_DTYPE)
+        approach["time"] = t
+        approach["first"] = i
+        approach["second"] = j
+        approach["distance"] = distance
+        slices.append(approach)
+    return np.concatenate(slices) if slices else np.empty(0, dtype=APPROACH_DTYPE)
@@ -1,11 +1,20 @@
-import kepler
+import os
+
 import numpy as np
 
-import matplotlib.pyplot as plt
-import matplotlib_rc
+from decimate import decimate_series
+from instrumentation import count, phase, timed
+from kepler_solver import solve_kepler, solve_kepler_cached
 
 
-def state_machine(e: float, mean_anomalies: np.ndarray) -> None:
+@timed
+def state_machine(
+    e: float,
+    mean_anomalies: np.ndarray,
+    tol: float = 1e-12,
+    max_iter: int = 50,
+    cached: bool = False,
+) -> np.ndarray:
     """
     __init__ Solve Kepler's equation
     for the given mean anomaly
@@ -19,15 +28,35 @@ def state_machine(e: float, mean_anomalies: np.ndarray) -> None:
     mean_anomalies : np.ndarray
         The range of mean anomalies
         to use as inputs to the solver.
+    tol : float, optional
+        Convergence tolerance passed to the batch solver.
+    max_iter : int, optional
+        Iteration cap passed to the batch solver.
+    cached : bool, optional
+        Serve the solution from a precomputed lookup table for this
+        eccentricity, worth it when the same e is solved repeatedly.
+
+    Returns
+    -------
+    np.ndarray
+        Eccentric anomalies, one per mean anomaly.
     """
-    eccentricity = e
-
-    true_anomalies = []
+    count("state_machine.samples", np.size(mean_anomalies))
+    if cached:
+        eccentric_anomalies, _, converged = solve_kepler_cached(
+            mean_anomalies, e, tol=tol
+        )
+    else:
+        eccentric_anomalies, _, converged = solve_kepler(
+            mean_anomalies, e, tol=tol, max_iter=max_iter
+        )
 
-    for mean_anomaly in mean_anomalies:
-        true_anomalies.append(kepler.solve(mean_anomaly, eccentricity))
+    if not np.all(converged):
+        raise RuntimeError(
+            f"Kepler solver did not converge for {np.count_nonzero(~converged)} samples."
+        )
 
-    return np.array(true_anomalies)
+    return eccentric_anomalies
 
 
 def calc_TOF(a, gravitational_parameter: float):
@@ -35,31 +64,116 @@ def calc_TOF(a, gravitational_parameter: float):
     return np.pi * np.sqrt((a**3) / gravitational_parameter)
 
 
+def calc_mean_motion(a, gravitational_parameter):
+    return np.sqrt(gravitational_parameter / (a**3))
+
+
+def mean_anomaly_at(times, t_p: float, n: float, out: np.ndarray = None):
+    """
+    mean_anomaly_at Evaluate M = n(t - tp) mod 2π for an array of times.
+
+    Parameters
+    ----------
+    times : np.ndarray
+        Times to evaluate [s].
+    t_p : float
+        Time of periapsis passage [s].
+    n : float
+        Mean motion [rad/s].
+    out : np.ndarray, optional
+        Buffer to write the mean anomalies into, same shape as times.
+
+    Returns
+    -------
+    np.ndarray
+        Mean anomalies in [0, 2π) [rad], this is out when given.
+    """
+    out = np.subtract(times, t_p, out=out)
+    np.multiply(out, n, out=out)
+    return np.mod(out, 2 * np.pi, out=out)
+
+
+@timed
+def calc_time_grid(t_0: float, tof: float, step: float = 11, num: int = None):
+    """
+    calc_time_grid Build the sample times for a propagation.
+
+    Parameters
+    ----------
+    t_0 : float
+        Start time [s].
+    tof : float
+        Duration [s].
+    step : float, optional
+        Spacing between samples [s], the end point is excluded.
+    num : int, optional
+        Number of samples including both end points, overrides step.
+
+    Returns
+    -------
+    np.ndarray
+        Sample times [s].
+    """
+    if num is not None:
+        return np.linspace(t_0, t_0 + tof, num, dtype=float)
+
+    return np.arange(t_0, t_0 + tof, step, dtype=float)
+
+
+@timed
 def calc_mean_anomaly(
-    t_0: float, tof: float, a, gravitational_parameter, finer_grain=False
+    t_0: float,
+    tof: float,
+    a,
+    gravitational_parameter,
+    step: float = 11,
+    num: int = None,
+    out: np.ndarray = None,
 ):
-    # NOTE: t_0 is time since periapsis.
-    # Construct 11 steps for the inputted times.
-    if finer_grain:
-        time_array = np.linspace(t_0, t_0 + tof, 10000)
-    else:
-        time_array = np.arange(t_0, t_0 + tof, 11)
+    """
+    calc_mean_anomaly Mean anomalies over a time grid starting at periapsis.
 
-    # n is constant
-    n = np.sqrt(gravitational_parameter / (a**3))
+    Parameters
+    ----------
+    t_0 : float
+        Time since periapsis [s].
+    tof : float
+        Duration of the grid [s].
+    a : float
+        Semi-major axis [km].
+    gravitational_parameter : float
+        Gravitational parameter of the central body [km^3/s^2].
+    step : float, optional
+        Spacing between samples [s].
+    num : int, optional
+        Number of samples, overrides step.
+    out : np.ndarray, optional
+        Buffer of length len(time grid) - 1 for the mean anomalies,
+        reused across calls to avoid reallocating.
+
+    Returns
+    -------
+    tuple of np.ndarray
+        Mean anomalies for all but the first sample, and the time grid [days].
+    """
+    time_array = calc_time_grid(t_0, tof, step=step, num=num)
 
-    # Return n-1 steps of Mean anomaly
-    mean_anomalies = []
+    if out is not None and out.shape != (len(time_array) - 1,):
+        raise ValueError(
+            f"out has shape {out.shape}, expected ({len(time_array) - 1},)."
+        )
 
-    for i, _ in enumerate(time_array):
-        if i < len(time_array) - 1:
-            # M = n(t-tp)
-            mean_anomalies.append(n * (time_array[i + 1] - t_0) % (2 * np.pi))
+    # n is constant, M = n(t-tp)
+    n = calc_mean_motion(a, gravitational_parameter)
+    mean_anomalies = mean_anomaly_at(time_array[1:], t_0, n, out=out)
 
-    return np.array(mean_anomalies), time_array / 86400
+    return mean_anomalies, time_array / 86400
 
 
 def plot_anom_vs_time(time, anomaly):
+    import matplotlib.pyplot as plt
+    import matplotlib_rc  # applies the plot style on first import
+
     fig, ax = plt.subplots()
     ax.plot(time, anomaly)
 
@@ -77,10 +191,19 @@ def calc_orbital_period(a, gravitational_parameter):
     return 2 * np.pi * np.sqrt((a**3) / gravitational_parameter)
 
 
+@timed
 def plot_anomalies(x, mean, true, title, savepath):
+    import matplotlib.pyplot as plt
+    import matplotlib_rc  # applies the plot style on first import
+
     fig, ax = plt.subplots()
-    ax.plot(x[0:-1], mean, label="$M$")
-    ax.plot(x[0:-1], true, label="$E$")
+
+    # Only keep what the axes can resolve, a few points per pixel column.
+    bins = int(np.ceil(ax.get_window_extent().width))
+    x, mean, true = decimate_series(x[0:-1], mean, true, bins=bins)
+
+    ax.plot(x, mean, label="$M$")
+    ax.plot(x, true, label="$E$")
 
     ax.legend()
 
@@ -91,85 +214,66 @@ def plot_anomalies(x, mean, true, title, savepath):
     plt.savefig(savepath)
 
 
-def earth_moon_transfer(mu_earth):
-    a_transfer_arc = 163285.5
-
-    tof_transfer_arc = calc_TOF(a_transfer_arc, mu_earth)
-    print(f"Time of flight: {tof_transfer_arc}")
-    mean_anomalies, times = calc_mean_anomaly(
-        0, tof_transfer_arc, a_transfer_arc, mu_earth
-    )
-
-    true_anomalies = state_machine(
-        e=calc_e(ra=318200, rp=8371), mean_anomalies=mean_anomalies
-    )
-
-    plot_anomalies(
-        times,
-        mean_anomalies,
-        true_anomalies,
-        "Earth to Moon transfer",
-        "plots/earth_moon_transfer.pdf",
-    )
-
-
-def moon_lowering_transfer(mu_moon):
-    a_transfer_arc = 61424
+def plot_phase(name: str, savepath: str = None, mission=None):
+    """
+    plot_phase Plot the anomalies of one mission phase.
 
-    # Moon SOI -> Moon final orbit transfer:
-    tof_transfer_arc = calc_TOF(a_transfer_arc, mu_moon)
-    print(f"Time of flight: {tof_transfer_arc}")
-    mean_anomalies, times = calc_mean_anomaly(
-        0, tof_transfer_arc, a_transfer_arc, mu_moon
-    )
+    Parameters
+    ----------
+    name : str
+        Phase name, e.g. "lunar_orbit".
+    savepath : str, optional
+        Output file, defaults to plots/ and the phase's filename.
+    mission : mission.Mission, optional
+        Mission holding the phase, the default phases otherwise.
+    """
+    from mission import Mission, default_phases
 
-    true_anomalies = state_machine(
-        e=calc_e(ra=66200, rp=4905), mean_anomalies=mean_anomalies
-    )
+    if mission is None:
+        mission = Mission(default_phases())
+    result = mission.result(name)
+    mission_phase = result.phase
+    if savepath is None:
+        savepath = os.path.join("plots", mission_phase.filename or f"{name}.pdf")
 
     plot_anomalies(
-        times,
-        mean_anomalies,
-        true_anomalies,
-        "Moon SOI to final orbit transfer",
-        "plots/moon_lowering_transfer.pdf",
+        (result.times - result.start) / 86400,
+        result.mean_anomalies,
+        result.eccentric_anomalies,
+        mission_phase.title or name,
+        savepath,
     )
 
 
-def lunar_orbit(mu_moon):
-    a_lunar_orbit = 56648
-
-    # 5 orbital periods:
-    tof_orbit = 5 * calc_orbital_period(a_lunar_orbit, mu_moon)
-    print(f"Time of 5 orbital periods: {tof_orbit}")
-    mean_anomalies, times = calc_mean_anomaly(
-        0, tof_orbit, a_lunar_orbit, mu_moon, finer_grain=True
-    )
-
-    true_anomalies = state_machine(e=0, mean_anomalies=mean_anomalies)
+def main(mission=None):
+    # Imported here, mission builds on the functions above.
+    import instrumentation
+    from mission import Mission, default_phases
+    from result_cache import cache_enabled, get_result_cache
 
-    plot_anomalies(
-        times,
-        mean_anomalies,
-        true_anomalies,
-        "Lunar orbit for 5 periods.",
-        "plots/moon_orbit.pdf",
-    )
+    report_path = instrumentation.report_path_from_env()
+    if report_path is not None:
+        instrumentation.enable(memory=True)
 
+    if mission is None:
+        cache = get_result_cache() if cache_enabled() else None
+        mission = Mission(default_phases(), cache=cache)
 
-def main():
-    mu_earth = 398600
-    mu_moon = 4905
+    for name in [mission_phase.name for mission_phase in mission.phases]:
+        with phase(name):
+            with phase("compute"):
+                result = mission.result(name)
+            print(f"{name} time of flight: {result.end - result.start}")
 
-    # Maneuvers from launch to parking orbit are instantaneous
-    earth_moon_transfer(mu_earth)
+            with phase("plot"):
+                plot_phase(name, mission=mission)
 
-    # Inclination change set to instantaneous
-    moon_lowering_transfer(mu_moon)
+    if report_path is not None:
+        instrumentation.write_report(report_path)
+        print(f"Profile written to {report_path}")
 
-    # Spacecraft now around moon.
-    lunar_orbit(mu_moon)
+    return mission
 
 
-if __name__ == main():
+if __name__ == "__main__":
     main()
@@ -0,0 +1,124 @@
+"""
+Batched conversion between Keplerian elements and Cartesian state vectors.
+
+Elements are (N, 6) arrays of (a, e, i, Ω, ω, θ) and states are (N, 6)
+arrays of (x, y, z, vx, vy, vz) in the central body's inertial frame.
+Units are km, s and radians, as in the rest of the repo.
+
+Circular and equatorial orbits have undefined angles, we use the usual
+conventions when going from states to elements:
+    - equatorial: Ω = 0 and ω is measured from the x axis.
+    - circular: ω = 0 and θ is the argument of latitude.
+    - circular and equatorial: Ω = ω = 0 and θ is the true longitude.
+"""
+
+import numpy as np
+
+from orbit import calc_position, calc_velocity
+
+
+def _as_rows(array: np.ndarray, name: str) -> np.ndarray:
+    array = np.asarray(array, dtype=float)
+    if array.shape[-1] != 6:
+        raise ValueError(f"{name} must have a trailing axis of length 6.")
+    return array
+
+
+def elements_to_state(elements: np.ndarray, gravitational_parameter) -> np.ndarray:
+    """
+    elements_to_state Convert Keplerian elements to state vectors.
+
+    Parameters
+    ----------
+    elements : np.ndarray
+        Array of shape (..., 6) holding (a, e, i, Ω, ω, θ). Hyperbolic
+        orbits use a negative semi-major axis.
+    gravitational_parameter : float or np.ndarray
+        Gravitational parameter [km^3/s^2], broadcast over the leading axes.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (..., 6) holding (x, y, z, vx, vy, vz).
+    """
+    elements = _as_rows(elements, "elements")
+    a, e, i, raan, argp, nu = np.moveaxis(elements, -1, 0)
+
+    state = np.empty(elements.shape)
+    state[..., :3] = calc_position(a, e, i, raan, argp, nu)
+    state[..., 3:] = calc_velocity(a, e, i, raan, argp, nu, gravitational_parameter)
+    return state
+
+
+def state_to_elements(
+    state: np.ndarray, gravitational_parameter, tol: float = 1e-10
+) -> np.ndarray:
+    """
+    state_to_elements Convert state vectors to Keplerian elements.
+
+    Parameters
+    ----------
+    state : np.ndarray
+        Array of shape (..., 6) holding (x, y, z, vx, vy, vz).
+    gravitational_parameter : float or np.ndarray
+        Gravitational parameter [km^3/s^2], broadcast over the leading axes.
+    tol : float, optional
+        Eccentricity and sin(i) below which an orbit is treated as
+        circular or equatorial.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (..., 6) holding (a, e, i, Ω, ω, θ), angles in [0, 2π)
+        except i in [0, π].
+    """
+    state = _as_rows(state, "state")
+    mu = np.expand_dims(np.asarray(gravitational_parameter, dtype=float), -1)
+
+    r_vec = state[..., :3]
+    v_vec = state[..., 3:]
+    r = np.linalg.norm(r_vec, axis=-1, keepdims=True)
+    v2 = np.sum(v_vec * v_vec, axis=-1, keepdims=True)
+    r_dot_v = np.sum(r_vec * v_vec, axis=-1, keepdims=True)
+
+    h_vec = np.cross(r_vec, v_vec)
+    h = np.linalg.norm(h_vec, axis=-1, keepdims=True)
+    h_hat = h_vec / h
+
+    e_vec = ((v2 - mu / r) * r_vec - r_dot_v * v_vec) / mu
+    e = np.linalg.norm(e_vec, axis=-1)
+
+    # Node vector k x h, replaced by the x axis for equatorial orbits.
+    n_vec = np.stack(
+        [-h_vec[..., 1], h_vec[..., 0], np.zeros(h_vec.shape[:-1])], axis=-1
+    )
+    n = np.linalg.norm(n_vec, axis=-1, keepdims=True)
+    equatorial = n[..., 0] < tol * h[..., 0]
+    n_hat = np.where(
+        equatorial[..., None], np.array([1.0, 0.0, 0.0]), n_vec / np.where(n > 0, n, 1)
+    )
+    m_hat = np.cross(h_hat, n_hat)
+
+    circular = e < tol
+    # Periapsis direction, the node line stands in for circular orbits.
+    p_hat = np.where(
+        circular[..., None], n_hat, e_vec / np.where(e > 0, e, 1)[..., None]
+    )
+    q_hat = np.cross(h_hat, p_hat)
+
+    elements = np.empty(state.shape)
+    elements[..., 0] = 1 / (2 / r[..., 0] - v2[..., 0] / mu[..., 0])
+    elements[..., 1] = np.where(circular, 0.0, e)
+    elements[..., 2] = np.arccos(np.clip(h_hat[..., 2], -1, 1))
+    elements[..., 3] = np.where(
+        equatorial, 0.0, np.arctan2(n_hat[..., 1], n_hat[..., 0])
+    )
+    elements[..., 4] = np.arctan2(
+        np.sum(p_hat * m_hat, axis=-1), np.sum(p_hat * n_hat, axis=-1)
+    )
+    elements[..., 5] = np.arctan2(
+        np.sum(r_vec * q_hat, axis=-1), np.sum(r_vec * p_hat, axis=-1)
+    )
+    elements[..., 3:] %= 2 * np.pi
+
+    return elements
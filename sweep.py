@@ -0,0 +1,156 @@
+"""
+Parameter sweeps over transfer designs.
+
+A sweep evaluates a Hohmann transfer between two circular orbits, with
+the plane change folded into the circularisation burn at apoapsis, for
+every combination of (parking radius, target radius, inclination change).
+The grid is split into shards that run in a process pool, each shard is
+evaluated as one vectorised NumPy pass.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from constants import MU_EARTH
+from manoeuvres import hohmann_plane_change
+
+RESULT_DTYPE = np.dtype(
+    [
+        ("r_parking", float),  # [km]
+        ("r_target", float),  # [km]
+        ("inclination", float),  # plane change [rad]
+        ("dv1", float),  # departure burn [km/s]
+        ("dv2", float),  # arrival burn [km/s]
+        ("dv_total", float),  # [km/s]
+        ("tof", float),  # [s]
+    ]
+)
+
+
+def transfer_grid(r_parking, r_target, inclination) -> np.ndarray:
+    """
+    transfer_grid Every combination of the inputs as an (N, 3) array.
+
+    Rows are ordered with r_parking varying slowest and inclination
+    fastest, the same order as np.meshgrid(..., indexing="ij").
+    """
+    grids = np.meshgrid(
+        np.atleast_1d(r_parking),
+        np.atleast_1d(r_target),
+        np.atleast_1d(inclination),
+        indexing="ij",
+    )
+    return np.column_stack([grid.ravel() for grid in grids]).astype(float)
+
+
+def evaluate_transfers(
+    params: np.ndarray, gravitational_parameter: float
+) -> np.ndarray:
+    """
+    evaluate_transfers Δv and time of flight for an (N, 3) parameter array.
+
+    Parameters
+    ----------
+    params : np.ndarray
+        Rows of (parking radius [km], target radius [km], plane change [rad]).
+    gravitational_parameter : float
+        Gravitational parameter of the central body [km^3/s^2].
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with RESULT_DTYPE fields, one row per input row.
+    """
+    r1, r2, inclination = np.asarray(params, dtype=float).T
+
+    result = np.empty(len(r1), dtype=RESULT_DTYPE)
+    result["r_parking"] = r1
+    result["r_target"] = r2
+    result["inclination"] = inclination
+    result["dv1"], result["dv2"], result["tof"] = hohmann_plane_change(
+        r1, r2, inclination, gravitational_parameter
+    )
+    result["dv_total"] = result["dv1"] + result["dv2"]
+
+    return result
+
+
+def _print_progress(done: int, total: int) -> None:
+    print(f"Sweep: {done}/{total} transfers evaluated")
+
+
+def sweep_transfers(
+    r_parking,
+    r_target,
+    inclination,
+    gravitational_parameter: float = MU_EARTH,
+    max_workers: int = None,
+    shard_size: int = 100_000,
+    progress=None,
+) -> np.ndarray:
+    """
+    sweep_transfers Evaluate a full transfer grid across a process pool.
+
+    Parameters
+    ----------
+    r_parking, r_target : float or np.ndarray
+        Radii of the circular parking and target orbits [km].
+    inclination : float or np.ndarray
+        Plane changes to make at the target orbit [rad].
+    gravitational_parameter : float, optional
+        Gravitational parameter of the central body [km^3/s^2].
+    max_workers : int, optional
+        Worker processes, defaults to the number of CPUs. With 1 worker,
+        or a single shard, everything runs in this process.
+    shard_size : int, optional
+        Grid rows per task.
+    progress : callable, optional
+        Called as progress(done, total) when each shard finishes, pass
+        True to print progress.
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with RESULT_DTYPE fields, rows in transfer_grid
+        order regardless of which shard finishes first.
+    """
+    if progress is True:
+        progress = _print_progress
+
+    params = transfer_grid(r_parking, r_target, inclination)
+    total = len(params)
+    starts = range(0, total, shard_size)
+    max_workers = max_workers or os.cpu_count() or 1
+    result = np.empty(total, dtype=RESULT_DTYPE)
+
+    if max_workers == 1 or len(starts) == 1:
+        for start in starts:
+            stop = start + shard_size
+            result[start:stop] = evaluate_transfers(
+                params[start:stop], gravitational_parameter
+            )
+            if progress:
+                progress(min(stop, total), total)
+        return result
+
+    done = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                evaluate_transfers,
+                params[start : start + shard_size],
+                gravitational_parameter,
+            ): start
+            for start in starts
+        }
+        for future in as_completed(futures):
+            shard = future.result()
+            start = futures[future]
+            result[start : start + len(shard)] = shard
+            done += len(shard)
+            if progress:
+                progress(done, total)
+
+    return result
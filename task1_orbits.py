@@ -1,97 +1,96 @@
 # Basic polar coordinates plot with orbit segment between two angles
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib_rc
-
-
-def calc_r(a, e, theta):
-    return (a * (1 - e**2)) / (1 + e * np.cos(theta))
-
-
-def calc_transfer_e(ra, rb, theta_a, theta_b):
-    return (rb - ra) / (ra * np.cos(theta_a) - rb * np.cos(theta_b))
-
-
-def calc_a(ra, rb):
-    return 0.5 * (ra + rb)
-
-
-# Orbit parameters
-a_sat = 5137
-e_sat = 0.3
-theta = np.linspace(0, 2 * np.pi, 360)
-r_sat = calc_r(a_sat, e_sat, theta)
-
-a_earth = 6378
-e_earth = 0
-r_earth = calc_r(a_earth, e_earth, theta)
-
-a_parking = 8371
-e_parking = 0
-r_parking = calc_r(a_parking, e_parking, theta)
-
-# Define angles in degrees and convert to radians
-theta_a_deg = 160
-theta_b_deg = 180
-theta_a = np.deg2rad(theta_a_deg)
-theta_b = np.deg2rad(theta_b_deg)
-
-# Calculate r at these specific angles
-ra_transfer = calc_r(a_sat, e_sat, theta_a_deg)
-rb_transfer = calc_r(a_parking, e_parking, theta_b_deg)
-
-# Slice theta and r between theta_a and theta_b
-theta_segment = theta[(theta >= theta_a) & (theta <= theta_b)]
-theta_segment = theta
-r_segment = calc_r(
-    calc_a(ra_transfer, rb_transfer),
-    calc_transfer_e(ra_transfer, rb_transfer, theta_a, theta_b),
-    theta_segment,
-)  # Or use the orbit of interest
-
-# Plot
-fig, ax = plt.subplots(subplot_kw={"projection": "polar"})
-
-# Full orbits
-ax.plot(theta, r_earth, label="Earth, true scale")
-ax.plot(theta, r_sat, label="Satellite launch orbit")
-ax.plot(theta, r_parking, label="Satellite parking orbit")
-
-# Orbit segment between theta_a and theta_b
-# ax.plot(
-#     theta_segment,
-#     r_segment,
-#     label=f"Orbit between {theta_a_deg}° and {theta_b_deg}°",
-#     linestyle="--",
-#     color="red",
-# )
-
-# Scatter points at theta_a and theta_b
-ax.scatter(
-    theta_a,
-    ra_transfer,
-    marker="x",
-    label="Initial location",
-    zorder=10,
-    c="black",
-    clip_on=False,
-)
-ax.scatter(
-    theta_b,
-    rb_transfer,
-    marker="x",
-    label="Parking location",
-    zorder=10,
-    c="grey",
-    clip_on=False,
-)
-
-ax.set_rticks([5000, 7000, 9000])  # Adjust radial ticks
-ax.set_rlabel_position(-22.5)  # Move radial labels away from plotted line
-ax.grid(True)
-
-fig.legend()
-plt.savefig("plots/initial_parking.pdf")
+
+from geometry import calc_a, calc_r, calc_transfer_e
+
+
+def plot_initial_parking(savepath="plots/initial_parking.pdf"):
+    """
+    plot_initial_parking Polar plot of the launch and parking orbits.
+    """
+    import matplotlib.pyplot as plt
+    import matplotlib_rc  # applies the plot style on first import
+
+    # Orbit parameters
+    a_sat = 5137
+    e_sat = 0.3
+    theta = np.linspace(0, 2 * np.pi, 360)
+    r_sat = calc_r(a_sat, e_sat, theta)
+
+    a_earth = 6378
+    e_earth = 0
+    r_earth = calc_r(a_earth, e_earth, theta)
+
+    a_parking = 8371
+    e_parking = 0
+    r_parking = calc_r(a_parking, e_parking, theta)
+
+    # Define angles in degrees and convert to radians
+    theta_a_deg = 160
+    theta_b_deg = 180
+    theta_a = np.deg2rad(theta_a_deg)
+    theta_b = np.deg2rad(theta_b_deg)
+
+    # Calculate r at these specific angles
+    ra_transfer = calc_r(a_sat, e_sat, theta_a)
+    rb_transfer = calc_r(a_parking, e_parking, theta_b)
+
+    # Slice theta and r between theta_a and theta_b
+    theta_segment = theta[(theta >= theta_a) & (theta <= theta_b)]
+    theta_segment = theta
+    r_segment = calc_r(
+        calc_a(ra_transfer, rb_transfer),
+        calc_transfer_e(ra_transfer, rb_transfer, theta_a, theta_b),
+        theta_segment,
+    )  # Or use the orbit of interest
+
+    # Plot
+    fig, ax = plt.subplots(subplot_kw={"projection": "polar"})
+
+    # Full orbits
+    ax.plot(theta, r_earth, label="Earth, true scale")
+    ax.plot(theta, r_sat, label="Satellite launch orbit")
+    ax.plot(theta, r_parking, label="Satellite parking orbit")
+
+    # Orbit segment between theta_a and theta_b
+    # ax.plot(
+    #     theta_segment,
+    #     r_segment,
+    #     label=f"Orbit between {theta_a_deg}° and {theta_b_deg}°",
+    #     linestyle="--",
+    #     color="red",
+    # )
+
+    # Scatter points at theta_a and theta_b
+    ax.scatter(
+        theta_a,
+        ra_transfer,
+        marker="x",
+        label="Initial location",
+        zorder=10,
+        c="black",
+        clip_on=False,
+    )
+    ax.scatter(
+        theta_b,
+        rb_transfer,
+        marker="x",
+        label="Parking location",
+        zorder=10,
+        c="grey",
+        clip_on=False,
+    )
+
+    ax.set_rticks([5000, 7000, 9000])  # Adjust radial ticks
+    ax.set_rlabel_position(-22.5)  # Move radial labels away from plotted line
+    ax.grid(True)
+
+    fig.legend()
+    plt.savefig(savepath)
+
+
+if __name__ == "__main__":
+    plot_initial_parking()
 
 
 # Alternative plotting tried here:
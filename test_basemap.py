@@ -0,0 +1,45 @@
+import pytest
+import numpy as np
+
+ccrs = pytest.importorskip("cartopy.crs")
+
+import basemap
+from basemap import get_basemap, reproject
+
+
+def test_plate_carree_matches_source_image():
+    rng = np.random.default_rng(0)
+    image = rng.uniform(size=(90, 180, 3))
+
+    out = reproject(ccrs.PlateCarree(), 180, image)
+
+    assert out.shape == (90, 180, 4)
+    np.testing.assert_allclose(out[..., :3] / 255, image, atol=1 / 255)
+    assert np.all(out[..., 3] == 255)
+
+
+def test_basemap_is_reprojected_once(tmp_path, monkeypatch):
+    projection = ccrs.Robinson()
+    first, extent = get_basemap(projection, width=64, cache_dir=tmp_path)
+
+    assert isinstance(first, np.memmap)
+    assert first.shape[1] == 64 and first.shape[2] == 4
+    # Corners fall outside the Robinson outline.
+    assert first[0, 0, 3] == 0 and first[first.shape[0] // 2, 32, 3] == 255
+    assert extent == (*projection.x_limits, *projection.y_limits)
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+
+    # A fresh process would find the file, here the in-memory copy is reused.
+    monkeypatch.setattr(basemap, "reproject", None)
+    second, _ = get_basemap(ccrs.Robinson(), width=64, cache_dir=tmp_path)
+    assert second is first
+
+    basemap._loaded.clear()
+    third, _ = get_basemap(ccrs.Robinson(), width=64, cache_dir=tmp_path)
+    np.testing.assert_array_equal(third, first)
+
+
+def test_warm_calls_do_not_rehash_the_image(tmp_path, monkeypatch):
+    get_basemap(ccrs.Robinson(), width=64, cache_dir=tmp_path)
+    monkeypatch.setattr(basemap, "_hash_file", None)
+    get_basemap(ccrs.Robinson(), width=64, cache_dir=tmp_path)
@@ -0,0 +1,53 @@
+import numpy as np
+
+from decimate import decimate_series, minmax_indices, simplify_curve
+
+
+def test_minmax_keeps_every_column_envelope():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 10, 1_000_000)
+    y = np.sin(3 * x) + rng.normal(0, 0.1, x.size)
+    bins = 500
+
+    keep = minmax_indices(x, y, bins)
+
+    assert len(keep) <= 4 * bins
+    column = np.minimum((x / 10 * bins).astype(int), bins - 1)
+    kept_column = column[keep]
+    for c in (0, 123, bins - 1):
+        np.testing.assert_equal(y[keep][kept_column == c].max(), y[column == c].max())
+        np.testing.assert_equal(y[keep][kept_column == c].min(), y[column == c].min())
+
+
+def test_decimate_series_shares_x_and_keeps_gaps():
+    x = np.arange(100_000.0)
+    mean = np.mod(x, 977.0)
+    true = np.cos(x / 1000)
+    true[5000:5010] = np.nan
+
+    x_out, mean_out, true_out = decimate_series(x, mean, true, bins=100)
+
+    assert len(x_out) == len(mean_out) == len(true_out) < 1000
+    assert np.all(np.diff(x_out) > 0)
+    assert np.count_nonzero(np.isnan(true_out)) == 10
+    assert mean_out.max() == mean.max() and x_out[-1] == x[-1]
+
+
+def test_simplified_orbit_stays_within_tolerance():
+    theta = np.linspace(0, 2 * np.pi, 100_000)
+    r = 8000 * (1 - 0.3**2) / (1 + 0.3 * np.cos(theta))
+    x, y = r * np.cos(theta), r * np.sin(theta)
+
+    xs, ys = simplify_curve(x, y, tolerance=1.0)
+
+    assert len(xs) < 1000
+    # Every original point is within tolerance of the simplified polyline.
+    segments = np.stack([xs, ys], axis=1)
+    a, b = segments[:-1], segments[1:]
+    index = np.searchsorted(np.arctan2(ys, xs) % (2 * np.pi), theta[1:-1]) - 1
+    index = np.clip(index, 0, len(a) - 1)
+    p = np.stack([x[1:-1], y[1:-1]], axis=1)
+    d = b[index] - a[index]
+    t = np.clip(np.sum((p - a[index]) * d, axis=1) / np.sum(d * d, axis=1), 0, 1)
+    distance = np.linalg.norm(p - a[index] - t[:, None] * d, axis=1)
+    assert distance.max() <= 1.0 + 1e-9
@@ -0,0 +1,130 @@
+import struct
+
+import pytest
+import numpy as np
+
+from ephemeris import Ephemeris, BinaryKernel, load_text_kernel, parse_text_kernel
+
+
+def write_spk(path, segments):
+    """Write a minimal little-endian DAF/SPK with type 2 segments.
+
+    segments is a list of (target, center, coefficients) where the
+    coefficients have shape (n_records, 3, degree + 1) and each record
+    covers 100 s starting at t = 0.
+    """
+    nd, ni = 2, 6
+    words = []
+    summaries = []
+    address = 3 * 128 + 1
+    for target, center, coefficients in segments:
+        n_records, _, n_coefficients = coefficients.shape
+        record_size = 2 + 3 * n_coefficients
+        data = []
+        for index in range(n_records):
+            data += [100 * index + 50, 50] + list(coefficients[index].ravel())
+        data += [0, 100, record_size, n_records]
+        start, end = address, address + len(data) - 1
+        summaries.append(
+            struct.pack("<2d6i", 0, 100 * n_records, target, center, 1, 2, start, end)
+        )
+        words += data
+        address = end + 1
+
+    file_record = bytearray(1024)
+    file_record[:8] = b"DAF/SPK "
+    file_record[8:16] = struct.pack("<2i", nd, ni)
+    file_record[76:88] = struct.pack("<3i", 2, 2, address)
+    file_record[88:96] = b"LTL-IEEE"
+
+    summary_record = bytearray(1024)
+    summary_record[:24] = struct.pack("<3d", 0, 0, len(summaries))
+    summary_record[24 : 24 + 40 * len(summaries)] = b"".join(summaries)
+
+    with open(path, "wb") as f:
+        f.write(file_record + summary_record + bytes(1024))
+        f.write(np.array(words, dtype="<f8").tobytes())
+
+
+def test_moon_me_rotation_matches_reference():
+    ephemeris = Ephemeris()
+    R = ephemeris.rotation("MOON_ME_DE421", 0.0)
+
+    # skyfield, PlanetaryConstants.build_frame_named("MOON_ME_DE421") at J2000.
+    expected = [
+        [0.784240401533927, 0.557841947534546, 0.271623552316012],
+        [-0.620045052941193, 0.720580100803033, 0.310336028604228],
+        [-0.022608072121631, -0.411796891558881, 0.910995167483004],
+    ]
+    np.testing.assert_allclose(R, expected, atol=1e-12)
+    np.testing.assert_allclose(ephemeris.rotation("MOON_ME", 0.0), R)
+
+
+def test_rotation_is_vectorised_over_epochs():
+    et = np.linspace(-3e9, 1.5e9, 1000).reshape(10, 100)
+    R = Ephemeris().rotation("MOON_PA_DE421", et)
+
+    assert R.shape == (10, 100, 3, 3)
+    np.testing.assert_allclose(
+        R @ np.swapaxes(R, -1, -2), np.broadcast_to(np.eye(3), R.shape), atol=1e-12
+    )
+
+
+def test_text_kernel_parsing_and_cache(tmp_path):
+    kernel = tmp_path / "test.tpc"
+    kernel.write_text(
+        "ignored = ( 1 )\n"
+        "\\begindata\n"
+        "BODY301_RADII = ( 1737.4 1737.4 1737.4 )\n"
+        "NAME = 'MOON_ME' \n"
+        "BODY301_PM = ( 38.3213 13.17635815 -1.4D-12 )\n"
+        "\\begintext\n"
+        "NOT_DATA = 2\n"
+    )
+    variables = load_text_kernel(str(kernel), cache_dir=tmp_path / "cache")
+
+    assert variables == {
+        "BODY301_RADII": [1737.4, 1737.4, 1737.4],
+        "NAME": ["MOON_ME"],
+        "BODY301_PM": [38.3213, 13.17635815, -1.4e-12],
+    }
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+    assert load_text_kernel(str(kernel), cache_dir=tmp_path / "cache") == variables
+    assert parse_text_kernel("\\begindata\nA = 1\nA += ( 2 3 )\n") == {
+        "A": [1.0, 2.0, 3.0]
+    }
+
+
+def test_spk_positions_chain_through_barycentre(tmp_path):
+    rng = np.random.default_rng(3)
+    moon = rng.normal(size=(2, 3, 4)) * 1e5
+    earth = rng.normal(size=(2, 3, 4)) * 1e3
+    emb = rng.normal(size=(2, 3, 4)) * 1e8
+    path = tmp_path / "test.bsp"
+    write_spk(path, [(301, 3, moon), (399, 3, earth), (3, 0, emb)])
+
+    assert [s.target for s in BinaryKernel(str(path)).segments] == [301, 399, 3]
+
+    ephemeris = Ephemeris(spk_paths=[str(path)])
+    et = np.array([10.0, 150.0])
+    # Record 0 is centred on 50 s and record 1 on 150 s, both 50 s wide.
+    s = np.array([-0.8, 0.0])
+    T = np.stack([np.ones(2), s, 2 * s**2 - 1, 4 * s**3 - 3 * s], axis=-1)
+    expected = np.einsum("rck,rk->rc", moon - earth, T)
+
+    np.testing.assert_allclose(ephemeris.position("moon", "earth", et), expected)
+    with pytest.raises(ValueError):
+        ephemeris.position("moon", "earth", 500.0)
+
+
+def test_missing_spk_is_reported():
+    ephemeris = Ephemeris(spk_paths=["does-not-exist.bsp"])
+    with pytest.raises(FileNotFoundError):
+        ephemeris.position("moon", "earth", 0.0)
+
+
+def test_unsupported_tk_frame_spec_is_rejected():
+    ephemeris = Ephemeris()
+    ephemeris.variables["TKFRAME_-99_SPEC"] = ["QUATERNION"]
+    with pytest.raises(ValueError, match="QUATERNION"):
+        ephemeris._tk_matrix(-99)
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from constants import MU_EARTH, R_EARTH
+from events import (
+    detect_events,
+    find_roots,
+    hermite_trajectory,
+    kepler_trajectory,
+    shadow_function,
+)
+from propagator import point_mass, propagate
+from state_machine import calc_orbital_period
+
+
+def test_find_roots_of_sine():
+    roots, signs = find_roots(np.sin, 0.5, 10, step=1.0, tol=1e-10)
+    np.testing.assert_allclose(roots, [np.pi, 2 * np.pi, 3 * np.pi], atol=1e-9)
+    np.testing.assert_array_equal(signs, [-1, 1, -1])
+
+    rising, _ = find_roots(np.sin, 0.5, 10, step=1.0, direction=1)
+    np.testing.assert_allclose(rising, [2 * np.pi], atol=1e-6)
+
+
+@pytest.mark.parametrize("t_start, t_end, step", [(10, 0.5, 1.0), (0.5, 10, 0.0)])
+def test_find_roots_checks_interval(t_start, t_end, step):
+    with pytest.raises(ValueError):
+        find_roots(np.sin, t_start, t_end, step=step)
+
+
+def test_apsides_and_nodes_of_kepler_orbit():
+    a, e, t_p = 20000.0, 0.4, 500.0
+    period = calc_orbital_period(a, MU_EARTH)
+    trajectory = kepler_trajectory(a, e, i=0.5, argp=0.3, t_p=t_p)
+
+    # Ten samples per orbit are enough to bracket every event.
+    events = detect_events(trajectory, 0, 2 * period, step=period / 10)
+
+    periapsis = events["time"][events["kind"] == "periapsis"]
+    apoapsis = events["time"][events["kind"] == "apoapsis"]
+    np.testing.assert_allclose(periapsis, [t_p, t_p + period], atol=1e-5)
+    np.testing.assert_allclose(apoapsis, t_p + period * np.array([0.5, 1.5]), atol=1e-5)
+
+    for kind in ("ascending_node", "descending_node"):
+        z = trajectory(events["time"][events["kind"] == kind])[:, 2]
+        np.testing.assert_allclose(z, 0, atol=1e-5)
+    assert np.all(np.diff(events["time"]) >= 0)
+
+
+def test_circular_equatorial_orbit_has_no_apsis_or_node_events():
+    a = 30000.0
+    period = calc_orbital_period(a, MU_EARTH)
+
+    events = detect_events(kepler_trajectory(a, 0.0), 0, period, step=period / 20)
+    assert len(events) == 0
+
+    # A barely eccentric orbit still has its apsides.
+    barely = kepler_trajectory(a, 1e-5, t_p=period / 4)
+    events = detect_events(barely, 0, period, step=period / 20)
+    assert list(events["kind"]) == ["periapsis", "apoapsis"]
+    np.testing.assert_allclose(events["time"], period * np.array([0.25, 0.75]))
+
+
+def test_hermite_trajectory_matches_propagation():
+    a, e = 10000.0, 0.2
+    period = calc_orbital_period(a, MU_EARTH)
+    reference = kepler_trajectory(a, e)
+    t_eval = np.linspace(0, period, 41)
+    times, states = propagate(
+        reference(0.0), (0, period), point_mass(MU_EARTH), t_eval=t_eval
+    )
+    trajectory = hermite_trajectory(times, states)
+
+    t = np.linspace(0, period, 333)
+    np.testing.assert_allclose(
+        trajectory(t)[:, :3], reference(t)[:, :3], rtol=0, atol=0.5
+    )
+
+    roots, _ = find_roots(
+        lambda t: np.sum(trajectory(t)[:, :3] * trajectory(t)[:, 3:], axis=-1),
+        0.1 * period,
+        period,
+        step=period / 8,
+    )
+    np.testing.assert_allclose(roots, [0.5 * period], rtol=1e-4)
+
+
+def test_soi_entry_and_exit():
+    a = 30000.0
+    period = calc_orbital_period(a, MU_EARTH)
+    trajectory = kepler_trajectory(a, 0.0)
+    # A sphere of 5000 km centred on the orbit at θ = 90°.
+    events = detect_events(
+        trajectory,
+        0,
+        period,
+        step=period / 20,
+        body_position=np.array([0.0, a, 0.0]),
+        soi_radius=5000,
+    )
+
+    soi = events[np.char.startswith(events["kind"], "soi")]
+    assert list(soi["kind"]) == ["soi_entry", "soi_exit"]
+    half_angle = 2 * np.arcsin(2500 / a)
+    expected = period * (0.25 + np.array([-1, 1]) * half_angle / (2 * np.pi))
+    np.testing.assert_allclose(soi["time"], expected, atol=1e-4)
+
+
+def test_shadow_crossings():
+    r = 7000.0
+    period = calc_orbital_period(r, MU_EARTH)
+    trajectory = kepler_trajectory(r, 0.0)
+    g = shadow_function(trajectory, np.array([1.0, 0.0, 0.0]))
+
+    roots, signs = find_roots(g, 0, period, step=period / 36)
+
+    angle = np.arcsin(R_EARTH / r)
+    expected = period * np.array([np.pi - angle, np.pi + angle]) / (2 * np.pi)
+    np.testing.assert_allclose(roots, expected, atol=1e-5)
+    np.testing.assert_array_equal(signs, [-1, 1])
+
+
+def test_hermite_trajectory_checks_shape():
+    with pytest.raises(ValueError):
+        hermite_trajectory(np.arange(3.0), np.zeros((3, 3)))
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from geometry import (
+    calc_a,
+    calc_ellipse_focus,
+    calc_p,
+    calc_r,
+    calc_transfer_e,
+    calc_xy_parametric,
+    orbit_curves,
+)
+
+
+def test_calc_r_apsides():
+    a, e = 10000.0, 0.3
+    r = calc_r(a, e, np.array([0, np.pi]))
+    np.testing.assert_allclose(r, [a * (1 - e), a * (1 + e)])
+
+
+def test_calc_p_is_the_radius_at_right_angles():
+    a = np.array([7000.0, 20000.0])
+    e = np.array([0.0, 0.6])
+    np.testing.assert_allclose(calc_p(a, e), [7000.0, 12800.0])
+    np.testing.assert_allclose(calc_p(a, e), calc_r(a, e, np.pi / 2))
+
+
+def test_calc_r_broadcasts_and_fills_out():
+    a = np.array([7000.0, 20000.0])[:, None]
+    e = np.array([0.1, 0.6])[:, None]
+    theta = np.linspace(0, 2 * np.pi, 50)
+    out = np.empty((2, 50))
+
+    result = calc_r(a, e, theta, out=out)
+
+    assert result is out
+    np.testing.assert_allclose(out[1], 20000 * (1 - 0.36) / (1 + 0.6 * np.cos(theta)))
+
+
+def test_out_shape_mismatch_raises():
+    with pytest.raises(ValueError):
+        calc_r(7000.0, 0.1, np.zeros(5), out=np.empty(4))
+
+
+def test_float32():
+    theta = np.linspace(0, 2 * np.pi, 100)
+    r32 = calc_r(7000.0, 0.2, theta, dtype=np.float32)
+    assert r32.dtype == np.float32
+    np.testing.assert_allclose(r32, calc_r(7000.0, 0.2, theta), rtol=1e-6)
+
+
+def test_transfer_passes_through_both_points():
+    ra, rb = 8000.0, 30000.0
+    theta_a, theta_b = np.deg2rad(160), np.pi
+    e = calc_transfer_e(ra, rb, theta_a, theta_b)
+    # Coaxial conic through both points: same semi-latus rectum.
+    p = ra * (1 + e * np.cos(theta_a))
+    np.testing.assert_allclose(rb * (1 + e * np.cos(theta_b)), p)
+    assert calc_a(ra, rb) == pytest.approx(19000.0)
+
+
+def test_xy_parametric_matches_polar():
+    a, e = 12000.0, 0.4
+    theta = np.linspace(0, 2 * np.pi, 73)
+    xy = calc_xy_parametric(a, e, theta)
+    r = calc_r(a, e, theta)
+    np.testing.assert_allclose(xy[:, 0], r * np.cos(theta))
+    np.testing.assert_allclose(xy[:, 1], r * np.sin(theta))
+    # The centre sits -ae from the focus, halfway between the apsides.
+    centre = 0.5 * (xy[0, 0] + xy[36, 0])
+    assert calc_ellipse_focus(a, e) == pytest.approx(centre)
+
+
+def test_orbit_curves_reuses_buffer():
+    a = np.array([7000.0, 9000.0, 40000.0])
+    e = np.array([0.0, 0.2, 0.7])
+    out = np.empty((3, 90, 2))
+
+    curves = orbit_curves(a, e, num=90, out=out)
+
+    assert curves is out
+    np.testing.assert_allclose(np.hypot(out[0, :, 0], out[0, :, 1]), 7000.0)
+    np.testing.assert_allclose(out[:, 0], out[:, -1], atol=1e-8)
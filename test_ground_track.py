@@ -0,0 +1,41 @@
+import numpy as np
+
+from ephemeris import get_ephemeris
+from ground_track import ground_track, lunar_orbit_track, split_wrapped
+
+
+def test_surface_point_stays_fixed():
+    # Aristarchus, the site in moon/ground_track.ipynb.
+    lat, lon = np.radians(26.3), np.radians(-46.8)
+    fixed = 1737.4 * np.array(
+        [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)]
+    )
+    et = np.linspace(0, 30 * 86400, 500)
+    rotation = get_ephemeris().rotation("MOON_ME_DE421", et)
+    inertial = np.einsum("...ji,...j->...i", rotation, fixed)
+
+    latitude, longitude, altitude = ground_track(inertial, et)
+
+    np.testing.assert_allclose(latitude, 26.3, atol=1e-9)
+    np.testing.assert_allclose(longitude, -46.8, atol=1e-9)
+    np.testing.assert_allclose(altitude, 0, atol=1e-9)
+
+
+def test_split_wrapped_inserts_breaks():
+    longitude = np.array([170.0, 179.0, -178.0, -170.0, 0.0])
+    latitude = np.arange(5.0)
+
+    split_lon, split_lat = split_wrapped(longitude, latitude)
+
+    np.testing.assert_array_equal(np.isnan(split_lon), [0, 0, 1, 0, 0, 0])
+    np.testing.assert_array_equal(np.isnan(split_lat), [0, 0, 1, 0, 0, 0])
+
+
+def test_polar_lunar_orbit_track():
+    longitude, latitude = lunar_orbit_track(i=np.pi / 2, raan=np.pi / 2, num=2000)
+
+    # The orbit plane is the ICRF yz plane, which nearly holds the lunar pole.
+    assert np.nanmax(latitude) > 80 and np.nanmin(latitude) < -80
+    # No drawn segment crosses the map.
+    steps = np.abs(np.diff(longitude))
+    assert np.all(steps[~np.isnan(steps)] < 180)
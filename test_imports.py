@@ -0,0 +1,69 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+COMPUTE_MODULES = [
+    "state_machine",
+    "kepler_solver",
+    "mission",
+    "propagation",
+    "propagator",
+    "orbit",
+    "state_vectors",
+    "lambert",
+    "manoeuvres",
+    "sweep",
+    "porkchop",
+    "ground_track",
+    "task1_orbits",
+    "ephemeris",
+    "decimate",
+    "result_cache",
+    "instrumentation",
+    "geometry",
+    "screening",
+    "events",
+    "patched_conics",
+]
+HEAVY_MODULES = ["matplotlib", "cartopy", "skyfield", "jplephem", "rebound", "kepler"]
+
+# Seconds to import every compute module on top of NumPy. Pulling in
+# pyplot alone takes longer than this.
+IMPORT_BUDGET = 0.3
+
+
+def test_compute_modules_import_only_numpy_and_fast():
+    script = f"""
+import json, sys, time
+import numpy
+start = time.perf_counter()
+for name in {COMPUTE_MODULES!r}:
+    __import__(name)
+seconds = time.perf_counter() - start
+heavy = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.splitlines()[-1])
+
+    assert result["heavy"] == []
+    assert result["seconds"] < IMPORT_BUDGET
+
+
+def test_importing_task1_orbits_writes_nothing(tmp_path):
+    subprocess.run(
+        [sys.executable, "-c", "import task1_orbits"],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": ROOT},
+        check=True,
+    )
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,74 @@
+import tracemalloc
+
+import numpy as np
+
+import instrumentation
+from instrumentation import count, phase, timed
+from state_machine import calc_mean_anomaly, state_machine
+
+
+def test_disabled_records_nothing():
+    instrumentation.reset()
+
+    with phase("idle"):
+        state_machine(0.5, np.linspace(0, 6, 100))
+    count("anything")
+
+    assert instrumentation.report()["phases"] == {}
+    assert instrumentation.report()["counters"] == {}
+
+
+def test_nested_phases_counters_and_memory(tmp_path):
+    instrumentation.reset()
+    instrumentation.enable(memory=True)
+    try:
+        with phase("transfer"):
+            mean_anomalies, _ = calc_mean_anomaly(0, 1e5, 61424, 4905, num=20001)
+            state_machine(0.862, mean_anomalies)
+            with phase("buffer"):
+                np.ones(1_000_000).sum()
+        data = instrumentation.write_report(tmp_path / "report.json")
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+    phases = data["phases"]
+    assert list(phases)[0] == "transfer"
+    assert phases["transfer/state_machine.state_machine"]["calls"] == 1
+    assert (
+        phases["transfer"]["seconds"]
+        >= phases["transfer/state_machine.state_machine"]["seconds"]
+    )
+    assert phases["transfer/buffer"]["peak_bytes"] >= 8_000_000
+    assert phases["transfer"]["peak_bytes"] >= phases["transfer/buffer"]["peak_bytes"]
+
+    assert data["counters"]["kepler.samples"] == 20000
+    assert data["counters"]["state_machine.samples"] == 20000
+    assert 0 < data["counters"]["kepler.newton_iterations"] <= 50
+    assert (tmp_path / "report.json").exists()
+
+
+def test_disable_leaves_callers_tracing_running():
+    tracemalloc.start()
+    try:
+        instrumentation.enable(memory=True)
+        with phase("traced"):
+            np.ones(1000).sum()
+        instrumentation.disable()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+        instrumentation.reset()
+
+    instrumentation.enable(memory=True)
+    instrumentation.disable()
+    assert not tracemalloc.is_tracing()
+
+
+def test_timed_keeps_the_function():
+    @timed(name="square")
+    def square(x):
+        return x * x
+
+    assert square(3) == 9
+    assert square.__name__ == "square"
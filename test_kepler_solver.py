@@ -0,0 +1,76 @@
+import pytest
+import numpy as np
+
+from kepler_solver import (
+    solve_kepler,
+    solve_kepler_cached,
+    eccentric_to_true_anomaly,
+    get_kepler_table,
+    clear_kepler_table_cache,
+    kepler_table_cache_nbytes,
+    set_kepler_table_cache_limit,
+)
+
+
+@pytest.mark.parametrize("e", [0.0, 0.3, 0.9487, 0.99])
+def test_solve_kepler_satisfies_keplers_equation(e):
+    mean_anomalies = np.linspace(0, 2 * np.pi, 1001, endpoint=False)
+    E, nu, converged = solve_kepler(mean_anomalies, e)
+
+    assert np.all(converged)
+    residual = np.mod(E - e * np.sin(E) - mean_anomalies + np.pi, 2 * np.pi) - np.pi
+    np.testing.assert_allclose(residual, 0, atol=1e-10)
+    assert np.all((E >= 0) & (E < 2 * np.pi))
+    assert np.all((nu >= 0) & (nu < 2 * np.pi))
+
+
+def test_solve_kepler_broadcasts_eccentricities():
+    mean_anomalies = np.array([[0.5], [2.0]])
+    e = np.array([0.0, 0.1, 0.5])
+    E, nu, converged = solve_kepler(mean_anomalies, e)
+
+    assert E.shape == nu.shape == converged.shape == (2, 3)
+    np.testing.assert_allclose(E[:, 0], [0.5, 2.0])
+
+
+def test_solve_kepler_reports_unconverged_samples():
+    _, _, converged = solve_kepler(np.array([0.1, 1.0, 3.0]), 0.9, max_iter=1)
+    assert not np.all(converged)
+
+
+def test_eccentric_to_true_anomaly_circular_orbit():
+    E = np.linspace(0, 2 * np.pi, 10, endpoint=False)
+    np.testing.assert_allclose(eccentric_to_true_anomaly(E, 0.0), E, atol=1e-12)
+
+
+def test_solve_kepler_rejects_hyperbolic_eccentricity():
+    with pytest.raises(ValueError):
+        solve_kepler(np.array([1.0]), 1.2)
+
+
+@pytest.mark.parametrize("e", [0.0, 0.862, 0.9487, 0.999])
+def test_cached_solver_matches_iterative_solver(e):
+    mean_anomalies = np.random.default_rng(0).uniform(-10, 20, 10_000)
+    E, nu, converged = solve_kepler_cached(mean_anomalies, e)
+    E_ref, nu_ref, _ = solve_kepler(mean_anomalies, e)
+
+    assert np.all(converged)
+    np.testing.assert_allclose(np.angle(np.exp(1j * (E - E_ref))), 0, atol=1e-11)
+    np.testing.assert_allclose(np.angle(np.exp(1j * (nu - nu_ref))), 0, atol=1e-9)
+
+
+def test_kepler_table_cache_evicts_least_recently_used():
+    clear_kepler_table_cache()
+    table_bytes = get_kepler_table(0.1).nbytes
+    set_kepler_table_cache_limit(2 * table_bytes)
+    try:
+        first = get_kepler_table(0.1)
+        get_kepler_table(0.2)
+        assert get_kepler_table(0.1) is first
+
+        get_kepler_table(0.3)
+        assert kepler_table_cache_nbytes() <= 2 * table_bytes
+        assert get_kepler_table(0.1) is first
+    finally:
+        set_kepler_table_cache_limit(64 * 1024**2)
+        clear_kepler_table_cache()
@@ -0,0 +1,95 @@
+import pytest
+import numpy as np
+
+from kepler_solver import solve_kepler
+from lambert import _time_of_flight, lambert
+from propagator import point_mass, propagate as integrate
+from state_vectors import elements_to_state, state_to_elements
+
+MU_EARTH = 398600
+
+
+def propagate(r, v, tof, mu):
+    """Two-body propagation of elliptical states by Kepler's equation."""
+    a, e, i, raan, argp, nu = np.moveaxis(
+        state_to_elements(np.concatenate([r, v], axis=-1), mu), -1, 0
+    )
+    E0 = 2 * np.arctan2(
+        np.sqrt(1 - e) * np.sin(nu / 2), np.sqrt(1 + e) * np.cos(nu / 2)
+    )
+    M = E0 - e * np.sin(E0) + np.sqrt(mu / a**3) * tof
+    _, nu_f, _ = solve_kepler(M, e)
+    return elements_to_state(np.stack([a, e, i, raan, argp, nu_f], axis=-1), mu)
+
+
+def test_lambert_curtis_example():
+    # Curtis, Orbital Mechanics for Engineering Students, example 5.2.
+    v1, v2, converged = lambert(
+        [5000, 10000, 2100], [-14600, 2500, 7000], 3600, MU_EARTH
+    )
+    assert converged
+    np.testing.assert_allclose(v1, [-5.9925, 1.9254, 3.2456], atol=1e-4)
+    np.testing.assert_allclose(v2, [-3.3125, -4.1966, -0.38529], atol=1e-4)
+
+
+@pytest.mark.parametrize(
+    "revolutions, branch", [(0, "left"), (1, "left"), (1, "right")]
+)
+def test_lambert_batch_reaches_target(revolutions, branch):
+    rng = np.random.default_rng(2)
+    n = 500
+    r1 = rng.uniform(-1, 1, (n, 3)) * 20000
+    r1[:, 2] *= 0.2
+    r2 = rng.uniform(-1, 1, (n, 3)) * 40000
+    r2[:, 2] *= 0.2
+    tof = rng.uniform(2, 10, n) * 86400 * (1 + revolutions)
+
+    v1, v2, converged = lambert(r1, r2, tof, MU_EARTH, revolutions, branch=branch)
+    assert converged.all()
+
+    state = propagate(r1[converged], v1[converged], tof[converged], MU_EARTH)
+    np.testing.assert_allclose(state[:, :3], r2[converged], rtol=0, atol=1e-3)
+    np.testing.assert_allclose(state[:, 3:], v2[converged], rtol=0, atol=1e-6)
+
+
+def test_lambert_short_hyperbolic_transfer_near_lower_bound():
+    # A 200° transfer in barely more than the time at z = -4π², the
+    # lower end of the bracket.
+    angle = np.deg2rad(200)
+    r1 = np.array([7000.0, 0, 0])
+    r2 = 9000.0 * np.array([np.cos(angle), np.sin(angle), 0])
+    dtheta = 2 * np.pi - np.arccos(np.cos(angle))
+    A = np.sin(dtheta) * np.sqrt(7000 * 9000 / (1 - np.cos(angle)))
+    t_min, _ = _time_of_flight(
+        np.array([-4 * np.pi**2]), np.array([7000.0]), np.array([9000.0]), A, MU_EARTH
+    )
+    tof = 1.0001 * t_min[0]
+
+    v1, v2, converged = lambert(r1, r2, tof, MU_EARTH)
+    assert converged
+    assert 0.5 * v1 @ v1 - MU_EARTH / 7000 > 0
+
+    _, states = integrate(
+        np.concatenate([r1, v1]),
+        (0, tof),
+        point_mass(MU_EARTH),
+        rtol=1e-12,
+        atol=1e-9,
+    )
+    np.testing.assert_allclose(states[-1, :3], r2, rtol=0, atol=1e-4)
+    np.testing.assert_allclose(states[-1, 3:], v2, rtol=0, atol=1e-8)
+
+    _, _, converged = lambert(r1, r2, 0.99 * t_min[0], MU_EARTH)
+    assert not converged
+
+
+def test_lambert_grid_broadcasting():
+    r1 = np.array([8371.0, 0, 0])
+    r2 = np.array(
+        [[-384400.0 * np.cos(x), 384400.0 * np.sin(x), 0] for x in (0.1, 0.2)]
+    )
+    tof = np.array([[3], [4], [5]]) * 86400.0
+
+    v1, v2, converged = lambert(r1, r2[None, :, :], tof, MU_EARTH)
+    assert v1.shape == v2.shape == (3, 2, 3)
+    assert converged.all()
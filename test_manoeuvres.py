@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+
+from manoeuvres import (
+    apsis_burn,
+    bi_elliptic,
+    circular_speed,
+    circularise,
+    combined_plane_change,
+    hohmann,
+    plane_change,
+    total_dv,
+    vis_viva,
+)
+
+MU_EARTH = 398600
+
+
+def test_vis_viva_circular_orbit():
+    assert vis_viva(8371, 8371, MU_EARTH) == pytest.approx(
+        circular_speed(8371, MU_EARTH)
+    )
+
+
+def test_hohmann_broadcasts_over_orbit_pairs():
+    r1 = np.array([6678, 8371])
+    dv1, dv2, tof = hohmann(r1, 42164, MU_EARTH)
+
+    assert dv1.shape == dv2.shape == tof.shape == (2,)
+    assert dv1[0] == pytest.approx(2.426, abs=1e-3)
+    assert dv2[0] == pytest.approx(1.467, abs=1e-3)
+
+
+def test_bi_elliptic_beats_hohmann_for_large_ratios():
+    # Radius ratio above ~15.58 with a far intermediate apoapsis.
+    r1, r2 = 7000, 7000 * 20
+    hohmann_total = total_dv(*hohmann(r1, r2, MU_EARTH)[:2])
+    bi_elliptic_total = total_dv(*bi_elliptic(r1, r2, 7000 * 100, MU_EARTH)[:3])
+
+    assert bi_elliptic_total < hohmann_total
+
+
+def test_plane_change_limits():
+    v = 7.5
+    assert plane_change(v, 0) == 0
+    assert plane_change(v, np.pi) == pytest.approx(2 * v)
+    assert combined_plane_change(v, v, 0.3) == pytest.approx(plane_change(v, 0.3))
+
+
+def test_circularise_matches_apsis_burn():
+    # Circularising at apoapsis is the apsis burn that raises periapsis.
+    ra, rp = 66200, 4905
+    a = 0.5 * (ra + rp)
+    assert circularise(ra, a, 4905) == pytest.approx(apsis_burn(ra, a, ra, 4905))
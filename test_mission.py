@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+
+from mission import Mission, Phase, default_phases
+from result_cache import ResultCache
+from state_machine import calc_mean_anomaly, calc_TOF, state_machine
+
+
+def test_first_phase_matches_direct_computation():
+    mission = Mission(default_phases())
+    result = mission["earth_moon_transfer"]
+
+    mean_anomalies, times = calc_mean_anomaly(
+        0, calc_TOF(163285.5, 398600), 163285.5, 398600
+    )
+    np.testing.assert_allclose(result.times, times * 86400)
+    np.testing.assert_allclose(result.mean_anomalies, mean_anomalies)
+    np.testing.assert_allclose(
+        result.eccentric_anomalies,
+        state_machine(e=result.phase.e, mean_anomalies=mean_anomalies),
+    )
+
+
+def test_phases_hand_off_and_evaluate_lazily():
+    mission = Mission(default_phases(), t_0=100.0)
+    lunar = mission["lunar_orbit"]
+
+    assert mission.evaluations == 1
+    (_, end_1), (start_2, end_2), (start_3, _) = mission.epochs()
+    assert start_2 == end_1 and start_3 == end_2 == lunar.start
+    assert lunar.times[0] == pytest.approx(lunar.start)
+
+
+def test_only_stale_phases_are_recomputed():
+    mission = Mission(default_phases())
+    mission.run()
+    assert mission.evaluations == 3
+
+    mission.run()
+    assert mission.evaluations == 3
+
+    # Iterating on the last phase leaves the transfers alone.
+    mission.replace("lunar_orbit", a=20000, num=500)
+    mission.run()
+    assert mission.evaluations == 4
+
+    # Resampling a transfer does not move any hand-off epoch.
+    mission.replace("moon_lowering_transfer", step=60)
+    mission.run()
+    assert mission.evaluations == 5
+
+    # A longer Earth transfer shifts everything after it.
+    mission.replace("earth_moon_transfer", a=170000)
+    mission.run()
+    assert mission.evaluations == 8
+
+
+def test_phase_names_must_be_unique():
+    phase = Phase("orbit", "moon", 4905, a=5000, e=0, periods=1)
+    with pytest.raises(ValueError):
+        Mission([phase, phase])
+    with pytest.raises(KeyError):
+        Mission([phase])["missing"]
+
+
+def test_results_persist_in_the_result_cache(tmp_path):
+    cache = ResultCache(tmp_path)
+    first = Mission(default_phases(), cache=cache)
+    first.run()
+    assert first.evaluations == 3
+
+    second = Mission(default_phases(), cache=cache)
+    results = second.run()
+    assert second.evaluations == 0
+    np.testing.assert_array_equal(
+        results[0].eccentric_anomalies, first["earth_moon_transfer"].eccentric_anomalies
+    )
+
+
+def test_plot_labels_do_not_invalidate_results():
+    mission = Mission(default_phases())
+    mission.run()
+    mission.replace("lunar_orbit", title="Renamed", filename="renamed.pdf")
+    mission.run()
+    assert mission.evaluations == 3
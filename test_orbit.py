@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+
+from orbit import Orbit, OrbitBatch
+
+
+def test_orbit_matches_vis_viva():
+    orbit = Orbit(
+        5137, 0.3, np.radians(39), np.radians(90), np.radians(270), np.radians(160)
+    )
+    r = np.linalg.norm(orbit.position())
+    v = np.linalg.norm(orbit.velocity())
+
+    assert r == pytest.approx(orbit.radius())
+    assert v**2 / 2 - orbit.mu / r == pytest.approx(orbit.specific_energy())
+
+
+def test_orbit_flight_path_angle_from_state():
+    orbit = Orbit(163285.5, 0.9487, nu=np.radians(100))
+    r, v = orbit.position(), orbit.velocity()
+    gamma = np.arcsin(np.dot(r, v) / (np.linalg.norm(r) * np.linalg.norm(v)))
+
+    assert orbit.flight_path_angle() == pytest.approx(gamma)
+
+
+def test_orbit_batch_matches_single_orbits():
+    rng = np.random.default_rng(0)
+    n = 1000
+    batch = OrbitBatch(
+        a=rng.uniform(7000, 60000, n),
+        e=rng.uniform(0, 0.9, n),
+        i=rng.uniform(0, np.pi, n),
+        raan=rng.uniform(0, 2 * np.pi, n),
+        argp=rng.uniform(0, 2 * np.pi, n),
+        nu=rng.uniform(0, 2 * np.pi, n),
+    )
+
+    assert len(batch) == n
+    assert batch.a.flags.c_contiguous
+    assert batch.positions().shape == batch.velocities().shape == (n, 3)
+
+    for index in (0, 10, 999):
+        orbit = batch[index]
+        np.testing.assert_allclose(batch.positions()[index], orbit.position())
+        np.testing.assert_allclose(batch.velocities()[index], orbit.velocity())
+        assert batch.periods()[index] == pytest.approx(orbit.period())
+
+
+def test_orbit_batch_round_trip():
+    orbits = [Orbit(8371, 0), Orbit(61424, 0.862, mu=4905)]
+    batch = OrbitBatch.from_orbits(orbits)
+
+    assert list(batch) == orbits
+    assert len(batch[batch.mu == 4905]) == 1
+
+
+def test_orbit_is_hashable():
+    orbits = {Orbit(7000, 0.1), Orbit(7000, 0.1), Orbit(8000, 0.1)}
+    assert len(orbits) == 2
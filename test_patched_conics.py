@@ -0,0 +1,92 @@
+import numpy as np
+
+from constants import EARTH_MOON_DISTANCE, MOON_SOI, MU_EARTH, MU_MOON
+from events import kepler_trajectory
+from patched_conics import (
+    circular_moon_state,
+    design_transfers,
+    ephemeris_moon_state,
+)
+
+PHASES = np.deg2rad(np.arange(90, 150, 2.0))
+
+
+def test_soi_hand_off_is_continuous():
+    moon_state = circular_moon_state()
+    result = design_transfers(5000.0, PHASES, moon_state=moon_state)
+    assert result["reached"].any()
+
+    r_parking, r_apogee = 8371.0, EARTH_MOON_DISTANCE
+    a = 0.5 * (r_parking + r_apogee)
+    e = (r_apogee - r_parking) / (r_apogee + r_parking)
+    for row in result[result["reached"]]:
+        moon = moon_state(row["departure_epoch"])
+        longitude = np.arctan2(moon[1], moon[0]) - row["phase_angle"]
+        earth_arc = kepler_trajectory(
+            a, e, argp=longitude, t_p=row["departure_epoch"], mu=MU_EARTH
+        )
+        expected = earth_arc(np.array([row["soi_epoch"]]))[0]
+
+        hand_off = row["soi_state"] + moon_state(row["soi_epoch"])
+        np.testing.assert_allclose(hand_off[:3], expected[:3], atol=1e-3)
+        np.testing.assert_allclose(hand_off[3:], expected[3:], atol=1e-8)
+        np.testing.assert_allclose(
+            np.linalg.norm(row["soi_state"][:3]), MOON_SOI, rtol=1e-9
+        )
+
+
+def test_arrival_quantities():
+    result = design_transfers(0.0, PHASES)
+    reached = result[result["reached"]]
+
+    state = reached["soi_state"]
+    v2 = np.sum(state[:, 3:] ** 2, axis=-1)
+    v_infinity2 = v2 - 2 * MU_MOON / MOON_SOI
+    np.testing.assert_allclose(reached["v_infinity"] ** 2, v_infinity2)
+    # Some phases aim at the Moon, the nearest approaches hit it.
+    assert reached["impact"].any() and not reached["impact"].all()
+    captured = reached[~reached["impact"]]
+    np.testing.assert_allclose(
+        captured["dv_total"], captured["dv_departure"] + captured["dv_capture"]
+    )
+    assert np.isfinite(captured["dv_total"]).all()
+    impacts = reached[reached["impact"]]
+    assert np.isnan(impacts["dv_capture"]).all()
+    assert np.isnan(impacts["dv_total"]).all()
+    assert np.all(reached["tof"] > 0)
+
+
+def test_misses_are_nan():
+    # The Moon is far behind the departure point, the arc never meets it.
+    result = design_transfers(0.0, np.array([-np.pi / 2]))
+    assert not result["reached"][0]
+    assert np.isnan(result["dv_capture"][0])
+    assert np.isnan(result["soi_state"][0]).all()
+    assert result["dv_departure"][0] > 0
+
+
+def test_grid_broadcasts_and_chunks():
+    epochs = np.array([0.0, 86400.0, 2 * 86400.0])[:, None]
+    phases = PHASES[None, ::5]
+    result = design_transfers(epochs, phases, chunk_size=4)
+
+    assert result.shape == (3, len(phases[0]))
+    single = design_transfers(epochs[1, 0], phases[0])
+    np.testing.assert_array_equal(result[1]["reached"], single["reached"])
+    np.testing.assert_allclose(result[1]["dv_total"], single["dv_total"])
+
+
+class _CircularEphemeris:
+    def __init__(self):
+        self.model = circular_moon_state()
+
+    def position(self, target, center, et):
+        return self.model(et)[..., :3]
+
+
+def test_ephemeris_moon_state_differences_positions():
+    moon_state = ephemeris_moon_state(_CircularEphemeris())
+    et = np.array([0.0, 1e5])
+    np.testing.assert_allclose(
+        moon_state(et), circular_moon_state()(et), rtol=0, atol=1e-6
+    )
@@ -0,0 +1,27 @@
+import numpy as np
+
+from porkchop import compute_porkchop
+
+
+def test_porkchop_grid_is_cached(tmp_path):
+    departure_times = np.linspace(0, 86400, 5)
+    tofs = np.linspace(3, 6, 4) * 86400
+
+    grid = compute_porkchop(departure_times, tofs, cache_dir=tmp_path)
+    assert grid["dv_total"].shape == (5, 4)
+    assert len(list(tmp_path.glob("*.npz"))) == 1
+
+    cached = compute_porkchop(departure_times, tofs, cache_dir=tmp_path)
+    for name in grid:
+        np.testing.assert_array_equal(grid[name], cached[name])
+
+    compute_porkchop(departure_times, tofs, moon_phase=1.0, cache_dir=tmp_path)
+    assert len(list(tmp_path.glob("*.npz"))) == 2
+
+
+def test_porkchop_departure_cost_is_near_hohmann():
+    # Translunar injection from an 8371 km parking orbit is about 2.9 km/s.
+    grid = compute_porkchop(
+        np.linspace(0, 28 * 86400, 60), np.linspace(3, 6, 20) * 86400, use_cache=False
+    )
+    assert 2.5 < np.nanmin(grid["dv_departure"]) < 3.2
@@ -0,0 +1,32 @@
+import itertools
+
+import numpy as np
+
+from propagation import propagate_chunks
+from state_machine import calc_mean_anomaly, state_machine
+
+
+def test_propagate_chunks_matches_full_grid():
+    a, e, mu = 61424, 0.8620, 4905
+    mean_anomalies, times = calc_mean_anomaly(0, 10_000, a, mu, step=10)
+    eccentric_anomalies = state_machine(e, mean_anomalies)
+
+    chunks = list(propagate_chunks(a, e, mu, tof=10_000, step=10, chunk_size=64))
+    time = np.concatenate([chunk.time for chunk in chunks])
+    E = np.concatenate([chunk.eccentric_anomaly for chunk in chunks])
+
+    assert all(len(chunk.time) == 64 for chunk in chunks[:-1])
+    np.testing.assert_allclose(time, times * 86400)
+    np.testing.assert_allclose(E[1:], eccentric_anomalies)
+
+
+def test_propagate_chunks_unbounded_with_reused_buffers():
+    chunks = propagate_chunks(
+        56648, 0, 4905, step=1, chunk_size=100, reuse_buffers=True
+    )
+    first, second = itertools.islice(chunks, 2)
+
+    assert second.time[0] == 100
+    assert first.time is not second.time
+    assert np.shares_memory(first.time, second.time)
+    np.testing.assert_allclose(second.r, 56648)
@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+
+from orbit import OrbitBatch
+from propagator import combine_forces, j2, point_mass, propagate, third_body
+from state_vectors import elements_to_state, state_to_elements
+
+MU_EARTH = 398600
+
+
+def initial_states():
+    batch = OrbitBatch(
+        a=[8371, 20000, 42164],
+        e=[0, 0.3, 0.1],
+        i=np.radians([28.58, 39, 5]),
+        raan=[0.1, np.pi / 2, 2.0],
+        argp=[0, 3 * np.pi / 2, 1.0],
+        nu=[0, np.radians(160), 3.0],
+    )
+    state = np.concatenate([batch.positions(), batch.velocities()], axis=-1)
+    return state, batch.periods()
+
+
+@pytest.mark.parametrize(
+    "method, dt, atol", [("rk4", 30, 1e-3), ("rk45", 60, 1e-4), ("verlet", 5, 0.5)]
+)
+def test_two_body_orbits_close_after_one_period(method, dt, atol):
+    state, periods = initial_states()
+    _, states = propagate(
+        state,
+        (0, periods.max()),
+        point_mass(MU_EARTH),
+        method=method,
+        dt=dt,
+        t_eval=periods,
+    )
+    # Each orbit is back where it started after its own period.
+    for index in range(len(state)):
+        np.testing.assert_allclose(
+            states[index, index, :3], state[index, :3], atol=atol
+        )
+
+
+def test_batch_propagation_matches_single_states():
+    state, _ = initial_states()
+    times, batch = propagate(
+        state, (0, 3600), point_mass(MU_EARTH), t_eval=[0, 1800, 3600]
+    )
+
+    assert batch.shape == (3, 3, 6)
+    _, single = propagate(state[1], (0, 3600), point_mass(MU_EARTH))
+    np.testing.assert_allclose(batch[-1, 1], single[-1], atol=1e-6)
+
+
+def test_j2_nodal_regression_matches_analytic_rate():
+    a, e, i = 8371, 0.0, np.radians(28.58)
+    state = elements_to_state(np.array([a, e, i, 0.0, 0.0, 0.0]), MU_EARTH)
+    days = 1
+    _, states = propagate(
+        state, (0, days * 86400), combine_forces(point_mass(MU_EARTH), j2()), dt=60
+    )
+    raan = state_to_elements(states[-1], MU_EARTH)[3]
+
+    n = np.sqrt(MU_EARTH / a**3)
+    rate = -1.5 * n * 1.08263e-3 * (6378 / a) ** 2 * np.cos(i)
+    drift = np.angle(np.exp(1j * raan))
+    assert drift == pytest.approx(rate * days * 86400, rel=0.02)
+
+
+def test_third_body_vanishes_for_distant_body():
+    moon = third_body(4905, lambda t: np.array([1e12, 0, 0]))
+    assert np.all(np.abs(moon(0, np.array([[8371.0, 0, 0]]))) < 1e-20)
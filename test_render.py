@@ -0,0 +1,44 @@
+import matplotlib
+
+import matplotlib_rc
+from render import render_all
+
+
+def test_set_style_switches_text_mode():
+    matplotlib_rc.set_style(usetex=False)
+    assert not matplotlib.rcParams["text.usetex"]
+    assert matplotlib.rcParams["mathtext.fontset"] == "stix"
+
+    matplotlib_rc.set_style(usetex=True)
+    assert matplotlib.rcParams["text.usetex"]
+    matplotlib_rc.set_style(usetex=False)
+
+
+def test_unchanged_figures_are_skipped(tmp_path):
+    names = ["initial_parking", "moon_lowering_transfer"]
+
+    status = render_all(names, output_dir=tmp_path, max_workers=2)
+    assert status == {name: "rendered" for name in names}
+    assert (tmp_path / "initial_parking.pdf").stat().st_size > 0
+    assert (tmp_path / "moon_lowering_transfer.pdf").stat().st_size > 0
+
+    status = render_all(names, output_dir=tmp_path, max_workers=2)
+    assert status == {name: "skipped" for name in names}
+
+    # A missing output is redrawn even if its inputs match.
+    (tmp_path / "initial_parking.pdf").unlink()
+    status = render_all(names, output_dir=tmp_path, max_workers=2)
+    assert status == {
+        "initial_parking": "rendered",
+        "moon_lowering_transfer": "skipped",
+    }
+
+
+def test_phase_figures_follow_the_mission():
+    from mission import default_phases
+    from render import FIGURES
+
+    for phase in default_phases():
+        figure = FIGURES[phase.name]
+        assert figure.args == (phase.name,)
+        assert figure.filename == (phase.filename or f"{phase.name}.pdf")
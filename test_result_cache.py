@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pytest
+import numpy as np
+
+import result_cache
+from result_cache import ResultCache, hash_inputs, source_version
+
+
+def test_keys_follow_content():
+    grid = np.linspace(0, 1, 10)
+
+    assert hash_inputs(t=grid, e=0.1) == hash_inputs(e=0.1, t=grid.copy())
+    assert hash_inputs(t=grid, e=0.1) != hash_inputs(t=grid, e=0.2)
+    assert hash_inputs(t=grid) != hash_inputs(t=grid.astype(np.float32))
+    assert hash_inputs(n=1) != hash_inputs(n="1")
+    with pytest.raises(TypeError):
+        hash_inputs(f=lambda t: t)
+
+
+def test_source_version_imports_the_module(monkeypatch):
+    monkeypatch.setattr(result_cache, "_source_hashes", {})
+    monkeypatch.delitem(sys.modules, "decimate", raising=False)
+    version = source_version("decimate")
+    assert "decimate" in sys.modules
+    assert version != source_version("geometry")
+    with pytest.raises(ValueError):
+        source_version("sys")
+    with pytest.raises(ImportError):
+        source_version("no_such_module")
+
+
+def test_entries_are_invalidated_by_name(tmp_path):
+    cache = ResultCache(tmp_path)
+    times = np.linspace(0, 1e5, 1000)
+    for n in (1e-4, 2e-4):
+        key = cache.key("anomalies.mean", version="1", times=times, n=n)
+        cache.put(key, {"mean": np.mod(n * times, 2 * np.pi)})
+    other = cache.key("anomalies.true", version="1", times=times)
+    cache.put(other, {"true": times})
+
+    assert cache.invalidate(name="anomalies.mean") == 2
+    assert cache.get(other) is not None
+
+
+def test_entry_evicted_during_get_is_a_miss(tmp_path, monkeypatch):
+    cache = ResultCache(tmp_path)
+    cache.put("entry", {"x": np.zeros(3)})
+
+    def evicted(path, *args):
+        os.remove(path)
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", evicted)
+    assert cache.get("entry") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(tmp_path, compress=False)
+    array = np.zeros(10_000)
+    for index in range(3):
+        cache.put(f"entry-{index}", {"x": array})
+        os.utime(cache.path(f"entry-{index}"), (index, index))
+
+    # Reading refreshes entry-0, so entry-1 is now the oldest.
+    assert cache.get("entry-0") is not None
+    cache.evict(max_bytes=2.5 * array.nbytes)
+
+    remaining = {os.path.basename(path) for _, _, path in cache.entries()}
+    assert remaining == {"entry-0.npz", "entry-2.npz"}
+    assert cache.get("entry-1") is None
+
+    cache.invalidate()
+    assert cache.nbytes() == 0
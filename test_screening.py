@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+
+from constants import MU_EARTH, R_EARTH, R_MOON
+from propagator import point_mass, propagate
+from screening import apsides, close_approaches, pairs_within, screen_impacts
+from state_vectors import elements_to_state
+
+
+def _propagate(elements, t_end, num=50):
+    states = elements_to_state(np.array(elements, dtype=float), MU_EARTH)
+    t_eval = np.linspace(0, t_end, num)
+    return propagate(
+        states, (0, t_end), point_mass(MU_EARTH), method="rk4", dt=30, t_eval=t_eval
+    )
+
+
+def test_apsides():
+    elements = np.array(
+        [[10000.0, 0.3, 0.5, 1.0, 2.0, 0.7], [-20000.0, 1.5, 0, 0, 0, 0]]
+    )
+    periapsis, apoapsis = apsides(elements_to_state(elements, MU_EARTH), MU_EARTH)
+    np.testing.assert_allclose(periapsis, [7000.0, 10000.0])
+    assert apoapsis[0] == pytest.approx(13000.0)
+    assert np.isinf(apoapsis[1])
+
+
+@pytest.mark.parametrize(
+    "periapsis, apoapsis, expected",
+    [
+        (7000, 42000, False),  # safe orbit above the Earth
+        (6000, 42000, True),  # periapsis below the surface
+        (6400, 8000, False),  # skimming just above the surface
+    ],
+)
+def test_screen_impacts_matches_periapsis_check(periapsis, apoapsis, expected):
+    a = 0.5 * (periapsis + apoapsis)
+    e = (apoapsis - periapsis) / (apoapsis + periapsis)
+    # Start at apoapsis, one coarse sample per ~half hour only.
+    times, states = _propagate([[a, e, 0.3, 0, 0, np.pi]], 20000, num=12)
+
+    result = screen_impacts(times, states, R_EARTH, gravitational_parameter=MU_EARTH)
+
+    assert result["impact"][0] == expected
+
+
+def test_prefilter_clears_safe_orbits():
+    elements = [[8000.0, 0.0, 0, 0, 0, 0], [9000.0, 0.1, 0, 0, 0, 0]]
+    times, states = _propagate(elements, 1000, num=3)
+
+    result = screen_impacts(
+        times, states, R_EARTH, margin=100, gravitational_parameter=MU_EARTH
+    )
+
+    assert not result["impact"].any()
+    assert np.isnan(result["min_distance"]).all()
+
+
+def test_prefilter_follows_perturbed_periapsis():
+    # Safe at the first slice, a perturbation later drops the periapsis
+    # and the spacecraft under the surface.
+    times = np.array([0.0, 1.0])
+    states = np.zeros((2, 1, 6))
+    states[0, 0] = [8000, 0, 0, 0, np.sqrt(MU_EARTH / 8000), 0]
+    states[1, 0] = [6300, 0, 0, 0, 7.0, 0]
+
+    result = screen_impacts(times, states, R_EARTH, gravitational_parameter=MU_EARTH)
+
+    assert result["impact"][0]
+    assert result["min_distance"][0] == pytest.approx(6300)
+    assert result["periapsis"][0] < 6300
+
+
+def test_positions_only_uses_samples():
+    times = np.array([0.0, 1.0, 2.0])
+    positions = np.zeros((3, 2, 3))
+    positions[:, 0, 0] = [8000, 7000, 6000]
+    positions[:, 1, 0] = [8000, 8000, 8000]
+
+    result = screen_impacts(times, positions, R_EARTH)
+
+    np.testing.assert_array_equal(result["impact"], [True, False])
+    assert result["time"][0] == 2.0
+    np.testing.assert_allclose(result["min_distance"], [6000, 8000])
+
+
+def test_reaching_exactly_radius_plus_margin_is_an_impact():
+    times = np.array([0.0, 1.0])
+    positions = np.zeros((2, 2, 3))
+    positions[:, 0, 0] = [8000, R_EARTH + 100]
+    positions[:, 1, 0] = [8000, np.nextafter(R_EARTH + 100, np.inf)]
+
+    result = screen_impacts(times, positions, R_EARTH, margin=100)
+
+    np.testing.assert_array_equal(result["impact"], [True, False])
+
+
+def test_secondary_body():
+    times = np.array([0.0, 1.0])
+    moon = np.array([[384400.0, 0, 0], [384400.0, 0, 0]])
+    positions = np.zeros((2, 2, 3))
+    positions[:, 0, 0] = [380000, 384400 - R_MOON - 5]
+    positions[:, 1, 0] = [7000, 7000]
+
+    result = screen_impacts(times, positions, R_MOON, 10, body_positions=moon)
+
+    np.testing.assert_array_equal(result["impact"], [True, False])
+    assert result["time"][0] == 1.0
+
+
+def test_pairs_within_matches_brute_force():
+    rng = np.random.default_rng(1)
+    positions = rng.uniform(-500, 500, (2000, 3))
+    threshold = 25.0
+
+    i, j, distance = pairs_within(positions, threshold)
+
+    d = np.linalg.norm(positions[:, None] - positions[None], axis=-1)
+    bi, bj = np.nonzero(np.triu(d < threshold, k=1))
+    np.testing.assert_array_equal(i, bi)
+    np.testing.assert_array_equal(j, bj)
+    np.testing.assert_allclose(distance, d[bi, bj])
+
+
+def test_close_approaches_per_slice():
+    times = np.array([0.0, 60.0])
+    positions = np.array(
+        [
+            [[0, 0, 0], [10, 0, 0], [5000, 0, 0]],
+            [[0, 0, 0], [0.5, 0, 0], [5000, 0.2, 0]],
+        ],
+        dtype=float,
+    )
+
+    approaches = close_approaches(times, positions, threshold=1.0)
+
+    assert len(approaches) == 1
+    assert approaches["time"][0] == 60.0
+    assert (approaches["first"][0], approaches["second"][0]) == (0, 1)
+    assert approaches["distance"][0] == pytest.approx(0.5)
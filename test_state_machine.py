@@ -0,0 +1,43 @@
+import pytest
+import numpy as np
+
+from state_machine import calc_mean_anomaly, calc_mean_motion, calc_TOF, state_machine
+
+
+def test_calc_mean_anomaly_matches_loop():
+    mu_earth = 398600
+    a = 163285.5
+    tof = calc_TOF(a, mu_earth)
+    mean_anomalies, times = calc_mean_anomaly(0, tof, a, mu_earth)
+
+    time_array = times * 86400
+    n = calc_mean_motion(a, mu_earth)
+    expected = [n * (t - 0) % (2 * np.pi) for t in time_array[1:]]
+
+    np.testing.assert_allclose(mean_anomalies, expected)
+    assert times[1] * 86400 == pytest.approx(11)
+
+
+def test_calc_mean_anomaly_sample_count_and_buffer():
+    mu_moon = 4905
+    a = 56648
+    buffer = np.empty(9999)
+    mean_anomalies, times = calc_mean_anomaly(0, 1e5, a, mu_moon, num=10000, out=buffer)
+
+    assert mean_anomalies is buffer
+    assert len(times) == 10000
+    assert np.all((mean_anomalies >= 0) & (mean_anomalies < 2 * np.pi))
+
+
+def test_calc_mean_anomaly_rejects_wrong_buffer():
+    with pytest.raises(ValueError):
+        calc_mean_anomaly(0, 100, 56648, 4905, step=10, out=np.empty(3))
+
+
+def test_state_machine_cached_matches_direct_solve():
+    mean_anomalies, _ = calc_mean_anomaly(0, 1e5, 61424, 4905, num=1000)
+    np.testing.assert_allclose(
+        state_machine(0.862, mean_anomalies, cached=True),
+        state_machine(0.862, mean_anomalies),
+        atol=1e-11,
+    )
@@ -0,0 +1,54 @@
+import pytest
+import numpy as np
+
+from state_vectors import elements_to_state, state_to_elements
+
+
+def test_round_trip_random_elements():
+    rng = np.random.default_rng(1)
+    n = 10_000
+    elements = np.column_stack(
+        [
+            rng.uniform(7000, 400000, n),
+            rng.uniform(0.01, 0.95, n),
+            rng.uniform(0.01, np.pi - 0.01, n),
+            rng.uniform(0, 2 * np.pi, n),
+            rng.uniform(0, 2 * np.pi, n),
+            rng.uniform(0, 2 * np.pi, n),
+        ]
+    )
+    recovered = state_to_elements(elements_to_state(elements, 398600), 398600)
+
+    np.testing.assert_allclose(recovered[:, :3], elements[:, :3], rtol=1e-9)
+    angle_error = np.angle(np.exp(1j * (recovered[:, 3:] - elements[:, 3:])))
+    np.testing.assert_allclose(angle_error, 0, atol=1e-7)
+
+
+def test_circular_equatorial_parking_orbit():
+    # e = 0 parking orbit, the angles collapse onto the true longitude.
+    elements = np.array(
+        [[8371, 0, 0, np.radians(90), np.radians(270), np.radians(160)]]
+    )
+    state = elements_to_state(elements, 398600)
+    a, e, i, raan, argp, nu = state_to_elements(state, 398600)[0]
+
+    assert a == pytest.approx(8371)
+    assert e == 0 and i == 0 and raan == 0 and argp == 0
+    assert nu == pytest.approx(np.radians(160))
+
+
+def test_circular_inclined_orbit_uses_argument_of_latitude():
+    elements = np.array([[56648, 0, np.radians(28.58), 1.0, 0.5, 2.0]])
+    state = elements_to_state(elements, 4905)
+    a, e, i, raan, argp, nu = state_to_elements(state, 4905)[0]
+
+    assert (e, argp) == (0, 0)
+    assert i == pytest.approx(np.radians(28.58))
+    assert raan == pytest.approx(1.0)
+    assert nu == pytest.approx(2.5)
+
+
+def test_hyperbolic_round_trip():
+    elements = np.array([[-20000, 1.5, 0.3, 0.2, 0.1, 0.4]])
+    recovered = state_to_elements(elements_to_state(elements, 4905), 4905)
+    np.testing.assert_allclose(recovered, elements, rtol=1e-9)
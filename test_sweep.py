@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+
+from sweep import evaluate_transfers, sweep_transfers, transfer_grid
+from state_machine import calc_TOF
+
+
+def test_evaluate_transfers_textbook_hohmann():
+    # LEO (6678 km) to GEO (42164 km) without a plane change.
+    result = evaluate_transfers(np.array([[6678, 42164, 0.0]]), 398600)[0]
+
+    assert result["dv1"] == pytest.approx(2.426, abs=1e-3)
+    assert result["dv2"] == pytest.approx(1.467, abs=1e-3)
+    assert result["tof"] == pytest.approx(calc_TOF(0.5 * (6678 + 42164), 398600))
+
+
+def test_plane_change_costs_extra():
+    result = evaluate_transfers(
+        np.array([[8371, 42164, 0.0], [8371, 42164, np.radians(28.58)]]), 398600
+    )
+    assert result["dv2"][1] > result["dv2"][0]
+    assert result["dv1"][1] == result["dv1"][0]
+
+
+def test_sweep_is_ordered_and_matches_serial():
+    r_parking = np.linspace(6678, 9000, 7)
+    r_target = np.linspace(20000, 400000, 11)
+    inclination = np.radians([0, 10, 28.58])
+    calls = []
+
+    pooled = sweep_transfers(
+        r_parking,
+        r_target,
+        inclination,
+        max_workers=2,
+        shard_size=20,
+        progress=lambda done, total: calls.append((done, total)),
+    )
+    serial = evaluate_transfers(transfer_grid(r_parking, r_target, inclination), 398600)
+
+    np.testing.assert_array_equal(pooled, serial)
+    assert calls[-1] == (231, 231)